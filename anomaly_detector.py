@@ -0,0 +1,133 @@
+import math
+from collections import ChainMap, deque
+import numpy as np
+import pandas as pd
+
+
+class AnomalyDetector:
+    """Streaming per-viewer and per-creator transaction amount baselines
+
+    Every viewer and creator keeps an exponentially weighted mean of its
+    amounts and of their squares (the variance is the difference), plus a
+    count: three numbers per entity however much history is stored.
+
+    Attach it to a TransactionLedger. Each single-row write (a live send) is
+    scored against the viewer's and the creator's own baseline before the
+    baselines absorb it, and amounts far above a baseline are queued as alerts
+    for SystemMonitor.collect_alerts. Batch writes (loading the history, bulk
+    imports) only update the baselines, in one vectorized pass.
+
+    fork() shares the baselines with a session's ledger fork: the fork reads
+    them and copies an entity's baseline only when it first updates it.
+    """
+
+    NAME = "anomalies"
+
+    ALPHA = 0.1            # Weight of the newest amount (~ the last 20 transactions dominate)
+    Z_THRESHOLD = 3.0      # Standard deviations above the baseline that raise an alert
+    MIN_SAMPLES = 5        # Transactions an entity needs before it is scored
+    MIN_STD_FRACTION = 0.1  # Floor of the deviation relative to the mean, for very regular entities
+    MAX_PENDING = 1000     # Alerts kept until collected
+
+    FIELDS = ("viewer", "creator")
+
+    def __init__(self):
+        # field -> name -> [mean, mean of squares, count]; writes land in the first map
+        self._baselines = {field: ChainMap() for field in self.FIELDS}
+        self._pending = deque(maxlen=self.MAX_PENDING)
+
+    def fork(self):
+        """Detector reading these baselines, with its own updates kept in an overlay
+
+        O(1) however many entities are tracked; this detector must not be
+        updated once forked.
+        """
+        forked = type(self)()
+        forked._baselines = {
+            field: ChainMap({}, *baselines.maps) for field, baselines in self._baselines.items()
+        }
+        return forked
+
+    def on_append(self, ledger, start, stop):
+        """Ingest ledger rows [start, stop)"""
+        points = ledger.column("points")[start:stop]
+
+        if stop - start == 1:
+            amount = int(points[0])
+            for field in self.FIELDS:
+                name = ledger.column(field)[start]
+                z_score, baseline = self.observe(field, name, amount)
+                if z_score is not None and z_score >= self.Z_THRESHOLD:
+                    self._pending.append({
+                        "timestamp": ledger.column("timestamp")[start],
+                        "entity": field,
+                        "name": name,
+                        "points": amount,
+                        "baseline": round(baseline),
+                        "z_score": round(z_score, 2),
+                        "message": f"📈 Unusual amount for {field} {name}: {amount:,} points "
+                                   f"against a baseline of {baseline:,.0f} (z = {z_score:.1f})",
+                    })
+            return
+
+        # Fold each entity's rows in time order: its mean after n amounts is
+        # (1 - a)^n * previous mean + sum of a * (1 - a)^(n - 1 - i) * amount_i
+        epochs = ledger.column("epoch")[start:stop]
+        amounts = points.astype(np.float64)
+        for field in self.FIELDS:
+            codes, names = pd.factorize(ledger.column(field)[start:stop], use_na_sentinel=False)
+            order = np.lexsort((epochs, codes))
+            codes, values = codes[order], amounts[order]
+            sizes = np.bincount(codes, minlength=len(names))
+            firsts = np.cumsum(sizes) - sizes
+            ranks = np.arange(len(codes)) - firsts[codes]
+            weights = self.ALPHA * (1 - self.ALPHA) ** (sizes[codes] - 1 - ranks)
+            sums = np.bincount(codes, weights=weights * values, minlength=len(names))
+            square_sums = np.bincount(codes, weights=weights * values * values, minlength=len(names))
+            decays = (1 - self.ALPHA) ** sizes
+
+            baselines = self._baselines[field]
+            first_values = values[firsts].tolist()
+            for name, size, decay, total, square_total, first in zip(
+                    names, sizes.tolist(), decays.tolist(), sums.tolist(), square_sums.tolist(), first_values):
+                # A new entity starts from its first amount
+                mean, mean_sq, count = baselines.get(name) or (first, first * first, 0)
+                baselines[name] = [decay * mean + total, decay * mean_sq + square_total, count + size]
+
+    def observe(self, field, name, amount):
+        """Score `amount` against an entity's baseline, then fold it in
+
+        Returns (z-score, baseline mean); the z-score is None while the entity
+        has fewer than MIN_SAMPLES transactions.
+        """
+        baselines = self._baselines[field]
+        state = baselines.get(name)
+        if state is None:
+            baselines[name] = [amount, amount * amount, 1]
+            return None, amount
+
+        if name not in baselines.maps[0]:
+            state = baselines[name] = list(state)  # Copy a shared baseline before updating it
+        mean, mean_sq, count = state
+        z_score = None
+        if count >= self.MIN_SAMPLES:
+            deviation = max(math.sqrt(max(mean_sq - mean * mean, 0.0)), self.MIN_STD_FRACTION * mean, 1.0)
+            z_score = (amount - mean) / deviation
+        state[0] = mean + self.ALPHA * (amount - mean)
+        state[1] = mean_sq + self.ALPHA * (amount * amount - mean_sq)
+        state[2] = count + 1
+        return z_score, mean
+
+    def baseline(self, field, name):
+        """(mean, standard deviation, count) of an entity's amounts, or None"""
+        state = self._baselines[field].get(name)
+        if state is None:
+            return None
+        mean, mean_sq, count = state
+        return mean, math.sqrt(max(mean_sq - mean * mean, 0.0)), count
+
+    def pop_alerts(self):
+        """Alerts raised since the last call, oldest first"""
+        alerts = list(self._pending)
+        self._pending.clear()
+        return alerts
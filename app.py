@@ -1,19 +1,25 @@
 import streamlit as st
-
-# Import our custom classes
-from database_manager import DatabaseManager
-from risk_manager import RiskManager
-from creator_analyzer import CreatorAnalyzer
-from points_manager import PointsManager
-from dashboard_manager import DashboardManager
-from loading_manager import LoadingManager
-from ui_manager import UIManager
-from sidebar_manager import SidebarManager
-from data_manager import DataManager
-from content_quality_analyzer import ContentQualityAnalyzer  # NEW!
-from system_monitor import SystemMonitor
-from user_auth import UserAuth
-from points_shop import PointsShop
+from startup_profiler import StartupProfiler
+
+# Times this session's first run; the report lands in st.session_state.startup_report
+if "startup_profiler" not in st.session_state:
+    st.session_state.startup_profiler = StartupProfiler()
+profiler = st.session_state.startup_profiler
+
+# Import our custom classes (heavy dependencies such as plotly.express and the
+# quality and system analyzers are imported by the managers on first use)
+with profiler.step("import managers"):
+    from database_manager import DatabaseManager
+    from risk_manager import RiskManager
+    from creator_analyzer import CreatorAnalyzer
+    from points_manager import PointsManager
+    from dashboard_manager import DashboardManager
+    from loading_manager import LoadingManager
+    from ui_manager import UIManager
+    from sidebar_manager import SidebarManager
+    from data_manager import DataManager
+    from user_auth import UserAuth
+    from points_shop import PointsShop
 
 # Initialize UI and Loading managers
 ui_manager = UIManager()
@@ -21,16 +27,20 @@ loading_manager = LoadingManager()
 
 # Apply global styles and show loading screen
 ui_manager.apply_global_styles()
-loading_manager.show_loading_screen()
+with profiler.step("loading screen"):
+    loading_manager.show_loading_screen()
+if "startup_timings" in st.session_state and not profiler.finished:
+    profiler.add_steps(st.session_state.startup_timings, prefix="warm-up: ")
 
 # -----------------------------
 # Initialize all managers
 # -----------------------------
 if "db_manager" not in st.session_state:
-    st.session_state.db_manager = DatabaseManager()
+    with profiler.step("init db_manager"):
+        st.session_state.db_manager = DatabaseManager()
 
 if "risk_manager" not in st.session_state:
-    st.session_state.risk_manager = RiskManager()
+    st.session_state.risk_manager = RiskManager(st.session_state.db_manager)
 
 if "creator_analyzer" not in st.session_state:
     st.session_state.creator_analyzer = CreatorAnalyzer()
@@ -39,7 +49,7 @@ if "points_manager" not in st.session_state:
     st.session_state.points_manager = PointsManager(st.session_state.risk_manager)
 
 if "dashboard_manager" not in st.session_state:
-    st.session_state.dashboard_manager = DashboardManager()
+    st.session_state.dashboard_manager = DashboardManager(st.session_state.db_manager)
 
 if "sidebar_manager" not in st.session_state:
     st.session_state.sidebar_manager = SidebarManager(
@@ -51,12 +61,10 @@ if "sidebar_manager" not in st.session_state:
 if "data_manager" not in st.session_state:
     st.session_state.data_manager = DataManager(st.session_state.db_manager)
 
-if "content_quality_analyzer" not in st.session_state:
-    st.session_state.content_quality_analyzer = ContentQualityAnalyzer()
-
 # Initialize data and user profiles
 if 'creators' not in st.session_state:
-    creators, viewers, transactions = st.session_state.data_manager.initialize_data()
+    with profiler.step("init data"):
+        creators, viewers, transactions = st.session_state.data_manager.initialize_data()
     st.session_state.creators = creators
     st.session_state.viewers = viewers
     st.session_state.transactions = transactions
@@ -74,7 +82,8 @@ points_shop = PointsShop()
 # -----------------------------
 # Render Sidebar
 # -----------------------------
-st.session_state.sidebar_manager.render_sidebar(creators, viewers, transactions, user_risk_profiles)
+with profiler.step("render sidebar"):
+    st.session_state.sidebar_manager.render_sidebar(creators, viewers, transactions, user_risk_profiles)
 
 # -----------------------------
 # Main app layout
@@ -103,5 +112,10 @@ if st.session_state.get("show_analysis", False):
 transactions = st.session_state.transactions
 
 # Create main dashboard using DashboardManager
-st.session_state.dashboard_manager.create_main_dashboard(creators, transactions)
+with profiler.step("render dashboard"):
+    st.session_state.dashboard_manager.create_main_dashboard(creators, transactions)
+
+# Record the startup report after the first complete run
+if not profiler.finished:
+    st.session_state.startup_report = profiler.finish()
 
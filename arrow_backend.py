@@ -0,0 +1,167 @@
+import argparse
+import os
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pandas as pd
+from storage_backend import (
+    CREATORS_COLUMNAR_FILES, VIEWERS_COLUMNAR_FILES, StorageBackend, find_columnar_files
+)
+from transaction_ledger import TransactionLedger
+
+# Explicit on-disk schemas; columns not listed keep their inferred type
+CREATORS_SCHEMA = pa.schema([
+    ("Creator", pa.string()),
+    ("Views", pa.int64()),
+    ("Likes", pa.int64()),
+    ("Shares", pa.int64()),
+    ("Points", pa.int64()),
+    ("Engagement Score", pa.float64()),
+    ("Fair Reward %", pa.float64()),
+])
+VIEWERS_SCHEMA = pa.schema([
+    ("Viewer", pa.string()),
+    ("Account_Type", pa.string()),
+    ("Total_Gifts", pa.int64()),
+    ("Last_Gift_Time", pa.string()),
+    ("Trust_Level", pa.string()),
+    ("Account_Age_Days", pa.int64()),
+])
+TRANSACTIONS_SCHEMA = pa.schema([
+    ("timestamp", pa.string()),
+    ("epoch", pa.int64()),
+    ("viewer", pa.string()),
+    ("creator", pa.string()),
+    ("points", pa.int64()),
+    ("flagged", pa.bool_()),
+    ("risk_level", pa.string()),
+    ("reason", pa.string()),
+])
+
+ARROW_MAGIC = b"ARROW1"
+PARQUET_MAGIC = b"PAR1"
+
+
+def detect_format(path):
+    """'arrow', 'parquet' or 'csv', from the file's magic bytes"""
+    with open(path, "rb") as handle:
+        head = handle.read(len(ARROW_MAGIC))
+    if head == ARROW_MAGIC:
+        return "arrow"
+    if head[:len(PARQUET_MAGIC)] == PARQUET_MAGIC:
+        return "parquet"
+    return "csv"
+
+
+def conform(table, schema):
+    """Cast the columns named in schema to their declared types"""
+    fields = [
+        schema.field(name) if name in schema.names else table.schema.field(name)
+        for name in table.column_names
+    ]
+    return table.cast(pa.schema(fields))
+
+
+def read_table(path, schema=None):
+    """Read an Arrow IPC, Parquet or CSV file into an Arrow table
+
+    Arrow IPC files are memory-mapped, so opening them only maps the file and
+    column buffers are read lazily by the OS. Parquet is memory-mapped too but
+    must still be decoded.
+    """
+    file_format = detect_format(path)
+    if file_format == "arrow":
+        # Column buffers reference the mapping, which stays open while they live
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    elif file_format == "parquet":
+        table = pq.read_table(path, memory_map=True)
+    else:
+        column_types = {field.name: field.type for field in schema} if schema is not None else None
+        table = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+        )
+    return conform(table, schema) if schema is not None else table
+
+
+def write_table(table, path, file_format="arrow"):
+    """Write a table atomically, so readers with the old file mapped are unaffected"""
+    temp_path = f"{path}.tmp"
+    if file_format == "arrow":
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    elif file_format == "parquet":
+        pq.write_table(table, temp_path)
+    else:
+        raise ValueError(f"Unknown columnar format: {file_format}")
+    os.replace(temp_path, path)
+
+
+def to_pandas(table):
+    """Convert without consolidating blocks, so numeric columns stay zero-copy"""
+    return table.to_pandas(split_blocks=True)
+
+
+class ArrowBackend(StorageBackend):
+    """Columnar storage: tables are Arrow IPC (memory-mapped) or Parquet files
+
+    Numeric columns of loaded tables are read-only views of the mapping; the
+    shared-cache copies sessions get are copied on first write. Transactions
+    are not persisted, as with the CSV backend.
+    """
+
+    def __init__(self, creators_path=None, viewers_path=None):
+        if creators_path is None or viewers_path is None:
+            found = find_columnar_files() or (CREATORS_COLUMNAR_FILES[0], VIEWERS_COLUMNAR_FILES[0])
+            creators_path = creators_path or found[0]
+            viewers_path = viewers_path or found[1]
+        self.creators_path = creators_path
+        self.viewers_path = viewers_path
+
+    def data_files(self):
+        return (self.creators_path, self.viewers_path)
+
+    def load_tables(self):
+        creators = to_pandas(read_table(self.creators_path, CREATORS_SCHEMA)) if os.path.exists(self.creators_path) else None
+        viewers = to_pandas(read_table(self.viewers_path, VIEWERS_SCHEMA)) if os.path.exists(self.viewers_path) else None
+        return creators, viewers
+
+    def save_tables(self, creators, viewers):
+        for frame, path, schema in (
+            (creators, self.creators_path, CREATORS_SCHEMA),
+            (viewers, self.viewers_path, VIEWERS_SCHEMA),
+        ):
+            table = conform(pa.Table.from_pandas(frame, preserve_index=False), schema)
+            write_table(table, path, "parquet" if path.endswith(".parquet") else "arrow")
+
+    def load_transactions(self):
+        return pd.DataFrame(columns=list(TransactionLedger.COLUMNS))
+
+    def append_transaction(self, transaction):
+        pass  # Transactions are not persisted by the Arrow backend
+
+
+def convert_csv(creators_csv="tiktok_creators.csv", viewers_csv="tiktok_viewers.csv", file_format="arrow"):
+    """One-shot conversion of the CSV tables to columnar files; returns the new paths"""
+    paths = []
+    for csv_path, schema in ((creators_csv, CREATORS_SCHEMA), (viewers_csv, VIEWERS_SCHEMA)):
+        path = f"{os.path.splitext(csv_path)[0]}.{file_format}"
+        write_table(read_table(csv_path, schema), path, file_format)
+        paths.append(path)
+    return tuple(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the FairShare CSV tables to Arrow IPC or Parquet")
+    parser.add_argument("--creators", default="tiktok_creators.csv")
+    parser.add_argument("--viewers", default="tiktok_viewers.csv")
+    parser.add_argument("--format", choices=("arrow", "parquet"), default="arrow")
+    args = parser.parse_args()
+
+    for path in convert_csv(args.creators, args.viewers, args.format):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Benchmark suite for FairShare hot paths
+
+Every benchmark runs at each of --sizes, where size is the number of stored
+transactions (for analyze_creator, the number of rows in the creators table).
+Results can be saved as JSON and compared with a run from another commit:
+
+    python benchmarks.py --sizes 1000 100000 --json before.json
+    python benchmarks.py --sizes 1000 100000 --baseline before.json --threshold 0.2
+
+With --baseline the run exits with status 1 if any benchmark's median is more
+than `threshold` (a fraction) slower than the baseline's.
+"""
+import argparse
+import functools
+import itertools
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+import streamlit as st
+from content_quality_analyzer import ContentQualityAnalyzer
+from creator_analyzer import CreatorAnalyzer, engagement_score
+from dashboard_manager import DashboardManager
+from dashboard_view_model import DashboardViewModel
+from database_manager import DatabaseManager
+from dataset_generator import creator_metrics, names, viewers_chunk
+from fund_flow_rollups import FundFlowRollups
+from points_manager import PointsManager
+from risk_manager import RiskManager
+from sidebar_manager import SidebarManager
+from system_monitor import SystemMonitor
+from transaction_ledger import TransactionLedger
+
+NUM_VIEWERS = 1000
+NUM_CREATORS = 100
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_THRESHOLD = 0.2  # Fractional slowdown of the median that counts as a regression
+
+
+@functools.lru_cache(maxsize=1)
+def build_ledger(size, num_viewers=NUM_VIEWERS, num_creators=NUM_CREATORS, seed=42):
+    """Build a ledger with `size` synthetic transactions over the last 30 days
+
+    The ledger is cached for the current size; benchmarks that write fork it.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Small pools of shared string objects keep memory flat at large sizes
+    viewer_pool = np.array([f"viewer_{i}" for i in range(num_viewers)], dtype=object)
+    creator_pool = np.array([f"creator_{i}" for i in range(num_creators)], dtype=object)
+    now = datetime.now(ZoneInfo("Asia/Singapore")).replace(second=0, microsecond=0, tzinfo=None)
+    minutes = 30 * 24 * 60
+    timestamp_pool = np.array(
+        [(now - timedelta(minutes=m)).strftime("%Y-%m-%d %H:%M") for m in range(minutes)], dtype=object
+    )
+
+    frame = pd.DataFrame({
+        "timestamp": pd.Series(timestamp_pool[rng.integers(0, minutes, size)], dtype=object),
+        "viewer": pd.Series(viewer_pool[rng.integers(0, num_viewers, size)], dtype=object),
+        "creator": pd.Series(creator_pool[rng.integers(0, num_creators, size)], dtype=object),
+        "points": rng.integers(1, 500, size),
+        "flagged": np.zeros(size, dtype=bool),
+    })
+    ledger = TransactionLedger(initial_capacity=size + 1024)
+    ledger.extend(frame)
+    return ledger
+
+
+def build_creators(count, seed=42):
+    """Creators table in the CSV layout, named creator_0 .. creator_<count-1>"""
+    views, likes, shares, points = creator_metrics(seed, 0, 0, count)
+    scores = engagement_score(views, likes, shares)
+    return pd.DataFrame({
+        "Creator": names("creator_", np.arange(count)).astype(object),
+        "Views": views,
+        "Likes": likes,
+        "Shares": shares,
+        "Points": points,
+        "Engagement Score": scores,
+        "Fair Reward %": scores / scores.sum() * 100,
+    })
+
+
+def build_viewers(count, seed=42):
+    """Viewers table in the CSV layout, named viewer_0 .. viewer_<count-1>"""
+    end_epoch = int(datetime.now(ZoneInfo("Asia/Singapore")).timestamp())
+    return viewers_chunk(seed, 0, 0, count, end_epoch, days=30).to_pandas()
+
+
+def _summarize(samples):
+    samples = np.asarray(samples) * 1e6  # microseconds
+    return {
+        "repeats": len(samples),
+        "median_us": round(float(np.median(samples)), 2),
+        "p95_us": round(float(np.percentile(samples, 95)), 2),
+    }
+
+
+def _time(func, repeats, warmup=1):
+    """Call func `repeats` times after `warmup` untimed calls and summarize the timings"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return _summarize(samples)
+
+
+def bench_send_points(size, repeats=200):
+    """PointsManager.send_points against a ledger holding `size` transactions"""
+    ledger = build_ledger(size).fork()
+    viewers = build_viewers(NUM_VIEWERS)
+    creators = build_creators(NUM_CREATORS)
+    points_manager = PointsManager(RiskManager())
+    user_risk_profiles = {}
+    sends = itertools.count()
+
+    # The warm-up send attaches (and back-fills) the velocity index
+    def send():
+        viewer = f"viewer_{next(sends) % 10}"
+        points_manager.send_points(viewer, "creator_0", 10, viewers, creators, ledger, user_risk_profiles)
+    return _time(send, repeats)
+
+
+def bench_process_points_transaction(size, repeats=200):
+    """SidebarManager.process_points_transaction: AML check, append and view refresh"""
+    viewers = build_viewers(NUM_VIEWERS)
+    db_manager = DatabaseManager.from_tables(build_creators(NUM_CREATORS), viewers, build_ledger(size).fork())
+    sidebar = SidebarManager(CreatorAnalyzer(), PointsManager(RiskManager(db_manager)), db_manager)
+    st.session_state.current_user = "viewer_0"
+
+    def process():
+        succeeded = sidebar.process_points_transaction("creator_0", 10, db_manager.transactions, viewers)[0]
+        if not succeeded:
+            raise RuntimeError("process_points_transaction failed")
+    return _time(process, repeats)
+
+
+def bench_quality_per_creator(size, repeats=3):
+    """ContentQualityAnalyzer.calculate_content_quality_score for every creator"""
+    transactions = build_ledger(size).view()
+    rows = [row for _, row in build_creators(NUM_CREATORS).iterrows()]
+    analyzer = ContentQualityAnalyzer()
+
+    def score():
+        for row in rows:
+            analyzer.calculate_content_quality_score(row, transactions)
+    return _time(score, repeats)
+
+
+def bench_quality_score_all(size, repeats=20):
+    """ContentQualityAnalyzer.score_all, the batched equivalent of quality_per_creator"""
+    transactions = build_ledger(size).view()
+    creators = build_creators(NUM_CREATORS)
+    analyzer = ContentQualityAnalyzer()
+    return _time(lambda: analyzer.score_all(creators, transactions), repeats)
+
+
+def bench_performance_report(size, repeats=10):
+    """SystemMonitor.generate_performance_report: health score plus fund flow"""
+    transactions = build_ledger(size).view()
+    creators = build_creators(NUM_CREATORS)
+    monitor = SystemMonitor()
+    return _time(lambda: monitor.generate_performance_report(transactions, creators), repeats)
+
+
+def bench_fund_flow_window(size, repeats=50):
+    """SystemMonitor.track_fund_flow over 7 days, summed from the ledger's FundFlowRollups"""
+    ledger = build_ledger(size).fork()
+    rollups = ledger.attach_index(FundFlowRollups.NAME, FundFlowRollups())
+    transactions = ledger.view()
+    monitor = SystemMonitor()
+    return _time(lambda: monitor.track_fund_flow(transactions, 168, rollups), repeats)
+
+
+def bench_creator_points(size, repeats=50):
+    """DashboardManager.calculate_creator_points_from_transactions on the session view"""
+    creators = build_creators(NUM_CREATORS)
+    db_manager = DatabaseManager.from_tables(creators, build_viewers(NUM_VIEWERS), build_ledger(size).fork())
+    dashboard = DashboardManager(db_manager)
+    return _time(lambda: dashboard.calculate_creator_points_from_transactions(db_manager.transactions, creators), repeats)
+
+
+def bench_history_page(size, repeats=200):
+    """DashboardViewModel.history_page: one page of one viewer's newest-first history"""
+    db_manager = DatabaseManager.from_tables(build_creators(NUM_CREATORS), build_viewers(NUM_VIEWERS), build_ledger(size).fork())
+    view_model = DashboardViewModel(db_manager)
+    pages = itertools.count()
+
+    # The warm-up call attaches (and builds) the history index
+    return _time(lambda: view_model.history_page(db_manager.transactions, next(pages) % 10, viewer="viewer_0"), repeats)
+
+
+def bench_analyze_creator(size, repeats=50):
+    """CreatorAnalyzer.analyze_creator against a creators table of `size` rows"""
+    creators = build_creators(size)
+    analyzer = CreatorAnalyzer()
+    return _time(
+        lambda: analyzer.analyze_creator("benchmark_creator", 1000000, 100000, 10000, 1000, creators_df=creators),
+        repeats
+    )
+
+
+# Benchmark name -> function(size, repeats)
+BENCHMARKS = {
+    "send_points": bench_send_points,
+    "process_points_transaction": bench_process_points_transaction,
+    "quality_per_creator": bench_quality_per_creator,
+    "quality_score_all": bench_quality_score_all,
+    "performance_report": bench_performance_report,
+    "fund_flow_window": bench_fund_flow_window,
+    "creator_points": bench_creator_points,
+    "history_page": bench_history_page,
+    "analyze_creator": bench_analyze_creator,
+}
+
+
+def run_benchmarks(sizes, selected=None, repeats=None):
+    """Run the selected benchmarks at every size; returns a list of result dicts"""
+    results = []
+    for size in sizes:
+        for name in selected or BENCHMARKS:
+            bench = BENCHMARKS[name]
+            summary = bench(size) if repeats is None else bench(size, repeats=repeats)
+            results.append({"benchmark": name, "size": size, **summary})
+    build_ledger.cache_clear()
+    return results
+
+
+def current_commit():
+    """Short hash of HEAD, or None outside a git checkout"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def build_report(results):
+    """JSON-serializable report: run metadata plus the results"""
+    return {
+        "commit": current_commit(),
+        "created": datetime.now(ZoneInfo("Asia/Singapore")).strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare medians with a baseline report's; returns one dict per shared (benchmark, size)
+
+    Each dict has the two medians, the fractional change and whether it is a
+    regression (slower than the baseline by more than `threshold`).
+    """
+    previous = {(entry["benchmark"], entry["size"]): entry["median_us"] for entry in baseline["results"]}
+    comparisons = []
+    for entry in results:
+        baseline_median = previous.get((entry["benchmark"], entry["size"]))
+        if not baseline_median:
+            continue
+        change = entry["median_us"] / baseline_median - 1
+        comparisons.append({
+            "benchmark": entry["benchmark"],
+            "size": entry["size"],
+            "baseline_us": baseline_median,
+            "median_us": entry["median_us"],
+            "change": round(change, 4),
+            "regressed": change > threshold,
+        })
+    return comparisons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FairShare benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--repeats", type=int, help="Timed calls per benchmark (default: per benchmark)")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Results file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional slowdown of a median before the run fails")
+    args = parser.parse_args(argv)
+
+    # Session state is used outside a Streamlit run; silence the per-access warning
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+
+    results = run_benchmarks(args.sizes, args.only, args.repeats)
+    for entry in results:
+        print(f"{entry['benchmark']:<28} size={entry['size']:>10,}  "
+              f"median={entry['median_us']:>12.1f}us  p95={entry['p95_us']:>12.1f}us")
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(build_report(results), handle, indent=2)
+        print(f"Wrote {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        comparisons = compare_results(results, baseline, args.threshold)
+        print(f"\nCompared with {baseline.get('commit') or args.baseline} (threshold {args.threshold:+.0%}):")
+        for entry in comparisons:
+            marker = "  REGRESSION" if entry["regressed"] else ""
+            print(f"{entry['benchmark']:<28} size={entry['size']:>10,}  {entry['baseline_us']:>12.1f}us -> "
+                  f"{entry['median_us']:>12.1f}us  {entry['change']:+.1%}{marker}")
+        if any(entry["regressed"] for entry in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,33 @@
 import pandas as pd
 import numpy as np
+from latency_metrics import timed
+from transaction_ledger import transaction_epochs
 
 class ContentQualityAnalyzer:
     """Analyzes content quality using multiple factors for better creator rewards"""
     
+    # Content category bonus points
+    CATEGORY_BONUSES = {
+        'education': 15,      # Educational content (high value)
+        'tutorial': 15,       # How-to content
+        'gaming': 10,         # Gaming content
+        'entertainment': 5,   # Entertainment content
+        'comedy': 8,          # Comedy/skits
+        'dance': 6,           # Dance challenges
+        'cooking': 12,        # Cooking/food content
+        'fitness': 10,        # Fitness/health
+        'beauty': 8,          # Beauty/makeup
+        'travel': 10,         # Travel content
+        'lifestyle': 5,       # Lifestyle content
+        'news': 15,           # News/information
+        'technology': 12,     # Tech content
+        'music': 8,           # Music content
+        'art': 10,            # Art/creative content
+        'business': 12,       # Business/finance
+        'science': 15,        # Science content
+        'history': 12,        # Historical content
+    }
+    
     def __init__(self):
         # Quality weights for different factors
         self.ENGAGEMENT_WEIGHT = 0.4      # 40% - How well audience engages
@@ -11,6 +35,7 @@ class ContentQualityAnalyzer:
         self.GROWTH_WEIGHT = 0.2        # 20% - How much creator is improving
         self.CONTENT_WEIGHT = 0.15        # 15% - Content type and duration bonuses
     
+    @timed("quality.score")
     def calculate_content_quality_score(self, creator_data, transaction_history):
         """
         Calculate comprehensive content quality score (0-100)
@@ -72,6 +97,164 @@ class ContentQualityAnalyzer:
             'quality_multiplier': self._get_quality_multiplier(total_quality_score)
         }
     
+    @timed("quality.score_all")
+    def score_all(self, creators_df, transactions_df):
+        """
+        Vectorized quality scores for every creator at once
+        
+        Produces the same values as calculate_content_quality_score, but makes
+        one grouped pass over the transactions instead of filtering the whole
+        history once per creator.
+        
+        Args:
+            creators_df: Creators DataFrame (one row per creator)
+            transactions_df: All transactions DataFrame
+            
+        Returns:
+            DataFrame indexed like creators_df with a Creator column plus the
+            score breakdown, quality_tier and quality_multiplier columns
+        """
+        names = creators_df['Creator'].to_numpy()
+        
+        # Per-creator transaction statistics from one pass over the history
+        history = self._transaction_stats(pd.unique(names), transactions_df)
+        history = history.reindex(names)
+        count = history['count'].to_numpy()
+        mean = history['mean'].to_numpy()
+        std = history['std'].to_numpy()
+        head_mean = history['head_mean'].to_numpy()
+        tail_mean = history['tail_mean'].to_numpy()
+        
+        # Engagement quality
+        views = self._numeric_column(creators_df, 'Views')
+        weighted_engagement = (
+            self._numeric_column(creators_df, 'Likes') * 1.0 +
+            self._numeric_column(creators_df, 'Shares') * 2.0 +
+            self._numeric_column(creators_df, 'Comments') * 1.5 +
+            self._numeric_column(creators_df, 'Saves') * 1.2
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            engagement_score = np.where(views > 0, np.minimum(100, weighted_engagement / views * 500), 0)
+        
+        # Consistency quality: lower coefficient of variation = more consistent
+        with np.errstate(divide='ignore', invalid='ignore'):
+            consistency_score = np.where(
+                (count > 1) & (mean > 0),
+                np.maximum(0, 100 - (std / mean) * 100),
+                50
+            )
+        
+        # Growth quality: last 3 vs first 3 transactions
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth_score = np.where(
+                (count >= 3) & (head_mean > 0),
+                np.clip(50 + (tail_mean - head_mean) / head_mean * 100, 0, 100),
+                50
+            )
+        
+        # Content type quality with all bonuses
+        duration_bonus = np.zeros(len(creators_df), dtype=int)
+        if 'video_duration_minutes' in creators_df.columns:
+            duration = self._numeric_column(creators_df, 'video_duration_minutes', default=np.nan)
+            duration_bonus = np.select(
+                [duration >= 8, duration >= 5, duration >= 3, duration >= 1],
+                [20, 15, 10, 5],
+                default=0
+            )
+        
+        retention_bonus = np.zeros(len(creators_df), dtype=int)
+        if 'retention_percentage' in creators_df.columns:
+            retention = self._numeric_column(creators_df, 'retention_percentage', default=np.nan)
+            retention_bonus = np.select(
+                [retention >= 90, retention >= 80, retention >= 70, retention >= 60, retention >= 50],
+                [25, 20, 15, 10, 5],
+                default=0
+            )
+        
+        category_bonus = np.zeros(len(creators_df), dtype=int)
+        if 'content_category' in creators_df.columns:
+            category = creators_df['content_category']
+            base_bonus = category.astype(str).str.lower().str.strip().map(self.CATEGORY_BONUSES).fillna(0).to_numpy()
+            trending = creators_df['is_trending'].fillna(False).astype(bool).to_numpy() if 'is_trending' in creators_df.columns else False
+            category_bonus = np.where(category.notna().to_numpy(), base_bonus + np.where(trending, 20, 0), 0).astype(int)
+        
+        content_score = np.minimum(100, 75 + duration_bonus + retention_bonus + category_bonus)
+        
+        total_quality_score = (
+            engagement_score * self.ENGAGEMENT_WEIGHT +
+            consistency_score * self.CONSISTENCY_WEIGHT +
+            growth_score * self.GROWTH_WEIGHT +
+            content_score * self.CONTENT_WEIGHT
+        )
+        
+        # Tier and multiplier thresholds match _get_quality_tier/_get_quality_multiplier
+        tier_conditions = [
+            total_quality_score >= 70,
+            total_quality_score >= 60,
+            total_quality_score >= 55,
+            total_quality_score >= 45
+        ]
+        
+        return pd.DataFrame({
+            'Creator': names,
+            'total_quality_score': np.round(total_quality_score, 2),
+            'engagement_quality': np.round(engagement_score, 2),
+            'consistency_quality': np.round(consistency_score, 2),
+            'growth_quality': np.round(growth_score, 2),
+            'content_quality': np.round(content_score, 2),
+            'duration_bonus': duration_bonus,
+            'retention_bonus': retention_bonus,
+            'category_bonus': category_bonus,
+            'quality_tier': np.select(tier_conditions, ["Diamond", "Gold", "Silver", "Bronze"], default="Standard"),
+            'quality_multiplier': np.select(tier_conditions, [2.0, 1.5, 1.25, 1.1], default=1.0)
+        }, index=creators_df.index)
+    
+    def _transaction_stats(self, creator_names, transactions_df):
+        """Per-creator count, mean, std and first/last-3 means in one grouped pass"""
+        stats = pd.DataFrame(
+            np.nan, index=pd.Index(creator_names, name='Creator'),
+            columns=['count', 'mean', 'std', 'head_mean', 'tail_mean']
+        )
+        stats['count'] = 0
+        if transactions_df is None or len(transactions_df) == 0:
+            return stats
+        
+        codes = pd.Categorical(transactions_df['creator'], categories=creator_names).codes
+        known = codes >= 0
+        codes = codes[known].astype(np.int64)
+        points = transactions_df['points'].to_numpy(dtype=float)[known]
+        epochs = transaction_epochs(transactions_df)[known]
+        
+        # Order by creator, then time, so each creator's history is one contiguous run
+        order = np.lexsort((epochs, codes))
+        codes, points = codes[order], points[order]
+        
+        groups = len(creator_names)
+        count = np.bincount(codes, minlength=groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.bincount(codes, weights=points, minlength=groups) / count
+            std = np.sqrt(np.bincount(codes, weights=(points - mean[codes]) ** 2, minlength=groups) / count)
+            
+            # Position of each transaction within its creator's run
+            rank = np.arange(len(codes)) - (np.cumsum(count) - count)[codes]
+            head = rank < 3
+            tail = rank >= count[codes] - 3
+            head_mean = np.bincount(codes[head], weights=points[head], minlength=groups) / np.minimum(count, 3)
+            tail_mean = np.bincount(codes[tail], weights=points[tail], minlength=groups) / np.minimum(count, 3)
+        
+        stats['count'] = count
+        stats['mean'] = mean
+        stats['std'] = std
+        stats['head_mean'] = head_mean
+        stats['tail_mean'] = tail_mean
+        return stats
+    
+    def _numeric_column(self, frame, column, default=0):
+        """Return a float array for a column, or a constant array if it is absent"""
+        if column not in frame.columns:
+            return np.full(len(frame), default, dtype=float)
+        return pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float)
+    
     def _calculate_engagement_quality(self, creator_data):
         """Calculate engagement quality (0-100) with TikTok-relevant metrics"""
         views = creator_data['Views']
@@ -126,8 +309,9 @@ class ContentQualityAnalyzer:
         if len(creator_transactions) < 3:
             return 50  # Need at least 3 transactions to measure growth
         
-        # Sort by timestamp and calculate growth
-        sorted_transactions = creator_transactions.sort_values('timestamp')
+        # Sort by time (epoch parsed at ingest) and calculate growth
+        order = np.argsort(transaction_epochs(creator_transactions), kind='stable')
+        sorted_transactions = creator_transactions.iloc[order]
         
         # Calculate moving average to detect trends
         if len(sorted_transactions) >= 3:
@@ -252,30 +436,9 @@ class ContentQualityAnalyzer:
         # Convert to lowercase for case-insensitive matching
         category = str(content_category).lower().strip()
         
-        # Category bonus points
-        category_bonuses = {
-            'education': 15,      # Educational content (high value)
-            'tutorial': 15,       # How-to content
-            'gaming': 10,         # Gaming content
-            'entertainment': 5,   # Entertainment content
-            'comedy': 8,          # Comedy/skits
-            'dance': 6,           # Dance challenges
-            'cooking': 12,        # Cooking/food content
-            'fitness': 10,        # Fitness/health
-            'beauty': 8,          # Beauty/makeup
-            'travel': 10,         # Travel content
-            'lifestyle': 5,       # Lifestyle content
-            'news': 15,           # News/information
-            'technology': 12,     # Tech content
-            'music': 8,           # Music content
-            'art': 10,            # Art/creative content
-            'business': 12,       # Business/finance
-            'science': 15,        # Science content
-            'history': 12,        # Historical content
-        }
         
         # Get category bonus (default to 0 if category not found)
-        category_bonus = category_bonuses.get(category, 0)
+        category_bonus = self.CATEGORY_BONUSES.get(category, 0)
         
         # Add trending bonus if applicable
         trending_bonus = 0
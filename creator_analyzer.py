@@ -1,54 +1,74 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
+from engagement_index import EngagementIndex
+
+def engagement_score(views, likes, shares):
+    """Weighted engagement score: 0.3*Views + Likes + 2*Shares
+    
+    Accepts scalars or equal-length arrays/Series and evaluates as one
+    columnar NumPy expression; scalars in give a float out.
+    """
+    scores = (
+        0.3 * np.asarray(views, dtype=np.float64)
+        + np.asarray(likes, dtype=np.float64)
+        + 2 * np.asarray(shares, dtype=np.float64)
+    )
+    return scores if scores.ndim else float(scores)
 
 class CreatorAnalyzer:
     def __init__(self):
-        pass
+        self._engagement_index = None
     
     def calculate_engagement_score(self, views, likes, shares):
-        """Calculate engagement score using the weighted formula"""
-        return 0.3 * views + likes + 2 * shares
+        """Calculate engagement score using the weighted formula (scalars or arrays)"""
+        return engagement_score(views, likes, shares)
     
     def calculate_fair_reward_percentage(self, engagement_score, total_existing_engagement):
-        """Calculate fair reward percentage"""
+        """Calculate fair reward percentage (scalars or arrays of hypothetical scores)"""
         return (engagement_score / (total_existing_engagement + engagement_score)) * 100
     
+    def get_engagement_index(self, creators_df, creators_version=None):
+        """Sorted engagement index for creators_df, refreshed only when the table changed
+
+        creators_version is the caller's version of the table (e.g.
+        DatabaseManager.tables_version); bump it after editing scores in place.
+        """
+        index = self._engagement_index
+        if index is None:
+            index = self._engagement_index = EngagementIndex(creators_df, creators_version)
+        elif not index.matches(creators_df, creators_version):
+            index.refresh(creators_df, creators_version)
+        return index
+    
     def calculate_ranking(self, engagement_score, existing_engagement_scores):
-        """Calculate creator ranking among existing creators"""
-        all_scores = list(existing_engagement_scores) + [engagement_score]
-        all_scores.sort(reverse=True)
-        creator_rank = all_scores.index(engagement_score) + 1
+        """Calculate creator ranking among existing creators
         
-        # Calculate percentile
-        percentile = ((len(all_scores) - creator_rank) / len(all_scores)) * 100
-        
-        return {
-            "rank": creator_rank,
-            "total_creators": len(all_scores),
-            "percentile": percentile
-        }
+        existing_engagement_scores may be an EngagementIndex (binary search)
+        or any sequence of scores.
+        """
+        index = existing_engagement_scores
+        if not isinstance(index, EngagementIndex):
+            index = EngagementIndex.from_scores(existing_engagement_scores)
+        return index.rank(engagement_score)
     
-    def find_similar_creators(self, engagement_score, creators_df, similarity_range=0.2):
+    def find_similar_creators(self, engagement_score, creators_df, similarity_range=0.2, creators_version=None):
         """Find creators with similar engagement levels"""
-        similar_creators = creators_df[
-            (creators_df['Engagement Score'] >= engagement_score * (1 - similarity_range)) &
-            (creators_df['Engagement Score'] <= engagement_score * (1 + similarity_range))
-        ].head(5)
-        
-        return similar_creators
+        return self.get_engagement_index(creators_df, creators_version).similar(engagement_score, similarity_range)
     
-    def get_performance_tier(self, engagement_score, creators_df):
+    def get_performance_tier(self, engagement_score, creators_df, creators_version=None):
         """Determine performance tier based on engagement score"""
-        if engagement_score > creators_df['Engagement Score'].quantile(0.9):
+        top_10, top_30, top_50 = self.get_engagement_index(creators_df, creators_version).cut_points()
+        if engagement_score > top_10:
             return "top_10", "�� This creator would be in the TOP 10% of our database!"
-        elif engagement_score > creators_df['Engagement Score'].quantile(0.7):
+        elif engagement_score > top_30:
             return "top_30", "�� This creator would be in the TOP 30% of our database!"
-        elif engagement_score > creators_df['Engagement Score'].quantile(0.5):
+        elif engagement_score > top_50:
             return "top_50", "�� This creator would be in the TOP 50% of our database"
         else:
             return "bottom_50", "⚠️ This creator would be in the BOTTOM 50% of our database"
     
-    def analyze_creator(self, creator_name, views, likes, shares, points, comments=0, saves=0, video_duration=None, content_category=None, is_trending=False, creators_df=None):  # ADD creators_df parameter
+    def analyze_creator(self, creator_name, views, likes, shares, points, comments=0, saves=0, video_duration=None, content_category=None, is_trending=False, creators_df=None, creators_version=None):  # ADD creators_df parameter
         """Analyze a creator with TikTok-specific metrics"""
         # Calculate engagement score
         engagement_score = self.calculate_engagement_score(views, likes, shares)
@@ -59,13 +79,13 @@ class CreatorAnalyzer:
             fair_reward_percentage = self.calculate_fair_reward_percentage(engagement_score, total_existing_engagement)
             
             # Calculate ranking
-            ranking = self.calculate_ranking(engagement_score, creators_df['Engagement Score'])
+            ranking = self.calculate_ranking(engagement_score, self.get_engagement_index(creators_df, creators_version))
             
             # Find similar creators
-            similar_creators = self.find_similar_creators(engagement_score, creators_df)
+            similar_creators = self.find_similar_creators(engagement_score, creators_df, creators_version=creators_version)
             
             # Get performance tier
-            performance_tier, performance_message = self.get_performance_tier(engagement_score, creators_df)
+            performance_tier, performance_message = self.get_performance_tier(engagement_score, creators_df, creators_version)
         else:
             # Default values if no creators_df provided
             fair_reward_percentage = 0
@@ -0,0 +1,52 @@
+from collections import ChainMap
+import pandas as pd
+
+
+class CreatorPointTotals:
+    """Running per-creator point totals maintained as transactions are appended
+
+    Attach it to a TransactionLedger; every write adds its points to the
+    creators involved, so reading the totals never regroups the history.
+    fork() shares the totals with a session's ledger fork, which keeps only
+    the creators its own sends change.
+    """
+
+    NAME = "creator_totals"
+
+    def __init__(self):
+        self._totals = ChainMap()  # Writes land in the first map
+        self._series = None
+
+    def fork(self):
+        """Totals sharing these ones copy-on-write, and their cached Series until the first write
+
+        This object must not be updated once forked.
+        """
+        forked = type(self)()
+        forked._totals = ChainMap({}, *self._totals.maps)
+        forked._series = self._series
+        return forked
+
+    def on_append(self, ledger, start, stop):
+        """Ingest ledger rows [start, stop)"""
+        creators = ledger.column("creator")[start:stop]
+        points = ledger.column("points")[start:stop]
+
+        if stop - start == 1:
+            creator = creators[0]
+            self._totals[creator] = self._totals.get(creator, 0) + int(points[0])
+        else:
+            batch = pd.Series(points).groupby(creators).sum()
+            for creator, total in batch.items():
+                self._totals[creator] = self._totals.get(creator, 0) + int(total)
+        self._series = None
+
+    def get(self, creator):
+        """Total points received by one creator"""
+        return self._totals.get(creator, 0)
+
+    def totals(self):
+        """Series of creator -> total points, cached until the next write"""
+        if self._series is None:
+            self._series = pd.Series(dict(self._totals), dtype="int64")
+        return self._series
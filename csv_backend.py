@@ -0,0 +1,30 @@
+import os
+import pandas as pd
+from storage_backend import StorageBackend
+from transaction_ledger import TransactionLedger
+
+
+class CSVBackend(StorageBackend):
+    """The original flat-file storage: tables are CSVs, transactions stay in memory"""
+
+    def __init__(self, creators_path="tiktok_creators.csv", viewers_path="tiktok_viewers.csv"):
+        self.creators_path = creators_path
+        self.viewers_path = viewers_path
+
+    def data_files(self):
+        return (self.creators_path, self.viewers_path)
+
+    def load_tables(self):
+        creators = pd.read_csv(self.creators_path) if os.path.exists(self.creators_path) else None
+        viewers = pd.read_csv(self.viewers_path) if os.path.exists(self.viewers_path) else None
+        return creators, viewers
+
+    def save_tables(self, creators, viewers):
+        creators.to_csv(self.creators_path, index=False)
+        viewers.to_csv(self.viewers_path, index=False)
+
+    def load_transactions(self):
+        return pd.DataFrame(columns=list(TransactionLedger.COLUMNS))
+
+    def append_transaction(self, transaction):
+        pass  # Transactions are not persisted by the CSV backend
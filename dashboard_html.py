@@ -0,0 +1,263 @@
+"""HTML for the dashboard's list panels
+
+Each list (leaderboard, transaction feed, quality rankings, engagement table)
+is rendered as one block of markup and sent with a single st.markdown call.
+Rows share the CSS classes in DASHBOARD_CSS, which UIManager injects once per
+run with the global styles, instead of repeating inline styles on every row.
+"""
+from html import escape
+
+DASHBOARD_CSS = """
+<style>
+/* Creator leaderboard */
+.fs-leader-top {
+    background: linear-gradient(135deg, #FF0050, #00F2EA);
+    color: white;
+    text-align: center;
+    border: 2px solid #00F2EA;
+}
+.fs-leader-top h3, .fs-leader-top h4 { margin: 0; padding: 0; color: white; }
+.fs-leader-top p { font-weight: bold; }
+.fs-leader-top p.fs-leader-engagement { margin: 0; font-weight: normal; opacity: 0.8; }
+.fs-leader-1 { padding: 15px; border-radius: 15px; margin: 10px 0; box-shadow: 0 4px 15px rgba(255, 0, 80, 0.4); }
+.fs-leader-1 h3 { font-size: 24px; }
+.fs-leader-1 p { margin: 5px 0; font-size: 18px; }
+.fs-leader-1 p.fs-leader-engagement { font-size: 14px; }
+.fs-leader-2 { padding: 12px; border-radius: 12px; margin: 8px 0; box-shadow: 0 3px 12px rgba(255, 0, 80, 0.4); }
+.fs-leader-2 h4 { font-size: 20px; }
+.fs-leader-2 p { margin: 3px 0; font-size: 16px; }
+.fs-leader-2 p.fs-leader-engagement { font-size: 12px; }
+.fs-leader-3 { padding: 10px; border-radius: 10px; margin: 6px 0; box-shadow: 0 2px 10px rgba(255, 0, 80, 0.4); }
+.fs-leader-3 h4 { font-size: 18px; }
+.fs-leader-3 p { margin: 2px 0; font-size: 14px; }
+.fs-leader-3 p.fs-leader-engagement { font-size: 11px; }
+.fs-leader-row {
+    background: linear-gradient(90deg, #f8f9fa, #ffffff);
+    border-left: 4px solid #FF0050;
+    padding: 10px 15px;
+    margin: 4px 0;
+    border-radius: 8px;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    box-shadow: 0 2px 8px rgba(255, 0, 80, 0.1);
+    transition: all 0.3s ease;
+}
+.fs-leader-row .fs-leader-name { font-weight: 600; color: #333; }
+.fs-leader-row .fs-leader-points { color: #FF0050; font-weight: 600; }
+
+/* Recent activity feed */
+.fs-feed-head, .fs-feed-row {
+    display: grid;
+    grid-template-columns: 0.5fr 1fr 1fr 0.8fr 0.8fr;
+    gap: 10px;
+    padding: 10px;
+}
+.fs-feed-head {
+    background: linear-gradient(90deg, #FF0050, #00F2EA);
+    color: white;
+    border-radius: 8px;
+    margin: -10px 0 10px 0;  /* Negative top margin to pull up */
+    font-weight: 600;
+    font-size: 14px;
+}
+.fs-feed-row {
+    background: #f8f9fa;
+    border-left: 3px solid #FF0050;
+    border-radius: 6px;
+    margin-bottom: 5px;
+    font-size: 13px;
+    transition: all 0.2s ease;
+}
+.fs-feed-row.fs-alt { background: #ffffff; border-left-color: #00F2EA; }
+.fs-feed-rank { font-weight: 600; color: #FF0050; }
+.fs-feed-time { color: #666; }
+.fs-feed-parties { font-weight: 500; }
+.fs-feed-viewer { color: #FF0050; }
+.fs-feed-arrow { color: #999; }
+.fs-feed-creator { color: #00F2EA; }
+.fs-feed-points { font-weight: 600; color: #333; }
+.fs-badge {
+    color: black !important;
+    padding: 2px 8px;
+    border-radius: 12px;
+    font-size: 11px;
+    font-weight: 500;
+}
+.fs-badge-hold { background: #FF0050 !important; }
+.fs-badge-ok { background: #00F2EA !important; }
+.transaction-container {
+    background: transparent;
+    border-radius: 12px;
+    padding: 15px;
+    max-height: 400px;
+    overflow-y: auto;
+}
+
+/* Content quality rankings (unknown tiers keep the cyan gradient) */
+.fs-quality-row {
+    background: linear-gradient(90deg, #00F2EA, rgba(255,255,255,0.1));
+    color: white;
+    padding: 12px;
+    border-radius: 10px;
+    margin: 8px 0;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    border: none;
+}
+.fs-quality-row.fs-tier-diamond { background: linear-gradient(90deg, #B9F2FF, #87CEEB); color: #333; border: 2px solid #00BFFF; }
+.fs-quality-row.fs-tier-gold { background: linear-gradient(90deg, #FFA500, rgba(255,255,255,0.1)); }
+.fs-quality-row.fs-tier-silver { background: linear-gradient(90deg, #C0C0C0, rgba(255,255,255,0.1)); }
+.fs-quality-row.fs-tier-bronze { background: linear-gradient(90deg, #CD7F32, rgba(255,255,255,0.1)); }
+.fs-quality-row.fs-tier-standard { background: #f8f9fa; color: #333; border: 1px solid #dee2e6; }
+.fs-quality-tier { margin-left: 10px; opacity: 0.8; }
+.fs-quality-score { text-align: right; }
+.fs-quality-score div:first-child { font-size: 18px; font-weight: bold; }
+.fs-quality-score div:last-child { font-size: 12px; opacity: 0.8; }
+
+/* Engagement metrics table */
+.fs-engagement {
+    background: white;
+    border-radius: 15px;
+    overflow: hidden;
+    box-shadow: 0 4px 20px rgba(255, 0, 80, 0.15);
+    margin: 20px 0;
+    width: 100%;
+}
+.fs-engagement table { width: 100%; border-collapse: collapse; border-spacing: 0; font-family: Arial, sans-serif; }
+.fs-engagement th, .fs-engagement td {
+    padding: 15px 10px;
+    border: none;
+    border-bottom: 1px solid #e9ecef;
+    text-align: center;
+    vertical-align: middle;
+}
+.fs-engagement thead tr { background: linear-gradient(90deg, #FF0050, #00F2EA); color: white; }
+.fs-engagement th { font-weight: 600; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; }
+.fs-engagement td { font-size: 13px; color: #666; }
+.fs-engagement tbody tr { background: #f8f9fa; height: 50px; }
+.fs-engagement tbody tr:nth-child(even) { background: #ffffff; }
+.fs-engagement td.fs-engagement-rank { font-weight: 600; color: #FF0050; }
+.fs-engagement td.fs-engagement-creator { font-weight: 500; color: inherit; }
+.fs-engagement td.fs-engagement-score { font-weight: 600; color: #00F2EA; }
+.fs-share {
+    background: #10B981;
+    color: white;
+    padding: 4px 8px;
+    border-radius: 12px;
+    font-size: 11px;
+    font-weight: 600;
+    display: inline-block;
+    min-width: 55px;
+    text-align: center;
+}
+.fs-share.fs-share-top3 { background: #FF0050; }
+.fs-share.fs-share-top6 { background: #00F2EA; }
+</style>
+"""
+
+# Engagement table column header -> width in pixels
+ENGAGEMENT_HEADERS = {
+    "Rank": 80,
+    "Creator": 150,
+    "Views": 120,
+    "Likes": 100,
+    "Shares": 100,
+    "Engagement Score": 140,
+    "Fair Reward %": 120,
+}
+
+
+def leaderboard_html(top_creators):
+    """Cards for the top three creators followed by one row per remaining creator"""
+    medals = ("🥇", "🥈", "🥉")
+    parts = []
+    columns = ("Creator", "Points", "Engagement Score")
+    for idx, (name, points, engagement) in enumerate(zip(*(top_creators[column].tolist() for column in columns))):
+        name = escape(str(name))
+        points = f"{points:,}"
+        if idx < len(medals):
+            heading = "h3" if idx == 0 else "h4"
+            parts.append(
+                f'<div class="fs-leader-top fs-leader-{idx + 1}">'
+                f'<{heading}>{medals[idx]} {name}</{heading}>'
+                f'<p>{points} points</p>'
+                f'<p class="fs-leader-engagement">Engagement: {engagement:.1f}</p>'
+                f'</div>'
+            )
+        else:
+            parts.append(
+                f'<div class="fs-leader-row">'
+                f'<span class="fs-leader-name">#{idx + 1} {name}</span>'
+                f'<span class="fs-leader-points">{points} pts</span>'
+                f'</div>'
+            )
+    return '<div class="fs-leaderboard">\n' + "\n".join(parts) + "\n</div>"
+
+
+def transaction_feed_html(transactions):
+    """Header row plus one grid row per transaction (display-header frame, newest first)"""
+    parts = [
+        '<div class="fs-feed-head"><div>#</div><div>Time (SGT)</div>'
+        '<div>Viewer → Creator</div><div>Points</div><div>Status</div></div>'
+    ]
+    columns = ("Time (SGT)", "Viewer", "Creator", "Points", "Status")
+    rows = zip(*(transactions[column].tolist() for column in columns))
+    for idx, (time, viewer, creator, points, flagged) in enumerate(rows):
+        time_str = str(time)
+        if len(time_str) > 20:
+            time_str = time_str[:20] + "..."
+        if flagged:
+            badge = '<span class="fs-badge fs-badge-hold">⚠️ On Hold</span>'
+        else:
+            badge = '<span class="fs-badge fs-badge-ok">✅ Successful</span>'
+        parts.append(
+            f'<div class="fs-feed-row{" fs-alt" if idx % 2 else ""}">'
+            f'<div class="fs-feed-rank">{idx + 1}</div>'
+            f'<div class="fs-feed-time">{escape(time_str)}</div>'
+            f'<div class="fs-feed-parties"><span class="fs-feed-viewer">{escape(str(viewer))}</span> '
+            f'<span class="fs-feed-arrow">→</span> <span class="fs-feed-creator">{escape(str(creator))}</span></div>'
+            f'<div class="fs-feed-points">{points:,}</div>'
+            f'<div>{badge}</div>'
+            f'</div>'
+        )
+    return '<div class="fs-feed">\n' + "\n".join(parts) + "\n</div>"
+
+
+def quality_rankings_html(quality_df):
+    """One row per creator, colored by quality tier"""
+    parts = []
+    columns = ("Creator", "Tier", "Quality Score", "Multiplier")
+    for creator, tier, score, multiplier in zip(*(quality_df[column].tolist() for column in columns)):
+        tier = str(tier)
+        parts.append(
+            f'<div class="fs-quality-row fs-tier-{escape(tier.lower())}">'
+            f'<div><strong>{escape(str(creator))}</strong>'
+            f'<span class="fs-quality-tier">{escape(tier)} Tier</span></div>'
+            f'<div class="fs-quality-score"><div>{score}/100</div><div>{multiplier}x Rewards</div></div>'
+            f'</div>'
+        )
+    return '<div class="fs-quality">\n' + "\n".join(parts) + "\n</div>"
+
+
+def engagement_table_html(engagement_df):
+    """Table of ranked engagement metrics; the share badge is colored by rank"""
+    header = "".join(f'<th style="width: {width}px;">{name}</th>' for name, width in ENGAGEMENT_HEADERS.items())
+    rows = []
+    columns = ("Creator", "Views", "Likes", "Shares", "Engagement Score", "Fair Reward %")
+    for idx, (creator, views, likes, shares, score, share) in enumerate(
+            zip(*(engagement_df[column].tolist() for column in columns))):
+        badge = " fs-share-top3" if idx < 3 else " fs-share-top6" if idx < 6 else ""
+        rows.append(
+            f'<tr><td class="fs-engagement-rank">#{idx + 1}</td>'
+            f'<td class="fs-engagement-creator">{escape(str(creator))}</td>'
+            f'<td>{views:,}</td><td>{likes:,}</td><td>{shares:,}</td>'
+            f'<td class="fs-engagement-score">{score:,}</td>'
+            f'<td><span class="fs-share{badge}">{share:.2f}%</span></td></tr>'
+        )
+    return (
+        '<div class="fs-engagement">\n<table>\n'
+        f'<thead><tr>{header}</tr></thead>\n'
+        '<tbody>\n' + "\n".join(rows) + '\n</tbody>\n</table>\n</div>'
+    )
@@ -1,15 +1,31 @@
+import inspect
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from system_monitor import SystemMonitor
-from creator_analyzer import CreatorAnalyzer
-from content_quality_analyzer import ContentQualityAnalyzer
+from transaction_ledger import transaction_epochs
+from latency_metrics import measure
+from dashboard_view_model import DashboardViewModel
+from dashboard_html import engagement_table_html, leaderboard_html, quality_rankings_html, transaction_feed_html
+
+# plotly.express and the analyzers are imported where first used, keeping them off the cold start
+
+# Stateful tabs (key/on_change and TabContainer.open) only exist in recent Streamlit
+# releases; older ones get plain st.tabs, which runs every tab on each rerun
+STATEFUL_TABS = "on_change" in inspect.signature(st.tabs).parameters
 
 class DashboardManager:
-    def __init__(self):
-        pass
+    MAIN_TABS = (
+        "🏆 Reward Dashboard",
+        "🎯 Quality & Fairness",  # CHANGED: More accurate title
+        "🛡️ Compliance & AML",
+        "🏥 System Health",
+    )
+    
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager
+        self.view_model = DashboardViewModel(db_manager)  # Memoized data of every panel
     
     def display_metrics(self, creators, transactions):
         """Display main metrics at the top"""
@@ -29,6 +45,7 @@ class DashboardManager:
 
         with col_chart:
             st.subheader("Points Distribution")
+            import plotly.express as px
             fig = px.pie(
                 creators,
                 values="Points",
@@ -59,6 +76,7 @@ class DashboardManager:
 
         # Visual representation of content quality per creator
         st.subheader("Engagement Score Bar Chart")
+        import plotly.express as px
         fig2 = px.bar(
             creators,
             x="Creator",
@@ -74,9 +92,9 @@ class DashboardManager:
         if transactions.empty:
             st.info("No transactions yet. Use the sidebar to send points.")
         else:
-            df_hist = transactions.copy()
-            # Sort newest first
-            df_hist = df_hist.sort_values("timestamp", ascending=False).reset_index(drop=True)
+            # Sort newest first on the epoch parsed at ingest
+            order = np.argsort(transaction_epochs(transactions), kind="stable")[::-1]
+            df_hist = transactions.iloc[order].reset_index(drop=True)
             # 1-based numbering
             df_hist.index = df_hist.index + 1
             # Show concise columns with friendlier headers
@@ -91,745 +109,253 @@ class DashboardManager:
             st.dataframe(df_hist)
     
     def create_main_dashboard(self, creators, transactions):
-        """Create the main dashboard with updated creator points"""
-        # Calculate updated creator points from transactions
-        updated_creators = self.calculate_creator_points_from_transactions(transactions, creators)
-        
-        # Create tabs with updated names
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "🏆 Reward Dashboard", 
-            "🎯 Quality & Fairness",  # CHANGED: More accurate title
-            "🛡️ Compliance & AML", 
-            "🏥 System Health"
-        ])
-        
-        with tab1:
-            # Two columns: Leaderboard and Transaction History (main focus)
-            col_leaderboard, col_transactions = st.columns([1, 1])
+        """Create the main dashboard with updated creator points
+        
+        Where Streamlit supports stateful tabs, they track which one is
+        selected and only the selected tab runs, so a rerun costs one tab's
+        work instead of all four.
+        """
+        # Anomaly alerts reach the monitor's history on every rerun, not only with its tab open
+        self.view_model.collect_alerts()
+        
+        # Create tabs with updated names; switching tabs reruns with the new one open
+        if STATEFUL_TABS:
+            tabs = st.tabs(self.MAIN_TABS, key="main_dashboard_tab", on_change="rerun")
+        else:
+            tabs = st.tabs(self.MAIN_TABS)
+        renderers = (
+            lambda: self._render_reward_tab(creators, transactions),
+            lambda: self._render_quality_tab(creators, transactions),
+            lambda: self.create_compliance_dashboard(transactions, creators),
+            lambda: self.create_system_health_dashboard(creators, transactions),
+        )
+        for label, tab, render in zip(self.MAIN_TABS, tabs, renderers):
+            # open is False for hidden tabs (None, or missing, if the tabs do not track state)
+            if getattr(tab, "open", None) is not False:
+                with tab, measure(f"dashboard.tab.{label}"):
+                    render()
+    
+    def _render_reward_tab(self, creators, transactions):
+        """Leaderboard, points distribution and transaction history"""
+        view_model = self.view_model
+        updated_creators = view_model.creator_points(creators, transactions)
+        
+        # Two columns: Leaderboard and Transaction History (main focus)
+        col_leaderboard, col_transactions = st.columns([1, 1])
 
-            with col_leaderboard:
-                # Creators (Leaderboard)
-                st.subheader("🏆 Creator Leaderboard")
-                
-                # Get top creators ranked by POINTS (top 15 instead of all 100)
-                # Group by Creator name and sum their points to avoid duplicates
-                creators_grouped = updated_creators.groupby('Creator').agg({
-                    'Points': 'sum',
-                    'Engagement Score': 'mean',  # Average engagement score for display
-                    'Views': 'sum',
-                    'Likes': 'sum',
-                    'Shares': 'sum'
-                }).reset_index()
-                
-                # Sort by total points and get top 15
-                top_creators = creators_grouped.sort_values("Points", ascending=False).head(15)
+        with col_leaderboard:
+            # Creators (Leaderboard)
+            st.subheader("🏆 Creator Leaderboard")
+            
+            # Create a more visually appealing leaderboard
+            top_creators = view_model.leaderboard(creators, transactions)
+            st.markdown(leaderboard_html(top_creators), unsafe_allow_html=True)
+            
+            # Show "View All" button if there are more creators
+            if len(updated_creators) > 15:
+                if st.button("📋 View All Creators", type="secondary"):
+                    st.session_state.show_all_creators = not st.session_state.get("show_all_creators", False)
+                    st.rerun()
                 
-                # Create a more visually appealing leaderboard
-                for idx, (_, creator) in enumerate(top_creators.iterrows()):
-                    # Special styling for top 3 with same pink-to-cyan gradient
-                    if idx == 0:
+                # Show all creators in a beautiful TikTok-themed table
+                if st.session_state.get("show_all_creators", False):
+                    with st.expander("📊 All Creators Data", expanded=True):
+                        # Create a custom TikTok-themed table header
                         st.markdown(f"""
                         <div style="
                             background: linear-gradient(135deg, #FF0050, #00F2EA);
                             color: white;
                             padding: 15px;
                             border-radius: 15px;
-                            margin: 10px 0;
-                            text-align: center;
-                            box-shadow: 0 4px 15px rgba(255, 0, 80, 0.4);
-                            border: 2px solid #00F2EA;
-                        ">
-                            <h3 style="margin: 0; font-size: 24px;">🥇 {creator['Creator']}</h3>
-                            <p style="margin: 5px 0; font-size: 18px; font-weight: bold;">{creator['Points']:,} points</p>
-                            <p style="margin: 0; font-size: 14px; opacity: 0.8;">Engagement: {creator['Engagement Score']:.1f}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    elif idx == 1:
-                        st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(135deg, #FF0050, #00F2EA);
-                            color: white;
-                            padding: 12px;
-                            border-radius: 12px;
-                            margin: 8px 0;
-                            text-align: center;
-                            box-shadow: 0 3px 12px rgba(255, 0, 80, 0.4);
-                            border: 2px solid #00F2EA;
-                        ">
-                            <h4 style="margin: 0; font-size: 20px;">🥈 {creator['Creator']}</h4>
-                            <p style="margin: 3px 0; font-size: 16px; font-weight: bold;">{creator['Points']:,} points</p>
-                            <p style="margin: 0; font-size: 12px; opacity: 0.8;">Engagement: {creator['Engagement Score']:.1f}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    elif idx == 2:
-                        st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(135deg, #FF0050, #00F2EA);
-                            color: white;
-                            padding: 10px;
-                            border-radius: 10px;
-                            margin: 6px 0;
+                            margin-bottom: 20px;
                             text-align: center;
-                            box-shadow: 0 2px 10px rgba(255, 0, 80, 0.4);
-                            border: 2px solid #00F2EA;
-                        ">
-                            <h4 style="margin: 0; font-size: 18px;">🥉 {creator['Creator']}</h4>
-                            <p style="margin: 2px 0; font-size: 14px; font-weight: bold;">{creator['Points']:,} points</p>
-                            <p style="margin: 0; font-size: 11px; opacity: 0.8;">Engagement: {creator['Engagement Score']:.1f}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        # Regular top 15 creators with transaction history colors
-                        st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(90deg, #f8f9fa, #ffffff);
-                            border-left: 4px solid #FF0050;
-                            padding: 10px 15px;
-                            margin: 4px 0;
-                            border-radius: 8px;
-                            display: flex;
-                            justify-content: space-between;
-                            align-items: center;
-                            box-shadow: 0 2px 8px rgba(255, 0, 80, 0.1);
-                            transition: all 0.3s ease;
                         ">
-                            <span style="font-weight: 600; color: #333;">#{idx+1} {creator['Creator']}</span>
-                            <span style="color: #FF0050; font-weight: 600;">{creator['Points']:,} pts</span>
+                            <h3 style="margin: 0;">🎯 Complete Creator Database</h3>
+                            <p style="margin: 5px 0 0 0; opacity: 0.9;">All {len(updated_creators)} creators ranked by performance</p>
                         </div>
                         """, unsafe_allow_html=True)
-                
-                # Show "View All" button if there are more creators
-                if len(updated_creators) > 15:
-                    if st.button("📋 View All Creators", type="secondary"):
-                        st.session_state.show_all_creators = not st.session_state.get("show_all_creators", False)
-                        st.rerun()
-                    
-                    # Show all creators in a beautiful TikTok-themed table
-                    if st.session_state.get("show_all_creators", False):
-                        with st.expander("📊 All Creators Data", expanded=True):
-                            # Create a custom TikTok-themed table header
-                            st.markdown(f"""
-                            <div style="
-                                background: linear-gradient(135deg, #FF0050, #00F2EA);
-                                color: white;
-                                padding: 15px;
-                                border-radius: 15px;
-                                margin-bottom: 20px;
-                                text-align: center;
-                            ">
-                                <h3 style="margin: 0;">🎯 Complete Creator Database</h3>
-                                <p style="margin: 5px 0 0 0; opacity: 0.9;">All {len(updated_creators)} creators ranked by performance</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Use Streamlit's native dataframe with custom styling instead of HTML
-                            # Create a styled dataframe
-                            display_df = updated_creators.copy()
-                            display_df.insert(0, 'Rank', range(1, len(display_df) + 1))
-                            
-                            # Add performance tier column
-                            def get_performance_tier(rank):
-                                if rank <= 3:
-                                    return '🥇 Top 3'
-                                elif rank <= 10:
-                                    return '🥈 Top 10'
-                                elif rank <= 50:
-                                    return '🥉 Top 50'
-                                else:
-                                    return '📊 Active'
-                            
-                            display_df['Performance'] = display_df['Rank'].apply(get_performance_tier)
-                            
-                            # Reorder columns for better display
-                            display_df = display_df[['Rank', 'Creator', 'Points', 'Engagement Score', 'Performance']]
-                            
-                            # Display with custom styling
-                            st.dataframe(
-                                display_df,
-                                use_container_width=True,
-                                hide_index=True,
-                                column_config={
-                                    "Rank": st.column_config.NumberColumn(
-                                        "Rank",
-                                        help="Creator ranking",
-                                        format="%d"
-                                    ),
-                                    "Creator": st.column_config.TextColumn(
-                                        "Creator",
-                                        help="Creator name"
-                                    ),
-                                    "Points": st.column_config.NumberColumn(
-                                        "Points",
-                                        help="Total points earned",
-                                        format="%d"
-                                    ),
-                                    "Engagement Score": st.column_config.NumberColumn(
-                                        "Engagement Score",
-                                        help="Creator engagement score",
-                                        format="%d"
-                                    ),
-                                    "Performance": st.column_config.TextColumn(
-                                        "Performance",
-                                        help="Performance tier"
-                                    )
-                                }
-                            )
-                            
-                 # Add pie chart right below the leaderboard
-                st.markdown("---")  # Add separator
-                st.markdown("""
-                 <h4 style="text-align: center; color: white; margin: 20px 0; font-weight: 600; opacity: 0.8;">
-                     📊 Points Distribution Overview
-                 </h4>
-                 """, unsafe_allow_html=True)
-                 
-                 # Pie chart below leaderboard
-                col_pie, col_legend = st.columns([2, 1])
-                 
-                with col_pie:
-                    # Filter out creators with very small percentages to reduce clutter
-                    min_percentage = 1.0
-                    total_points = updated_creators['Points'].sum()
-                    filtered_creators = updated_creators[updated_creators['Points'] >= (total_points * min_percentage / 100)]
-                    
-                    # Create "Others" category for small creators
-                    if len(filtered_creators) < len(updated_creators):
-                        others_points = updated_creators[updated_creators['Points'] < (total_points * min_percentage / 100)]['Points'].sum()
-                        if others_points > 0:
-                            others_row = pd.DataFrame([{
-                                'Creator': 'Others',
-                                'Points': others_points
-                            }])
-                            filtered_creators = pd.concat([filtered_creators, others_row], ignore_index=True)
-                    
-                    # Pure TikTok brand colors only
-                    tiktok_colors = [
-                        '#FF0050',  # TikTok Pink/Reds
-                        '#00F2EA',  # TikTok Cyan/Blue
-                        '#FF0050',  # Repeat main colors
-                        '#00F2EA',  # for more slices
-                        '#FF0050',
-                        '#00F2EA',
-                        '#FF0050',
-                        '#00F2EA'
-                    ]
-                    
-                    # Create smaller pie chart
-                    fig = px.pie(
-                        filtered_creators,
-                        values="Points",
-                        names="Creator",
-                        hole=0.4,
-                        title="",
-                        color_discrete_sequence=tiktok_colors
-                    )
-                    
-                    fig.update_traces(
-                        textposition='inside',
-                        textinfo='percent+label',
-                        textfont_size=10,  # Smaller text
-                        textfont_color='white',
-                        marker=dict(line=dict(color='white', width=1))
-                    )
-                    
-                    fig.update_layout(
-                        height=300,  # Smaller height
-                        showlegend=False,  # Hide legend
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        margin=dict(t=0, b=0, l=0, r=0)
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                with col_legend:
-                    st.markdown("**Top Creators by Share:**")
-                    for i, creator in filtered_creators.head(8).iterrows():  # Show top 8
-                        percentage = (creator['Points'] / total_points) * 100
-                        st.markdown(f"• **{creator['Creator']}**: {percentage:.1f}%")
-
-            with col_transactions:
-                st.subheader("📊 Transaction History")
-                if transactions.empty:
-                    st.info("No transactions yet. Use the sidebar to send points.")
-                else:
-                    df_hist = transactions.copy()
-                    df_hist = df_hist.sort_values("timestamp", ascending=False).reset_index(drop=True)
-                    df_hist.index = df_hist.index + 1
-                    df_hist = df_hist[["timestamp", "viewer", "creator", "points", "flagged"]]
-                    df_hist = df_hist.rename(columns={
-                        "timestamp": "Time (SGT)",
-                        "viewer": "Viewer",
-                        "creator": "Creator",
-                        "points": "Points",
-                        "flagged": "Status"
-                    })
-                    
-                    # Create a beautiful TikTok-themed transaction table
-                    st.markdown("""
-                    <div style="
-                        background: linear-gradient(135deg, #FF0050, #00F2EA);
-                        color: white;
-                        padding: 12px;
-                        border-radius: 12px;
-                        margin-bottom: 15px;
-                        text-align: center;
-                        box-shadow: 0 3px 12px rgba(255, 0, 80, 0.2);
-                    ">
-                        <h4 style="margin: 0; font-size: 16px;">📊 Recent Activity</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Create a scrollable container with custom styling
-                    st.markdown("""
-                    <style>
-                    .transaction-container {
-                        background: transparent;  /* Changed from white to transparent */
-                        border-radius: 12px;
-                        padding: 15px;
-                        box-shadow: none;  /* Removed shadow */
-                        border: none;  /* Removed border */
-                        max-height: 400px;
-                        overflow-y: auto;
-                    }
-                    .transaction-container::-webkit-scrollbar {
-                        width: 8px;
-                    }
-                    .transaction-container::-webkit-scrollbar-track {
-                        background: #f1f1f1;
-                        border-radius: 4px;
-                    }
-                    .transaction-container::-webkit-scrollbar-thumb {
-                        background: linear-gradient(135deg, #FF0050, #00F2EA);
-                        border-radius: 4px;
-                    }
-                    .transaction-container::-webkit-scrollbar-thumb:hover {
-                        background: linear-gradient(135deg, #E6004C, #00D4CC);
-                    }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display transactions in a scrollable container
-                    # with st.container():  # REMOVE THIS LINE
-                    # st.markdown('<div class="transaction-container">', unsafe_allow_html=True)  # REMOVE THIS LINE
-                    
-                    # Create a beautiful table header
-                    st.markdown("""
-                    <div style="
-                        display: grid;
-                        grid-template-columns: 0.5fr 1fr 1fr 0.8fr 0.8fr;
-                        gap: 10px;
-                        padding: 10px;
-                        background: linear-gradient(90deg, #FF0050, #00F2EA);
-                        color: white;
-                        border-radius: 8px;
-                        margin: -10px 0 0 0;  /* Negative top margin to pull up */
-                        font-weight: 600;
-                        font-size: 14px;
-                    ">
-                        <div>#</div>
-                        <div>Time (SGT)</div>
-                        <div>Viewer → Creator</div>
-                        <div>Points</div>
-                        <div>Status</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display only top 20 transactions instead of all
-                    top_transactions = df_hist.head(20)
-                    
-                    # Display transactions with alternating row colors
-                    for idx, (_, transaction) in enumerate(top_transactions.iterrows()):
-                        row_color = "#f8f9fa" if idx % 2 == 0 else "#ffffff"
-                        border_color = "#FF0050" if idx % 2 == 0 else "#00F2EA"
                         
-                        # Format timestamp for better display
-                        time_str = str(transaction["Time (SGT)"])
-                        if len(time_str) > 20:
-                            time_str = time_str[:20] + "..."
+                        # Use Streamlit's native dataframe with custom styling instead of HTML
+                        # Create a styled dataframe
+                        display_df = updated_creators.copy()
+                        display_df.insert(0, 'Rank', range(1, len(display_df) + 1))
                         
-                        # Create status badge
-                        if transaction["Status"]:
-                            status_badge = """
-                            <span style="
-                                background: #FF0050 !important;
-                                color: black !important;
-                                padding: 2px 8px;
-                                border-radius: 12px;
-                                font-size: 11px;
-                                font-weight: 500;
-                            ">⚠️ On Hold</span>
-                            """
-                        else:
-                            status_badge = """
-                            <span style="
-                                background: #00F2EA !important;
-                                color: black !important;
-                                padding: 2px 8px;
-                                border-radius: 12px;
-                                font-size: 11px;
-                                font-weight: 500;
-                            ">✅ Successful</span>
-                            """
+                        # Add performance tier column
+                        def get_performance_tier(rank):
+                            if rank <= 3:
+                                return '🥇 Top 3'
+                            elif rank <= 10:
+                                return '🥈 Top 10'
+                            elif rank <= 50:
+                                return '🥉 Top 50'
+                            else:
+                                return '📊 Active'
                         
-                        st.markdown(f"""
-                        <div style="
-                            display: grid;
-                            grid-template-columns: 0.5fr 1fr 1fr 0.8fr 0.8fr;
-                            gap: 10px;
-                            padding: 10px;
-                            background: {row_color};
-                            border-left: 3px solid {border_color};
-                            border-radius: 6px;
-                            margin-bottom: 5px;
-                            font-size: 13px;
-                            transition: all 0.2s ease;
-                        ">
-                            <div style="font-weight: 600; color: #FF0050;">{idx+1}</div>
-                            <div style="color: #666;">{time_str}</div>
-                            <div style="font-weight: 500;">
-                                <span style="color: #FF0050;">{transaction['Viewer']}</span> 
-                                <span style="color: #999;">→</span> 
-                                <span style="color: #00F2EA;">{transaction['Creator']}</span>
-                            </div>
-                            <div style="font-weight: 600; color: #333;">{transaction['Points']:,}</div>
-                            <div>{status_badge}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # st.markdown('</div>', unsafe_allow_html=True)  # REMOVE THIS LINE
-                    
-                    # Show "View More" button if there are more than 20 transactions
-                    if len(df_hist) > 20:
-                        if st.button("📋 View All Transactions", type="secondary"):
-                            st.session_state.show_all_transactions = not st.session_state.get("show_all_transactions", False)
-                            st.rerun()
+                        display_df['Performance'] = display_df['Rank'].apply(get_performance_tier)
                         
-                        if st.session_state.get("show_all_transactions", False):
-                            with st.expander("📋 All Transactions", expanded=True):
-                                st.dataframe(df_hist, use_container_width=True, hide_index=True)
-                    
-                    # Add summary stats below the table
-                    total_transactions = len(df_hist)
-                    flagged_count = df_hist['Status'].sum()
-                    clean_count = total_transactions - flagged_count
-                    
-                    st.markdown(f"""
-                    <div style="
-                        background: linear-gradient(90deg, #f8f9fa, #ffffff);
-                        border: 2px solid #FF0050;
-                        border-radius: 10px;
-                        padding: 12px;
-                        margin-top: 15px;
-                        text-align: center;
-                    ">
-                        <p style="margin: 0; color: #FF0050; font-weight: 600; font-size: 14px;">
-                            📊 Total: {total_transactions} | ✅ Clean: {clean_count} | ⚠️ Flagged: {flagged_count}
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-        with tab2:
-            st.subheader("🎯 Creator Engagement Metrics")
-            
-            # NEW: Add Content Quality Analysis section
+                        # Reorder columns for better display
+                        display_df = display_df[['Rank', 'Creator', 'Points', 'Engagement Score', 'Performance']]
+                        
+                        # Display with custom styling
+                        st.dataframe(
+                            display_df,
+                            use_container_width=True,
+                            hide_index=True,
+                            column_config={
+                                "Rank": st.column_config.NumberColumn(
+                                    "Rank",
+                                    help="Creator ranking",
+                                    format="%d"
+                                ),
+                                "Creator": st.column_config.TextColumn(
+                                    "Creator",
+                                    help="Creator name"
+                                ),
+                                "Points": st.column_config.NumberColumn(
+                                    "Points",
+                                    help="Total points earned",
+                                    format="%d"
+                                ),
+                                "Engagement Score": st.column_config.NumberColumn(
+                                    "Engagement Score",
+                                    help="Creator engagement score",
+                                    format="%d"
+                                ),
+                                "Performance": st.column_config.TextColumn(
+                                    "Performance",
+                                    help="Performance tier"
+                                )
+                            }
+                        )
+                        
+             # Add pie chart right below the leaderboard
+            st.markdown("---")  # Add separator
             st.markdown("""
-            <div style="
-                background: linear-gradient(135deg, #FF0050, #00F2EA);
-                color: white;
-                padding: 15px;
-                border-radius: 15px;
-                margin-bottom: 20px;
-                text-align: center;
-                box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
-            ">
-                <h3 style="margin: 0;">🔍 Content Quality Analysis</h3>
-                <p style="margin: 5px 0 0 0; opacity: 0.9;">Advanced creator quality scoring system</p>
-            </div>
-            """, unsafe_allow_html=True)
+             <h4 style="text-align: center; color: white; margin: 20px 0; font-weight: 600; opacity: 0.8;">
+                 📊 Points Distribution Overview
+             </h4>
+             """, unsafe_allow_html=True)
+             
+             # Pie chart below leaderboard
+            col_pie, col_legend = st.columns([2, 1])
+             
+            with col_pie:
+                points_share = view_model.points_share(creators, transactions)
+                st.plotly_chart(points_share["figure"], use_container_width=True)
             
-             # NEW: Add transparency section showing how calculations work
-            with st.expander("🔍 How Quality Scores Are Calculated", expanded=False):
+            with col_legend:
+                st.markdown("**Top Creators by Share:**")
+                top_share = points_share["creators"].head(8)  # Show top 8
+                percentages = top_share['Points'] / points_share["total_points"] * 100
+                st.markdown("\n\n".join(
+                    f"• **{name}**: {percentage:.1f}%" for name, percentage in zip(top_share['Creator'], percentages)
+                ))
+
+        with col_transactions:
+            st.subheader("📊 Transaction History")
+            if transactions.empty:
+                st.info("No transactions yet. Use the sidebar to send points.")
+            else:
+                counts = view_model.transaction_counts(transactions)
+                
+                # Create a beautiful TikTok-themed transaction table
                 st.markdown("""
                 <div style="
                     background: linear-gradient(135deg, #FF0050, #00F2EA);
                     color: white;
-                    padding: 15px;
-                    border-radius: 15px;
-                    margin-bottom: 20px;
+                    padding: 12px;
+                    border-radius: 12px;
+                    margin-bottom: 15px;
                     text-align: center;
-                    box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
+                    box-shadow: 0 3px 12px rgba(255, 0, 80, 0.2);
                 ">
-                    <h4 style="margin: 0;">📊 Quality Score Formula</h4>
-                    <p style="margin: 5px 0 0 0; opacity: 0.9;">Transparent calculation breakdown</p>
+                    <h4 style="margin: 0; font-size: 16px;">📊 Recent Activity</h4>
                 </div>
                 """, unsafe_allow_html=True)
                 
-                # Quality Score Breakdown - FIXED LAYOUT
-                st.markdown("**🎯 Quality Factors & Weights:**")
-                st.markdown("""
-                - **Engagement Quality (40%)**: How well audience engages with content
-                - **Consistency Quality (25%)**: How consistent creator performance is
-                - **Growth Quality (20%)**: How much creator is improving over time
-                - **Content Quality (15%)**: Content type and duration bonuses
-                """)
-                
-                st.markdown("---")
-                
-                # Engagement Quality Section
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    st.markdown("**📊 Engagement Quality (40%):**")
-                    st.markdown("""
-                    How well your audience engages with your content.
-                    
-                    **Formula:**
-                    Engagement Rate = (Likes + Shares) / Views
-                    Engagement Score = min(100, Engagement Rate × 1000)
-                    
-                    **Example:**
-                    50,000 likes + 2,000 shares / 1,000,000 views = 0.052 = 52.0/100
-                    """)
-                
-                with col2:
-                    st.markdown("**📊 Consistency Quality (25%):**")
-                    st.markdown("""
-                    How consistent your transaction amounts are.
-                    
-                    **Formula:**
-                    Coefficient of Variation = Standard Deviation / Mean
-                    Consistency Score = max(0, 100 - (CV × 100))
-                    
-                    **Example:**
-                    Lower variation = Higher consistency score
-                    """)
-                
-                st.markdown("---")
-                
-                # Growth and Content Quality Section
-                col3, col4 = st.columns([1, 1])
-                with col3:
-                    st.markdown("**📈 Growth Quality (20%):**")
-                    st.markdown("""
-                    How much you're improving over time.
-                    
-                    **Formula:**
-                    Growth Rate = (Recent Avg - Older Avg) / Older Avg
-                    Growth Score = 50 + (Growth Rate × 100)
-                    
-                    **Example:**
-                    Positive growth = Higher score, capped at 100
-                    """)
+                # Header and the newest 20 transactions (instead of all) in one block
+                top_transactions = view_model.recent_transactions(transactions)
+                st.markdown(transaction_feed_html(top_transactions), unsafe_allow_html=True)
                 
-                with col4:
-                    st.markdown("**🎬 Content Quality (15%):**")
-                    st.markdown("""
-                    Content type and duration bonuses.
-                    
-                    **Formula:**
-                    Base Score + Future Enhancements
+                # Show "View More" button if there are more than 20 transactions
+                if counts["total"] > len(top_transactions):
+                    if st.button("📋 View All Transactions", type="secondary"):
+                        st.session_state.show_all_transactions = not st.session_state.get("show_all_transactions", False)
+                        st.rerun()
                     
-                    **Future Features:**
-                    Video duration, audience retention, content category
-                    """)
-                
-                st.markdown("---")
-                
-                # Tier System Explanation
-                st.markdown("**🏆 Tier System & Reward Multipliers:**")
-                
-                tier_col1, tier_col2, tier_col3, tier_col4, tier_col5 = st.columns(5)
-                
-                with tier_col1:
-                    st.markdown("""
-                    <div style="
-                        background: linear-gradient(135deg, #B9F2FF, #87CEEB);  /* Diamond blue colors */
-                        color: #333;  /* Dark text for readability */
-                        padding: 10px;
-                        border-radius: 10px;
-                        text-align: center;
-                        margin: 5px 0;
-                        height: 80px;
-                        display: flex;
-                        flex-direction: column;
-                        justify-content: center;
-                        align-items: center;
-                        border: 2px solid #00BFFF;  /* Diamond border */
-                    ">
-                        <strong>Diamond</strong><br>
-                        90+ Score<br>
-                        <span style="font-size: 18px;">2.0x</span> Rewards
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with tier_col2:
-                    st.markdown("""
-                    <div style="
-                        background: linear-gradient(135deg, #FFA500, #FF6B35);
-                        color: white;
-                        padding: 10px;
-                        border-radius: 10px;
-                        text-align: center;
-                        margin: 5px 0;
-                        height: 80px;
-                        display: flex;
-                        flex-direction: column;
-                        justify-content: center;
-                        align-items: center;
-                    ">
-                        <strong>Gold</strong><br>
-                        80+ Score<br>
-                        <span style="font-size: 18px;">1.5x</span> Rewards
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with tier_col3:
-                    st.markdown("""
-                    <div style="
-                        background: linear-gradient(135deg, #C0C0C0, #A0A0A0);
-                        color: white;
-                        padding: 10px;
-                        border-radius: 10px;
-                        text-align: center;
-                        margin: 5px 0;
-                        height: 80px;
-                        display: flex;
-                        flex-direction: column;
-                        justify-content: center;
-                        align-items: center;
-                    ">
-                        <strong>Silver</strong><br>
-                        70+ Score<br>
-                        <span style="font-size: 18px;">1.25x</span> Rewards
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with tier_col4:
-                    st.markdown("""
-                    <div style="
-                        background: linear-gradient(135deg, #CD7F32, #B8860B);
-                        color: white;
-                        padding: 10px;
-                        border-radius: 10px;
-                        text-align: center;
-                        margin: 5px 0;
-                        height: 80px;
-                        display: flex;
-                        flex-direction: column;
-                        justify-content: center;
-                        align-items: center;
-                    ">
-                        <strong>Bronze</strong><br>
-                        60+ Score<br>
-                        <span style="font-size: 18px;">1.1x</span> Rewards
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with tier_col5:
-                    st.markdown("""
-                    <div style="
-                        background: #f8f9fa;  /* Plain light gray background */
-                        color: #333;  /* Dark text */
-                        padding: 10px;
-                        border-radius: 10px;
-                        text-align: center;
-                        margin: 5px 0;
-                        height: 80px;
-                        display: flex;
-                        flex-direction: column;
-                        justify-content: center;
-                        align-items: center;
-                        border: 1px solid #dee2e6;  /* Subtle border */
-                    ">
-                        <strong>Standard</strong><br>
-                        <60 Score<br>
-                        <span style="font-size: 18px;">1.0x</span> Rewards
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("---")
-                
-                # Final transparency note
-                st.info("""
-                **💡 Transparency Note:** This system ensures that creators with higher quality content, 
-                consistent performance, and steady growth receive fair rewards. All calculations are 
-                automated and based on objective metrics, eliminating bias and ensuring fairness.
-                """)
-            
-            # Calculate quality scores for top creators
-            top_creators = creators.head(10)  # Top 10 creators
-            quality_results = []
-            
-            for _, creator in top_creators.iterrows():
-                quality_result = st.session_state.content_quality_analyzer.calculate_content_quality_score(
-                    creator, transactions
-                )
-                quality_results.append({
-                    'Creator': creator['Creator'],
-                    'Quality Score': quality_result['total_quality_score'],
-                    'Tier': quality_result['quality_tier'],
-                    'Multiplier': quality_result['quality_multiplier'],
-                    'Engagement': quality_result['engagement_quality'],
-                    'Consistency': quality_result['consistency_quality'],
-                    'Growth': quality_result['growth_quality']
-                })
-            
-            # Display quality scores in a beautiful table
-            quality_df = pd.DataFrame(quality_results)
-            
-            # Create quality score table with TikTok styling
-            st.markdown("**🏆 Content Quality Rankings**")
-            
-            # Display quality scores
-            for _, row in quality_df.iterrows():
-                tier_color = {
-                    'Diamond': '#B9F2FF',  # Diamond blue (same as tier system)
-                    'Gold': '#FFA500',      # Orange (keep same)
-                    'Silver': '#C0C0C0',   # Silver (keep same)
-                    'Bronze': '#CD7F32',   # Bronze (keep same)
-                    'Standard': '#f8f9fa'  # Plain light gray (same as tier system)
-                }
+                    if st.session_state.get("show_all_transactions", False):
+                        with st.expander("📋 All Transactions", expanded=True):
+                            self._render_history_browser(transactions)
                 
-                # Use different styling for Diamond vs Standard tiers
-                if row['Tier'] == 'Diamond':
-                    background_style = f"linear-gradient(90deg, {tier_color.get(row['Tier'], '#B9F2FF')}, #87CEEB)"
-                    text_color = "#333"  # Dark text for diamond
-                    border_style = "2px solid #00BFFF"  # Diamond border
-                elif row['Tier'] == 'Standard':
-                    background_style = f"{tier_color.get(row['Tier'], '#f8f9fa')}"
-                    text_color = "#333"  # Dark text for standard
-                    border_style = "1px solid #dee2e6"  # Subtle border
-                else:
-                    background_style = f"linear-gradient(90deg, {tier_color.get(row['Tier'], '#00F2EA')}, rgba(255,255,255,0.1))"
-                    text_color = "white"  # White text for other tiers
-                    border_style = "none"
+                # Add summary stats below the table
+                total_transactions = counts["total"]
+                flagged_count = counts["flagged"]
+                clean_count = counts["clean"]
                 
                 st.markdown(f"""
                 <div style="
-                    background: {background_style};
-                    color: {text_color};
-                    padding: 12px;
+                    background: linear-gradient(90deg, #f8f9fa, #ffffff);
+                    border: 2px solid #FF0050;
                     border-radius: 10px;
-                    margin: 8px 0;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    border: {border_style};
+                    padding: 12px;
+                    margin-top: 15px;
+                    text-align: center;
                 ">
-                    <div>
-                        <strong>{row['Creator']}</strong>
-                        <span style="margin-left: 10px; opacity: 0.8;">{row['Tier']} Tier</span>
-                    </div>
-                    <div style="text-align: right;">
-                        <div style="font-size: 18px; font-weight: bold;">{row['Quality Score']}/100</div>
-                        <div style="font-size: 12px; opacity: 0.8;">{row['Multiplier']}x Rewards</div>
-                    </div>
+                    <p style="margin: 0; color: #FF0050; font-weight: 600; font-size: 14px;">
+                        📊 Total: {total_transactions} | ✅ Clean: {clean_count} | ⚠️ Flagged: {flagged_count}
+                    </p>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-                       
-            # Create a beautiful TikTok-themed table header
+
+    @st.fragment
+    def _render_history_browser(self, transactions):
+        """Filterable, paginated transaction history; paging reruns only this section"""
+        # Fragment reruns get the arguments of the last full run; the ledger view may be newer
+        transactions = st.session_state.get('transactions', transactions)
+        
+        col_viewer, col_creator, col_status = st.columns(3)
+        viewer = col_viewer.text_input("Viewer", key="history_viewer").strip() or None
+        creator = col_creator.text_input("Creator", key="history_creator").strip() or None
+        status = col_status.selectbox("Status", ["All", "Successful", "On Hold"], key="history_status")
+        flagged = None if status == "All" else status == "On Hold"
+        
+        # Only the requested page is copied out of the ledger
+        page_size = self.view_model.HISTORY_PAGE_SIZE
+        requested = st.session_state.get("history_page", 1)
+        page, total = self.view_model.history_page(transactions, requested - 1, page_size, viewer, creator, flagged)
+        pages = max(1, -(-total // page_size))
+        if requested > pages:
+            st.session_state.history_page = pages  # The filters left fewer pages
+        
+        st.dataframe(page, use_container_width=True)
+        col_page, col_count = st.columns([1, 2])
+        col_page.number_input("Page", min_value=1, max_value=pages, step=1, key="history_page")
+        col_count.caption(f"Page {min(requested, pages)} of {pages:,} · {total:,} matching transactions")
+    
+    def _render_quality_tab(self, creators, transactions):
+        """Content quality analysis and engagement metrics"""
+        quality_df = self.view_model.quality_rankings(creators, transactions)
+        
+        st.subheader("🎯 Creator Engagement Metrics")
+        
+        # NEW: Add Content Quality Analysis section
+        st.markdown("""
+        <div style="
+            background: linear-gradient(135deg, #FF0050, #00F2EA);
+            color: white;
+            padding: 15px;
+            border-radius: 15px;
+            margin-bottom: 20px;
+            text-align: center;
+            box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
+        ">
+            <h3 style="margin: 0;">🔍 Content Quality Analysis</h3>
+            <p style="margin: 5px 0 0 0; opacity: 0.9;">Advanced creator quality scoring system</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+         # NEW: Add transparency section showing how calculations work
+        with st.expander("🔍 How Quality Scores Are Calculated", expanded=False):
             st.markdown("""
             <div style="
                 background: linear-gradient(135deg, #FF0050, #00F2EA);
@@ -840,164 +366,254 @@ class DashboardManager:
                 text-align: center;
                 box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
             ">
-                <h3 style="margin: 0;">🎯 Performance Analytics</h3>
-                <p style="margin: 5px 0 0 0; opacity: 0.9;">Track creator engagement and fair reward distribution</p>
+                <h4 style="margin: 0;">📊 Quality Score Formula</h4>
+                <p style="margin: 5px 0 0 0; opacity: 0.9;">Transparent calculation breakdown</p>
             </div>
             """, unsafe_allow_html=True)
             
-            # Create two columns for side-by-side layout - ADJUST WIDTHS
-            col_table, col_chart = st.columns([1.2, 0.8])  # Table gets more space, chart gets less
+            # Quality Score Breakdown - FIXED LAYOUT
+            st.markdown("**🎯 Quality Factors & Weights:**")
+            st.markdown("""
+            - **Engagement Quality (40%)**: How well audience engages with content
+            - **Consistency Quality (25%)**: How consistent creator performance is
+            - **Growth Quality (20%)**: How much creator is improving over time
+            - **Content Quality (15%)**: Content type and duration bonuses
+            """)
+            
+            st.markdown("---")
             
-            with col_table:
-                # Display engagement metrics with TikTok styling
-                engagement_df = creators[["Creator", "Views", "Likes", "Shares", "Engagement Score", "Fair Reward %"]].copy()
-                engagement_df = engagement_df.sort_values("Engagement Score", ascending=False).reset_index(drop=True)
-                engagement_df.index = engagement_df.index + 1
-                engagement_df.index.name = "Rank"
+            # Engagement Quality Section
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                st.markdown("**📊 Engagement Quality (40%):**")
+                st.markdown("""
+                How well your audience engages with your content.
+                
+                **Formula:**
+                Engagement Rate = (Likes + Shares) / Views
+                Engagement Score = min(100, Engagement Rate × 1000)
                 
-                # Create a beautiful table with TikTok colors - FIXED WIDTHS
+                **Example:**
+                50,000 likes + 2,000 shares / 1,000,000 views = 0.052 = 52.0/100
+                """)
+            
+            with col2:
+                st.markdown("**📊 Consistency Quality (25%):**")
+                st.markdown("""
+                How consistent your transaction amounts are.
+                
+                **Formula:**
+                Coefficient of Variation = Standard Deviation / Mean
+                Consistency Score = max(0, 100 - (CV × 100))
+                
+                **Example:**
+                Lower variation = Higher consistency score
+                """)
+            
+            st.markdown("---")
+            
+            # Growth and Content Quality Section
+            col3, col4 = st.columns([1, 1])
+            with col3:
+                st.markdown("**📈 Growth Quality (20%):**")
+                st.markdown("""
+                How much you're improving over time.
+                
+                **Formula:**
+                Growth Rate = (Recent Avg - Older Avg) / Older Avg
+                Growth Score = 50 + (Growth Rate × 100)
+                
+                **Example:**
+                Positive growth = Higher score, capped at 100
+                """)
+            
+            with col4:
+                st.markdown("**🎬 Content Quality (15%):**")
+                st.markdown("""
+                Content type and duration bonuses.
+                
+                **Formula:**
+                Base Score + Future Enhancements
+                
+                **Future Features:**
+                Video duration, audience retention, content category
+                """)
+            
+            st.markdown("---")
+            
+            # Tier System Explanation
+            st.markdown("**🏆 Tier System & Reward Multipliers:**")
+            
+            tier_col1, tier_col2, tier_col3, tier_col4, tier_col5 = st.columns(5)
+            
+            with tier_col1:
                 st.markdown("""
                 <div style="
-                    background: white;
-                    border-radius: 15px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 20px rgba(255, 0, 80, 0.15);
-                    margin: 20px 0;
-                    width: 100%;
+                    background: linear-gradient(135deg, #B9F2FF, #87CEEB);  /* Diamond blue colors */
+                    color: #333;  /* Dark text for readability */
+                    padding: 10px;
+                    border-radius: 10px;
+                    text-align: center;
+                    margin: 5px 0;
+                    height: 80px;
+                    display: flex;
+                    flex-direction: column;
+                    justify-content: center;
+                    align-items: center;
+                    border: 2px solid #00BFFF;  /* Diamond border */
                 ">
-                    <table style="width: 100%; border-collapse: collapse; font-family: Arial, sans-serif; border-spacing: 0;">
-                        <thead>
-                            <tr style="background: linear-gradient(90deg, #FF0050, #00F2EA); color: white; margin: 0; padding: 0;">
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 80px;">Rank</th>
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 150px;">Creator</th>
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 120px;">Views</th>
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 100px;">Likes</th>
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 100px;">Shares</th>
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 140px;">Engagement Score</th>
-                                <th style="padding: 15px 10px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; width: 120px;">Fair Reward %</th>
-                            </tr>
-                        </thead>
-                        <tbody>
+                    <strong>Diamond</strong><br>
+                    90+ Score<br>
+                    <span style="font-size: 18px;">2.0x</span> Rewards
+                </div>
                 """, unsafe_allow_html=True)
-                
-                # Display top 10 creators with alternating row colors - FIXED WIDTHS
-                for idx, (_, creator) in enumerate(engagement_df.head(10).iterrows()):
-                    row_color = "#f8f9fa" if idx % 2 == 0 else "#ffffff"
-                    
-                    st.markdown(f"""
-                        <tr style="background: {row_color}; height: 50px;">
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; text-align: center; font-weight: 600; color: #FF0050; width: 80px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                #{idx+1}
-                            </td>
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; font-weight: 500; width: 150px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                {creator['Creator']}
-                            </td>
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; text-align: center; color: #666; width: 120px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                {creator['Views']:,}
-                            </td>
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; text-align: center; color: #666; width: 100px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                {creator['Likes']:,}
-                            </td>
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; text-align: center; color: #666; width: 100px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                {creator['Shares']:,}
-                            </td>
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; text-align: center; font-weight: 600; color: #00F2EA; width: 140px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                {creator['Engagement Score']:,}
-                            </td>
-                            <td style="padding: 15px 10px; border-bottom: 1px solid #e9ecef; text-align: center; width: 120px; vertical-align: middle; font-size: 13px; margin: 0; border-left: none; border-right: none;">
-                                <span style="
-                                    background: {'#FF0050' if idx < 3 else '#00F2EA' if idx < 6 else '#10B981'};
-                                    color: white;
-                                    padding: 4px 8px;
-                                    border-radius: 12px;
-                                    font-size: 11px;
-                                    font-weight: 600;
-                                    display: inline-block;
-                                    min-width: 55px;
-                                    text-align: center;
-                                ">
-                                    {creator['Fair Reward %']:.2f}%
-                                </span>
-                            </td>
-                        </tr>
-                    """, unsafe_allow_html=True)
-                
+            
+            with tier_col2:
                 st.markdown("""
-                        </tbody>
-                    </table>
+                <div style="
+                    background: linear-gradient(135deg, #FFA500, #FF6B35);
+                    color: white;
+                    padding: 10px;
+                    border-radius: 10px;
+                    text-align: center;
+                    margin: 5px 0;
+                    height: 80px;
+                    display: flex;
+                    flex-direction: column;
+                    justify-content: center;
+                    align-items: center;
+                ">
+                    <strong>Gold</strong><br>
+                    80+ Score<br>
+                    <span style="font-size: 18px;">1.5x</span> Rewards
                 </div>
                 """, unsafe_allow_html=True)
             
-            with col_chart:
-                # Beautiful Engagement Score Bar Chart - CLEAN VERSION
+            with tier_col3:
                 st.markdown("""
                 <div style="
-                    background: linear-gradient(135deg, #FF0050, #00F2EA);
+                    background: linear-gradient(135deg, #C0C0C0, #A0A0A0);
                     color: white;
-                    padding: 12px;
-                    border-radius: 15px;
-                    margin: 20px 0;
+                    padding: 10px;
+                    border-radius: 10px;
                     text-align: center;
-                    box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
+                    margin: 5px 0;
+                    height: 80px;
+                    display: flex;
+                    flex-direction: column;
+                    justify-content: center;
+                    align-items: center;
                 ">
-                    <h3 style="margin: 0; font-size: 16px;">📈 Engagement Score Bar Chart</h3>
-                    <p style="margin: 3px 0 0 0; opacity: 0.9; font-size: 12px;">Visual representation of creator performance</p>
+                    <strong>Silver</strong><br>
+                    70+ Score<br>
+                    <span style="font-size: 18px;">1.25x</span> Rewards
                 </div>
                 """, unsafe_allow_html=True)
-                
-                # Create a beautiful bar chart with TikTok colors - OPTIMIZED FOR COLUMN
-                top_10_creators = engagement_df.head(10)
-                
-                fig3 = px.bar(
-                    top_10_creators,
-                    x="Creator",
-                    y="Engagement Score",
-                    title="",
-                    color="Engagement Score",
-                    color_continuous_scale=["#FF0050", "#FF6B35", "#00F2EA", "#8B5CF6", "#10B981"],
-                    text="Engagement Score"
-                )
-                
-                fig3.update_traces(
-                    texttemplate="%{text:,}",
-                    textposition="outside",
-                    textfont_size=8,
-                    textfont_color="white",
-                    marker=dict(
-                        line=dict(color="white", width=1),
-                        cornerradius=6
-                    )
-                )
-                
-                fig3.update_layout(
-                    height=350,
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    margin=dict(t=0, b=60, l=30, r=20),
-                    xaxis=dict(
-                        title="",
-                        tickangle=-45,
-                        tickfont=dict(color="white", size=8),
-                        gridcolor="rgba(255,255,255,0.1)"
-                    ),
-                    yaxis=dict(
-                        title="",
-                        tickfont=dict(color="white", size=8),
-                        gridcolor="rgba(255,255,255,0.1)"
-                    ),
-                    coloraxis_colorbar=dict(
-                        title="",
-                        tickfont=dict(color="white", size=8),
-                        outlinecolor="white"
-                    )
-                )
-                
-                st.plotly_chart(fig3, use_container_width=True, key="engagement_chart")
+            
+            with tier_col4:
+                st.markdown("""
+                <div style="
+                    background: linear-gradient(135deg, #CD7F32, #B8860B);
+                    color: white;
+                    padding: 10px;
+                    border-radius: 10px;
+                    text-align: center;
+                    margin: 5px 0;
+                    height: 80px;
+                    display: flex;
+                    flex-direction: column;
+                    justify-content: center;
+                    align-items: center;
+                ">
+                    <strong>Bronze</strong><br>
+                    60+ Score<br>
+                    <span style="font-size: 18px;">1.1x</span> Rewards
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with tier_col5:
+                st.markdown("""
+                <div style="
+                    background: #f8f9fa;  /* Plain light gray background */
+                    color: #333;  /* Dark text */
+                    padding: 10px;
+                    border-radius: 10px;
+                    text-align: center;
+                    margin: 5px 0;
+                    height: 80px;
+                    display: flex;
+                    flex-direction: column;
+                    justify-content: center;
+                    align-items: center;
+                    border: 1px solid #dee2e6;  /* Subtle border */
+                ">
+                    <strong>Standard</strong><br>
+                    <60 Score<br>
+                    <span style="font-size: 18px;">1.0x</span> Rewards
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown("---")
+            
+            # Final transparency note
+            st.info("""
+            **💡 Transparency Note:** This system ensures that creators with higher quality content, 
+            consistent performance, and steady growth receive fair rewards. All calculations are 
+            automated and based on objective metrics, eliminating bias and ensuring fairness.
+            """)
+        
+        # Create quality score table with TikTok styling
+        st.markdown("**🏆 Content Quality Rankings**")
+        
+        # Display quality scores
+        st.markdown(quality_rankings_html(quality_df), unsafe_allow_html=True)
         
-        with tab3:
-            self.create_compliance_dashboard(transactions, creators)
-        with tab4:
-            self.create_system_health_dashboard(creators, transactions)
+        st.markdown("---")
+                   
+        # Create a beautiful TikTok-themed table header
+        st.markdown("""
+        <div style="
+            background: linear-gradient(135deg, #FF0050, #00F2EA);
+            color: white;
+            padding: 15px;
+            border-radius: 15px;
+            margin-bottom: 20px;
+            text-align: center;
+            box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
+        ">
+            <h3 style="margin: 0;">🎯 Performance Analytics</h3>
+            <p style="margin: 5px 0 0 0; opacity: 0.9;">Track creator engagement and fair reward distribution</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Create two columns for side-by-side layout - ADJUST WIDTHS
+        col_table, col_chart = st.columns([1.2, 0.8])  # Table gets more space, chart gets less
+        
+        with col_table:
+            # Display engagement metrics with TikTok styling
+            engagement_df = self.view_model.top_engagement(creators)
+            
+            # Create a beautiful table with TikTok colors - FIXED WIDTHS
+            st.markdown(engagement_table_html(engagement_df), unsafe_allow_html=True)
+        
+        with col_chart:
+            # Beautiful Engagement Score Bar Chart - CLEAN VERSION
+            st.markdown("""
+            <div style="
+                background: linear-gradient(135deg, #FF0050, #00F2EA);
+                color: white;
+                padding: 12px;
+                border-radius: 15px;
+                margin: 20px 0;
+                text-align: center;
+                box-shadow: 0 4px 20px rgba(255, 0, 80, 0.3);
+            ">
+                <h3 style="margin: 0; font-size: 16px;">📈 Engagement Score Bar Chart</h3>
+                <p style="margin: 3px 0 0 0; opacity: 0.9; font-size: 12px;">Visual representation of creator performance</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            st.plotly_chart(self.view_model.engagement_figure(creators), use_container_width=True, key="engagement_chart")
 
     def create_creator_analytics_dashboard(self, creators, transactions):
         """Create the Creator Analytics Dashboard for performance tracking and forecasting"""
@@ -1030,83 +646,10 @@ class DashboardManager:
 
         # Engagement Score Trends
         st.subheader("📈 Engagement Score Trends")
-        engagement_df = creators[["Creator", "Views", "Likes", "Shares", "Engagement Score", "Fair Reward %"]].copy()
-        engagement_df = engagement_df.sort_values("Engagement Score", ascending=False).reset_index(drop=True)
-        engagement_df.index = engagement_df.index + 1
-        engagement_df.index.name = "Rank"
+        engagement_df = self.view_model.top_engagement(creators)
 
         # Create a beautiful table with TikTok colors
-        st.markdown("""
-        <div style="
-            background: white;
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 4px 20px rgba(255, 0, 80, 0.15);
-            margin: 20px 0;
-            width: 100%;
-        ">
-            <table style="width: 100%; border-collapse: collapse; font-family: Arial, sans-serif;">
-                <thead>
-                    <tr style="background: linear-gradient(90deg, #FF0050, #00F2EA); color: white;">
-                        <th style="padding: 15px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 60px;">Rank</th>
-                        <th style="padding: 15px; text-align: left; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 120px;">Creator</th>
-                        <th style="padding: 15px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 100px;">Views</th>
-                        <th style="padding: 15px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 80px;">Likes</th>
-                        <th style="padding: 15px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 80px;">Shares</th>
-                        <th style="padding: 15px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 140px;">Engagement Score</th>
-                        <th style="padding: 15px; text-align: center; font-weight: 600; border-bottom: 1px solid #e9ecef; min-width: 120px;">Fair Reward %</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """, unsafe_allow_html=True)
-        
-        # Display top 10 creators with alternating row colors
-        for idx, (_, creator) in enumerate(engagement_df.head(10).iterrows()):
-            row_color = "#f8f9fa" if idx % 2 == 0 else "#ffffff"
-            border_color = "#FF0050" if idx % 2 == 0 else "#00F2EA"
-            
-            st.markdown(f"""
-                <tr style="background: {row_color};">
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; text-align: center; font-weight: 600; color: #FF0050; min-width: 60px;">
-                        #{idx+1}
-                    </td>
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; font-weight: 500; min-width: 120px;">
-                        {creator['Creator']}
-                    </td>
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; text-align: center; color: #666; min-width: 100px;">
-                        {creator['Views']:,}
-                    </td>
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; text-align: center; color: #666; min-width: 80px;">
-                        {creator['Likes']:,}
-                    </td>
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; text-align: center; color: #666; min-width: 80px;">
-                        {creator['Shares']:,}
-                    </td>
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; text-align: center; font-weight: 600; color: #00F2EA; min-width: 140px;">
-                        {creator['Engagement Score']:,}
-                    </td>
-                    <td style="padding: 12px 15px; border-bottom: 1px solid #e9ecef; text-align: center; min-width: 120px;">
-                        <span style="
-                            background: {'#FF0050' if idx < 3 else '#00F2EA' if idx < 6 else '#10B981'};
-                            color: white;
-                            padding: 4px 8px;
-                            border-radius: 12px;
-                            font-size: 12px;
-                            font-weight: 500;
-                            display: inline-block;
-                            min-width: 60px;
-                        ">
-                            {creator['Fair Reward %']:.2f}%
-                        </span>
-                    </td>
-                </tr>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("""
-                </tbody>
-            </table>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(engagement_table_html(engagement_df), unsafe_allow_html=True)
 
         # Engagement Score Bar Chart
         st.markdown("""
@@ -1124,54 +667,8 @@ class DashboardManager:
         </div>
         """, unsafe_allow_html=True)
         
-        # Create a beautiful bar chart with TikTok colors
-        top_10_creators = engagement_df.head(10)
-        
-        fig2 = px.bar(
-            top_10_creators,
-            x="Creator",
-            y="Engagement Score",
-            title="",
-            color="Engagement Score",
-            color_continuous_scale=["#FF0050", "#FF6B35", "#00F2EA", "#8B5CF6", "#10B981"],
-            text="Engagement Score"
-        )
-        
-        fig2.update_traces(
-            texttemplate="%{text:,}",
-            textposition="outside",
-            textfont_size=10,
-            textfont_color="white",
-            marker=dict(
-                line=dict(color="white", width=2),
-                cornerradius=8
-            )
-        )
-        
-        fig2.update_layout(
-            height=500,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(t=0, b=100, l=50, r=50),
-            xaxis=dict(
-                title="",
-                tickangle=-45,
-                tickfont=dict(color="white", size=12),
-                gridcolor="rgba(255,255,255,0.1)"
-            ),
-            yaxis=dict(
-                title="",
-                tickfont=dict(color="white", size=12),
-                gridcolor="rgba(255,255,255,0.1)"
-            ),
-            coloraxis_colorbar=dict(
-                title="",
-                tickfont=dict(color="white"),
-                outlinecolor="white"
-            )
-        )
-        
-        st.plotly_chart(fig2, use_container_width=True, key="analytics_chart")
+        # Create a beautiful bar chart with TikTok colors (memoized with the table above)
+        st.plotly_chart(self.view_model.engagement_figure(creators, large=True), use_container_width=True, key="analytics_chart")
 
         st.markdown("---")
 
@@ -1686,11 +1183,8 @@ class DashboardManager:
         if st.button("🔍 Analyze Creator", type="primary"):
             if creator_name:
                 # Get content quality analyzer (this has the TikTok features we want)
-                if 'content_quality_analyzer' not in st.session_state:
-                    st.session_state.content_quality_analyzer = ContentQualityAnalyzer()
-                
                 # Analyze creator with TikTok metrics using ContentQualityAnalyzer
-                analysis_result = st.session_state.content_quality_analyzer.calculate_content_quality_score(
+                analysis_result = self.view_model.quality_analyzer().calculate_content_quality_score(
                     creator_data={
                         'Views': views,
                         'Likes': likes,
@@ -1711,54 +1205,30 @@ class DashboardManager:
 
     def calculate_creator_points_from_transactions(self, transactions, creators):
         """Calculate total points for each creator from transaction history + CSV points"""
-        if transactions.empty:
-            return creators
-        
-        # Create a copy of creators to avoid modifying the original
-        updated_creators = creators.copy()
-        
-        # Group transactions by creator and sum points
-        creator_totals = transactions.groupby('creator')['points'].sum().reset_index()
-        
-        # Update creator points by ADDING transaction points to CSV points (not replacing)
-        for _, row in creator_totals.iterrows():
-            creator_name = row['creator']
-            transaction_points = row['points']
-            
-            # Find the creator in the creators DataFrame
-            if creator_name in updated_creators['Creator'].values:
-                # ADD transaction points to existing CSV points (not replace)
-                current_points = updated_creators.loc[updated_creators['Creator'] == creator_name, 'Points'].iloc[0]
-                updated_creators.loc[updated_creators['Creator'] == creator_name, 'Points'] = current_points + transaction_points
-        
-        return updated_creators
+        return self.view_model.calculate_creator_points(transactions, creators)
 
     def create_compliance_dashboard(self, transactions, creators):
         """Create the AML and compliance monitoring dashboard"""
+        data = self.view_model.compliance(transactions)
         st.subheader("🛡️ Compliance & AML Dashboard")
                 
         # Risk metrics overview - Use only columns that exist
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            # Check if risk_level exists, otherwise use flagged
-            if "risk_level" in transactions.columns:
-                high_risk_count = len(transactions[transactions["risk_level"] == "high"]) if not transactions.empty else 0
-            else:
-                high_risk_count = len(transactions[transactions["flagged"] == True]) if not transactions.empty else 0
+            high_risk_count = data["high_risk_count"]
             st.metric("🚨 High Risk", high_risk_count, delta=f"+{high_risk_count}" if high_risk_count > 0 else None)
         
         with col2:
-            suspicious_count = len(transactions[transactions["flagged"] == True]) if not transactions.empty else 0
+            suspicious_count = data["suspicious_count"]
             st.metric("⚠️ Flagged", suspicious_count, delta=f"+{suspicious_count}" if suspicious_count > 0 else None)
         
         with col3:
-            total_transactions = len(transactions) if not transactions.empty else 0
-            compliance_rate = ((total_transactions - suspicious_count) / total_transactions * 100) if total_transactions > 0 else 100
+            compliance_rate = data["compliance_rate"]
             st.metric("✅ Compliance", f"{compliance_rate:.1f}%", delta=f"{compliance_rate:.1f}%")
         
         with col4:
-            total_value = transactions["points"].sum() if not transactions.empty else 0
+            total_value = data["total_value"]
             st.metric("💰 Total Value", f"{total_value:,} pts", delta=f"+{total_value:,}")
         
         st.markdown("---")
@@ -1769,37 +1239,11 @@ class DashboardManager:
             
             with chart_col1:
                 st.subheader("📊 Transaction Risk Distribution")
-                risk_distribution = transactions["risk_level"].value_counts()
-                
-                # Create pie chart with TikTok colors
-                fig = px.pie(
-                    values=risk_distribution.values, 
-                    names=risk_distribution.index,
-                    color_discrete_sequence=['#00F2EA', '#FF6B35', '#FF0050'],  # TikTok colors
-                    title=""
-                )
-                
-                fig.update_traces(
-                    textposition='inside',
-                    textinfo='percent+label',
-                    textfont_size=14,
-                    textfont_color='white',
-                    marker=dict(line=dict(color='white', width=2))
-                )
-                
-                fig.update_layout(
-                    height=400,
-                    showlegend=True,
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    margin=dict(t=0, b=0, l=0, r=0)
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(data["risk_figure"], use_container_width=True)
             
             with chart_col2:  # FIXED: Use chart_col2
                 st.subheader("🔄 Risk Level Breakdown")
-                for risk_level, count in risk_distribution.items():
+                for risk_level, count in data["risk_distribution"].items():
                     if risk_level == "low":
                         st.success(f"🟢 **{risk_level.title()}**: {count} transactions")
                     elif risk_level == "medium":
@@ -1814,7 +1258,7 @@ class DashboardManager:
         # Recent flagged transactions
         if not transactions.empty:
             st.subheader("🚨 Recent Flagged Transactions")
-            flagged_transactions = transactions[transactions["flagged"] == True].head(10)
+            flagged_transactions = data["recent_flagged"]
             
             if not flagged_transactions.empty:
                 for _, tx in flagged_transactions.iterrows():
@@ -1841,9 +1285,7 @@ class DashboardManager:
         with col1:
             # Calculate overall compliance score
             if not transactions.empty:
-                total_tx = len(transactions)
-                clean_tx = len(transactions[transactions["flagged"] == False])
-                compliance_score = (clean_tx / total_tx) * 100
+                compliance_score = data["compliance_score"]
                 
                 st.metric("🛡️ Overall Compliance", f"{compliance_score:.1f}%")
                 
@@ -1870,17 +1312,17 @@ class DashboardManager:
         st.header("🏥 System Health & Performance Monitoring")
         st.markdown("Real-time monitoring of system health, fund safety, and performance metrics")
         
-        # Initialize System Monitor
-        if 'system_monitor' not in st.session_state:
-            st.session_state.system_monitor = SystemMonitor()
-        
-        monitor = st.session_state.system_monitor
+        # The session's System Monitor (alerts were collected when the rerun started)
+        monitor = self.view_model.system_monitor()
         
         # Refresh button positioned after monitor initialization
         col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 1])
         
         with col1:
-            st.write("")  # Empty space
+            # Fund flow window, summed from the ledger's time-bucketed rollups
+            window = st.selectbox("Fund flow window", list(monitor.FUND_FLOW_WINDOWS), index=1,
+                                  key="fund_flow_window")
+            window_hours = monitor.FUND_FLOW_WINDOWS[window]
         with col2:
             st.write("")  # Empty space
         with col3:
@@ -1893,12 +1335,14 @@ class DashboardManager:
                 # Refresh demo state for realistic growth
                 if hasattr(monitor, 'refresh_demo_state'):
                     monitor.refresh_demo_state()
+                # Regenerate the reports of every window on the rerun
+                self.view_model.invalidate(*(f"performance_report:{hours}" for hours in monitor.FUND_FLOW_WINDOWS.values()))
                 st.rerun()
         
         st.markdown("---")  # Add separator line
         
-        # Generate performance report
-        performance_report = monitor.generate_performance_report(transactions, creators)
+        # Generate performance report (kept until the data changes or Refresh is clicked)
+        performance_report = self.view_model.performance_report(monitor, creators, transactions, window_hours)
         
         # System Health Overview
         col1, col2, col3, col4 = st.columns(4)
@@ -1918,7 +1362,7 @@ class DashboardManager:
         with col2:
             fund_flow = performance_report['fund_flow']['total_flow']
             st.metric(
-                label="24h Fund Flow",
+                label=f"{window} Fund Flow",
                 value=f"{fund_flow:,} points",
                 delta="Active"
             )
@@ -1926,7 +1370,7 @@ class DashboardManager:
         with col3:
             transaction_count = performance_report['fund_flow']['transaction_count']
             st.metric(
-                label="24h Transactions",
+                label=f"{window} Transactions",
                 value=f"{transaction_count}",
                 delta="Processing"
             )
@@ -1980,11 +1424,34 @@ class DashboardManager:
             else:
                 st.success("✅ **Fund Flow Status:** Fund flow is normal")
             
+            # Latest per-viewer / per-creator amount alerts, newest first
+            alerts = performance_report['alerts']
+            if alerts:
+                st.markdown("**Transaction Alerts:**")
+                for alert in reversed(alerts):
+                    st.markdown(f"• {alert['timestamp']}: {alert['message']}")
+            
             # Fund flow details
-            st.markdown("**24-Hour Summary:**")
+            st.markdown(f"**{window} Summary:**")
             st.markdown(f"• **Total Flow**: {performance_report['fund_flow']['total_flow']:,} points")
             st.markdown(f"• **Transaction Count**: {performance_report['fund_flow']['transaction_count']}")
             st.markdown(f"• **Average Size**: {performance_report['fund_flow']['avg_transaction_size']:,.0f} points")
+            st.markdown(f"• **Largest Transaction**: {performance_report['fund_flow']['max_transaction']:,} points")
+            st.markdown(f"• **On Hold Flow**: {performance_report['fund_flow']['flagged_flow']:,} points")
+        
+        st.markdown("---")
+        
+        # Measured latencies behind the Performance factor
+        st.subheader("⏱️ Response Times")
+        latency = performance_report['latency']
+        if latency:
+            latency_df = pd.DataFrame.from_dict(latency, orient="index")
+            latency_df.columns = ["Calls", "Mean (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]
+            st.dataframe(latency_df, use_container_width=True)
+            st.caption(f"Performance is scored on the slowest p95 outside data loading, "
+                       f"against a {monitor.RESPONSE_TIME_THRESHOLD:g}s response time threshold")
+        else:
+            st.info("No operations measured yet")
         
         st.markdown("---")
         
@@ -0,0 +1,472 @@
+"""Panel data for DashboardManager
+
+DashboardViewModel computes what each dashboard panel shows (the leaderboard,
+the newest transactions, risk counts, engagement rankings and their charts)
+and memoizes every panel on the versions of the tables it reads. Renderers
+only lay out these results, so a rerun with unchanged data recomputes nothing.
+"""
+import time
+import numpy as np
+import pandas as pd
+import streamlit as st
+import latency_metrics
+from anomaly_detector import AnomalyDetector
+from creator_totals import CreatorPointTotals
+from fund_flow_rollups import FundFlowRollups
+from history_index import HistoryIndex
+from transaction_ledger import TransactionLedger, transaction_epochs
+
+# Ledger column -> header shown in the transaction history
+HISTORY_COLUMNS = {
+    "timestamp": "Time (SGT)",
+    "viewer": "Viewer",
+    "creator": "Creator",
+    "points": "Points",
+    "flagged": "Status",
+}
+
+ENGAGEMENT_COLUMNS = ["Creator", "Views", "Likes", "Shares", "Engagement Score", "Fair Reward %"]
+
+
+def newest_first(epochs, limit=None):
+    """Row positions ordered newest first, optionally only the first `limit`
+
+    Ties keep the later row first. With a limit the newest rows are selected
+    with a partition, so only they are sorted.
+    """
+    epochs = np.asarray(epochs)
+    if limit is not None and limit < len(epochs):
+        if limit <= 0:
+            return np.empty(0, dtype=np.intp)
+        threshold = np.partition(epochs, len(epochs) - limit)[len(epochs) - limit]
+        candidates = np.flatnonzero(epochs >= threshold)
+        return candidates[np.argsort(epochs[candidates], kind="stable")[::-1]][:limit]
+    return np.argsort(epochs, kind="stable")[::-1]
+
+
+class DashboardViewModel:
+    """Memoized per-panel data for one session's dashboard"""
+    
+    LEADERBOARD_SIZE = 15
+    RECENT_TRANSACTIONS = 20
+    HISTORY_PAGE_SIZE = 50
+    TOP_ENGAGEMENT = 10
+    TOP_QUALITY = 10
+    FLAGGED_SAMPLES = 10
+    MIN_SHARE_PERCENT = 1.0  # Creators below this share of points are grouped as "Others"
+    
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager
+        self._panels = {}  # panel name -> (table versions, key, data)
+    
+    def table_version(self, frame):
+        """(owner, version) pair that changes whenever `frame`'s contents may have
+        
+        The ledger's current view is versioned by ledger.version, the session's
+        creators and viewers tables by DatabaseManager.tables_version. Any other
+        frame is its own owner, so it is only equal to itself.
+        """
+        ledger = getattr(self.db_manager, "ledger", None)
+        if ledger is not None and frame is ledger.view():
+            return ledger, ledger.version
+        if self.db_manager is not None and (frame is self.db_manager.creators or frame is self.db_manager.viewers):
+            return self.db_manager, self.db_manager.tables_version
+        return frame, 0
+    
+    def _panel(self, name, tables, compute, key=None):
+        """compute() for a panel, cached until a table it reads changes version or `key` changes"""
+        versions = tuple(self.table_version(frame) for frame in tables)
+        entry = self._panels.get(name)
+        if entry is None or entry[1] != key or not self._same_versions(entry[0], versions):
+            entry = self._panels[name] = (versions, key, compute())
+        return entry[2]
+    
+    @staticmethod
+    def _same_versions(cached, current):
+        return len(cached) == len(current) and all(
+            owner is current_owner and version == current_version
+            for (owner, version), (current_owner, current_version) in zip(cached, current)
+        )
+    
+    def invalidate(self, *names):
+        """Drop cached panels (all of them if none are named)"""
+        if not names:
+            self._panels.clear()
+        for name in names:
+            self._panels.pop(name, None)
+    
+    # Reward tab
+    
+    def creator_points(self, creators, transactions):
+        """Creators table with the points received in transactions added"""
+        return self._panel(
+            "creator_points", (creators, transactions),
+            lambda: self.calculate_creator_points(transactions, creators)
+        )
+    
+    def leaderboard(self, creators, transactions):
+        """Top creators by total points, one row per creator name"""
+        def compute():
+            # Group by Creator name and sum their points to avoid duplicates
+            creators_grouped = self.creator_points(creators, transactions).groupby('Creator').agg({
+                'Points': 'sum',
+                'Engagement Score': 'mean',  # Average engagement score for display
+                'Views': 'sum',
+                'Likes': 'sum',
+                'Shares': 'sum'
+            }).reset_index()
+            # Partial selection, no full sort
+            return creators_grouped.nlargest(self.LEADERBOARD_SIZE, "Points")
+        return self._panel("leaderboard", (creators, transactions), compute)
+    
+    def points_share(self, creators, transactions):
+        """Creators with at least MIN_SHARE_PERCENT of the points (plus "Others") and their pie chart"""
+        return self._panel("points_share", (creators, transactions), lambda: self._points_share(creators, transactions))
+    
+    def _points_share(self, creators, transactions):
+        updated_creators = self.creator_points(creators, transactions)
+        
+        # Filter out creators with very small percentages to reduce clutter
+        total_points = updated_creators['Points'].sum()
+        minimum = total_points * self.MIN_SHARE_PERCENT / 100
+        filtered_creators = updated_creators[updated_creators['Points'] >= minimum]
+
+        # Create "Others" category for small creators
+        if len(filtered_creators) < len(updated_creators):
+            others_points = updated_creators[updated_creators['Points'] < minimum]['Points'].sum()
+            if others_points > 0:
+                others_row = pd.DataFrame([{
+                    'Creator': 'Others',
+                    'Points': others_points
+                }])
+                filtered_creators = pd.concat([filtered_creators, others_row], ignore_index=True)
+
+        # Pure TikTok brand colors only
+        tiktok_colors = [
+            '#FF0050',  # TikTok Pink/Reds
+            '#00F2EA',  # TikTok Cyan/Blue
+            '#FF0050',  # Repeat main colors
+            '#00F2EA',  # for more slices
+            '#FF0050',
+            '#00F2EA',
+            '#FF0050',
+            '#00F2EA'
+        ]
+
+        # Create smaller pie chart
+        import plotly.express as px
+        fig = px.pie(
+            filtered_creators,
+            values="Points",
+            names="Creator",
+            hole=0.4,
+            title="",
+            color_discrete_sequence=tiktok_colors
+        )
+
+        fig.update_traces(
+            textposition='inside',
+            textinfo='percent+label',
+            textfont_size=10,  # Smaller text
+            textfont_color='white',
+            marker=dict(line=dict(color='white', width=1))
+        )
+
+        fig.update_layout(
+            height=300,  # Smaller height
+            showlegend=False,  # Hide legend
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            margin=dict(t=0, b=0, l=0, r=0)
+        )
+        
+        return {"creators": filtered_creators, "total_points": total_points, "figure": fig}
+    
+    def recent_transactions(self, transactions):
+        """The newest RECENT_TRANSACTIONS transactions with display headers, numbered from 1"""
+        return self._panel(
+            "recent_transactions", (transactions,),
+            lambda: self.history_page(transactions, 0, self.RECENT_TRANSACTIONS)[0]
+        )
+    
+    def history_page(self, transactions, number, size=None, viewer=None, creator=None, flagged=None):
+        """Page `number` (from 0) of the newest-first history and the number of matching rows
+        
+        Filters left as None match everything; a page past the end is clamped
+        to the last one. For the session ledger's view the page is sliced from
+        its HistoryIndex, so only the page's rows are ever copied; other frames
+        are filtered and sorted in full.
+        """
+        size = size or self.HISTORY_PAGE_SIZE
+        ledger = self._ledger_for(transactions)
+        if ledger is not None:
+            index = ledger.ensure_index(HistoryIndex.NAME, HistoryIndex)
+            total = index.count(viewer, creator, flagged)
+            number = max(0, min(number, (total - 1) // size))
+            rows = ledger.take(index.page(number, size, viewer, creator, flagged))
+        else:
+            matches = np.ones(len(transactions), dtype=bool)
+            for column, value in (("viewer", viewer), ("creator", creator), ("flagged", flagged)):
+                if value is not None:
+                    matches &= transactions[column].to_numpy() == value
+            positions = np.flatnonzero(matches)
+            total = len(positions)
+            number = max(0, min(number, (total - 1) // size))
+            positions = positions[newest_first(transaction_epochs(transactions)[positions], (number + 1) * size)]
+            rows = transactions.iloc[positions[number * size:]]
+        page = rows[list(HISTORY_COLUMNS)].rename(columns=HISTORY_COLUMNS)
+        page.index = pd.RangeIndex(number * size + 1, number * size + len(page) + 1)
+        return page, total
+    
+    def transaction_counts(self, transactions):
+        """Total, clean and flagged transaction counts"""
+        def compute():
+            flagged_count = int(transactions["flagged"].sum())
+            return {"total": len(transactions), "clean": len(transactions) - flagged_count, "flagged": flagged_count}
+        return self._panel("transaction_counts", (transactions,), compute)
+    
+    # Quality tab
+    
+    def quality_rankings(self, creators, transactions):
+        """Quality scores of the first TOP_QUALITY creators, with display headers"""
+        def compute():
+            # Calculate quality scores for top creators in one batch
+            quality_scores = self._top_quality_scores(creators.head(self.TOP_QUALITY), transactions)
+            return quality_scores[[
+                'Creator', 'total_quality_score', 'quality_tier', 'quality_multiplier',
+                'engagement_quality', 'consistency_quality', 'growth_quality'
+            ]].rename(columns={
+                'total_quality_score': 'Quality Score',
+                'quality_tier': 'Tier',
+                'quality_multiplier': 'Multiplier',
+                'engagement_quality': 'Engagement',
+                'consistency_quality': 'Consistency',
+                'growth_quality': 'Growth'
+            })
+        return self._panel("quality_rankings", (creators, transactions), compute)
+    
+    def top_engagement(self, creators):
+        """The TOP_ENGAGEMENT creators by engagement score, ranked from 1"""
+        def compute():
+            top = creators.nlargest(self.TOP_ENGAGEMENT, "Engagement Score")[ENGAGEMENT_COLUMNS]
+            top.index = pd.RangeIndex(1, len(top) + 1, name="Rank")
+            return top
+        return self._panel("top_engagement", (creators,), compute)
+    
+    # Sizes of the compact (overview) and large (creator analytics) engagement charts
+    ENGAGEMENT_FIGURE_SIZES = {
+        False: dict(height=350, margin=dict(t=0, b=60, l=30, r=20), font=8, text=8, line=1, corner=6),
+        True: dict(height=500, margin=dict(t=0, b=100, l=50, r=50), font=12, text=10, line=2, corner=8),
+    }
+    
+    def engagement_figure(self, creators, large=False):
+        """Bar chart of the top creators' engagement scores, compact or large"""
+        size = self.ENGAGEMENT_FIGURE_SIZES[large]
+        
+        def compute():
+            top_10_creators = self.top_engagement(creators)
+
+            import plotly.express as px
+            fig3 = px.bar(
+                top_10_creators,
+                x="Creator",
+                y="Engagement Score",
+                title="",
+                color="Engagement Score",
+                color_continuous_scale=["#FF0050", "#FF6B35", "#00F2EA", "#8B5CF6", "#10B981"],
+                text="Engagement Score"
+            )
+
+            fig3.update_traces(
+                texttemplate="%{text:,}",
+                textposition="outside",
+                textfont_size=size["text"],
+                textfont_color="white",
+                marker=dict(
+                    line=dict(color="white", width=size["line"]),
+                    cornerradius=size["corner"]
+                )
+            )
+
+            fig3.update_layout(
+                height=size["height"],
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                margin=size["margin"],
+                xaxis=dict(
+                    title="",
+                    tickangle=-45,
+                    tickfont=dict(color="white", size=size["font"]),
+                    gridcolor="rgba(255,255,255,0.1)"
+                ),
+                yaxis=dict(
+                    title="",
+                    tickfont=dict(color="white", size=size["font"]),
+                    gridcolor="rgba(255,255,255,0.1)"
+                ),
+                coloraxis_colorbar=dict(
+                    title="",
+                    tickfont=dict(color="white", size=size["font"]),
+                    outlinecolor="white"
+                )
+            )
+            return fig3
+        return self._panel("engagement_figure:large" if large else "engagement_figure", (creators,), compute)
+    
+    # Compliance tab
+    
+    def compliance(self, transactions):
+        """Risk counts, distribution chart and flagged samples"""
+        return self._panel("compliance", (transactions,), lambda: self._compliance(transactions))
+    
+    def _compliance(self, transactions):
+        if transactions.empty:
+            return {
+                "high_risk_count": 0, "suspicious_count": 0, "compliance_rate": 100, "total_value": 0,
+                "risk_distribution": None, "risk_figure": None, "recent_flagged": None, "compliance_score": None,
+            }
+        
+        flagged = transactions["flagged"].to_numpy(dtype=bool)
+        suspicious_count = int(flagged.sum())
+        # Check if risk_level exists, otherwise use flagged
+        if "risk_level" in transactions.columns:
+            high_risk_count = int((transactions["risk_level"] == "high").sum())
+        else:
+            high_risk_count = suspicious_count
+        total_transactions = len(transactions)
+        
+        risk_distribution = fig = None
+        if "risk_level" in transactions.columns:
+            risk_distribution = transactions["risk_level"].value_counts()
+
+            # Create pie chart with TikTok colors
+            import plotly.express as px
+            fig = px.pie(
+                values=risk_distribution.values, 
+                names=risk_distribution.index,
+                color_discrete_sequence=['#00F2EA', '#FF6B35', '#FF0050'],  # TikTok colors
+                title=""
+            )
+
+            fig.update_traces(
+                textposition='inside',
+                textinfo='percent+label',
+                textfont_size=14,
+                textfont_color='white',
+                marker=dict(line=dict(color='white', width=2))
+            )
+
+            fig.update_layout(
+                height=400,
+                showlegend=True,
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                margin=dict(t=0, b=0, l=0, r=0)
+            )
+        
+        return {
+            "high_risk_count": high_risk_count,
+            "suspicious_count": suspicious_count,
+            "compliance_rate": (total_transactions - suspicious_count) / total_transactions * 100,
+            "total_value": transactions["points"].sum(),
+            "risk_distribution": risk_distribution,
+            "risk_figure": fig,
+            "recent_flagged": transactions.iloc[np.flatnonzero(flagged)[:self.FLAGGED_SAMPLES]],
+            "compliance_score": (total_transactions - suspicious_count) / total_transactions * 100,
+        }
+    
+    # System health tab
+    
+    def performance_report(self, monitor, creators, transactions, time_window_hours=24):
+        """SystemMonitor report over a fund flow window, kept until the data changes or the panel is invalidated
+        
+        Each window is its own panel, named "performance_report:<hours>". On the
+        session ledger the fund flow is read from its time-bucketed rollups. The
+        window slides with the clock, so the panel is also recomputed every
+        minute; the alerts (collected by collect_alerts on every rerun) and the
+        latency summaries are read fresh on every call.
+        """
+        ledger = self._ledger_for(transactions)
+        rollups = ledger.ensure_index(FundFlowRollups.NAME, FundFlowRollups) if ledger is not None else None
+        report = self._panel(
+            f"performance_report:{time_window_hours}", (creators, transactions),
+            lambda: monitor.generate_performance_report(transactions, creators, time_window_hours, rollups),
+            key=int(time.time()) // 60
+        )
+        return dict(report, alerts=monitor.alert_history[-monitor.RECENT_ALERTS:], latency=latency_metrics.summaries())
+    
+    def system_monitor(self):
+        """The session's SystemMonitor, created (and imported) on first use"""
+        if 'system_monitor' not in st.session_state:
+            from system_monitor import SystemMonitor
+            st.session_state.system_monitor = SystemMonitor()
+        return st.session_state.system_monitor
+    
+    def collect_alerts(self):
+        """Move the alerts the session ledger's anomaly detector raised into the SystemMonitor
+        
+        Called on every rerun, whichever tab is open, so alerts reach the
+        history before the detector's pending queue overflows.
+        """
+        ledger = getattr(self.db_manager, 'ledger', None)
+        if ledger is None:
+            return []
+        return self.system_monitor().collect_alerts(ledger.ensure_index(AnomalyDetector.NAME, AnomalyDetector))
+    
+    # Shared computations
+    
+    def calculate_creator_points(self, transactions, creators):
+        """Calculate total points for each creator from transaction history + CSV points
+        
+        `transactions` may be a TransactionLedger or the ledger's current view, in
+        which case the running per-creator totals are read instead of regrouping
+        the history.
+        """
+        if len(transactions) == 0:
+            return creators
+        
+        ledger = transactions if isinstance(transactions, TransactionLedger) else self._ledger_for(transactions)
+        if ledger is not None:
+            creator_totals = ledger.ensure_index(CreatorPointTotals.NAME, CreatorPointTotals).totals()
+        else:
+            creator_totals = transactions.groupby('creator')['points'].sum()
+        
+        # ADD transaction points to existing CSV points (not replace) in one vectorized map.
+        # Rows sharing a creator name all take the first row's CSV points, as before.
+        updated_creators = creators.copy()
+        names = updated_creators['Creator']
+        has_transactions = names.isin(creator_totals.index)
+        first_points = names.map(updated_creators.drop_duplicates('Creator').set_index('Creator')['Points'])
+        updated_creators['Points'] = np.where(
+            has_transactions,
+            first_points + names.map(creator_totals).fillna(0),
+            updated_creators['Points']
+        ).astype(creators['Points'].dtype)
+        
+        return updated_creators
+    
+    def _top_quality_scores(self, top_creators, transactions):
+        """score_all for the leaderboard, reusing the warm-up's scores while nothing changed"""
+        precomputed = self.db_manager.shared_derived("top_quality_scores") if self.db_manager is not None else None
+        if precomputed is not None:
+            shared_top, shared_scores = precomputed
+            ledger = self._ledger_for(transactions)
+            # Only while the session ledger is an unwritten fork of the shared one
+            if (ledger is not None and ledger.forked_from is self.db_manager.shared.ledger
+                    and top_creators.equals(shared_top)):
+                return shared_scores
+        return self.quality_analyzer().score_all(top_creators, transactions)
+    
+    def quality_analyzer(self):
+        """The session's ContentQualityAnalyzer, created (and imported) on first use"""
+        if 'content_quality_analyzer' not in st.session_state:
+            from content_quality_analyzer import ContentQualityAnalyzer
+            st.session_state.content_quality_analyzer = ContentQualityAnalyzer()
+        return st.session_state.content_quality_analyzer
+    
+    def _ledger_for(self, transactions):
+        """Return the session ledger if `transactions` is its current view"""
+        ledger = getattr(self.db_manager, 'ledger', None)
+        if ledger is not None and ledger.view() is transactions:
+            return ledger
+        return None
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from creator_analyzer import engagement_score
 
 class DataManager:
     """Manages data initialization and calculations for the FairShare app"""
@@ -21,12 +22,14 @@ class DataManager:
     
     def _calculate_engagement_scores(self, creators):
         """Calculate engagement scores and fair reward percentages"""
-        def engagement_score(row):
-            return 0.3 * row["Views"] + row["Likes"] + 2 * row["Shares"]
-        
-        creators["Engagement Score"] = creators.apply(engagement_score, axis=1)
-        total_engagement = creators["Engagement Score"].sum()
-        creators["Fair Reward %"] = (creators["Engagement Score"] / total_engagement) * 100
+        # Columnar NumPy expressions instead of a row-wise apply
+        scores = engagement_score(
+            creators["Views"].to_numpy(),
+            creators["Likes"].to_numpy(),
+            creators["Shares"].to_numpy()
+        )
+        creators["Engagement Score"] = scores
+        creators["Fair Reward %"] = (scores / scores.sum()) * 100
         
         return creators
     
@@ -1,22 +1,127 @@
 import pandas as pd
 import os
 import streamlit as st
-import random
+import numpy as np
+from transaction_ledger import SGT_OFFSET_SECONDS, TransactionLedger, format_timestamps
+from latency_metrics import timed
+from name_index import NameIndex
+from shared_data import get_shared_data
+from storage_backend import get_backend
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, shared=True, backend=None):
+        """Load the databases, by default from the process-wide shared cache
+
+        With shared=True the CSVs and historical transactions are loaded once
+        per file version and reused by every session; this manager keeps
+        session-local copies on top. shared=False loads a private copy.
+
+        backend is the StorageBackend tables and transactions are persisted
+        to; by default the one selected by $FAIRSHARE_STORAGE (CSV files).
+        An explicit backend always loads a private copy.
+        """
         self.creators = None
         self.viewers = None
-        self.transactions = None
-        self.load_databases()
-        if self.transactions.empty:
-            self.load_historical_transactions()
+        self.ledger = None
+        self.shared = None  # SharedData this session's tables were copied from
+        self.tables_version = 0  # Bumped whenever the creators and viewers tables are replaced or edited in place
+        self._name_indexes = {}  # table attribute -> NameIndex over that table
+        self.backend = backend if backend is not None else get_backend()
+        if shared and backend is None:
+            self.attach_shared(get_shared_data())
+        else:
+            self.load_databases()
+            if self.ledger.empty:
+                self.load_historical_transactions()
+            self.load_persisted_transactions()
+    
+    @classmethod
+    def from_tables(cls, creators, viewers, ledger, backend=None):
+        """Wrap in-memory tables and a ledger without loading anything (tests, benchmarks)"""
+        db_manager = cls.__new__(cls)
+        db_manager.creators = creators
+        db_manager.viewers = viewers
+        db_manager.ledger = ledger
+        db_manager.shared = None
+        db_manager.tables_version = 0
+        db_manager._name_indexes = {}
+        if backend is None:
+            from csv_backend import CSVBackend
+            backend = CSVBackend()  # Nothing is written: CSV appends are no-ops
+        db_manager.backend = backend
+        return db_manager
+
+    @timed("data.attach_shared")
+    def attach_shared(self, shared_data, keep_transactions=False):
+        """Use shared tables with a session-local overlay for writes"""
+        # Shallow copies: column assignments stay local to this session
+        self.creators = shared_data.creators.copy(deep=False)
+        self.viewers = shared_data.viewers.copy(deep=False)
+        self.shared = shared_data
+        self.tables_version += 1
+        # Indexes the startup warm-up built over the shared tables hold for the copies
+        for table in ("viewers", "creators"):
+            index = shared_data.derived.get(f"{table}_names")
+            if index is not None:
+                self._name_indexes[table] = index.rebind(getattr(self, table))
+        if not keep_transactions or self.ledger is None:
+            # Copy-on-write fork: shares the history until this session first writes
+            self.ledger = shared_data.ledger.fork()
+    
+    @property
+    def transactions(self):
+        """DataFrame view over the transaction ledger (read-only)"""
+        return self.ledger.view()
+    
+    def shared_derived(self, name):
+        """Derived data the warm-up built over the shared tables, or None"""
+        return self.shared.derived.get(name) if self.shared is not None else None
+    
+    def _name_index(self, table, column):
+        """Name index over self.<table>, rebuilt only when that table is replaced"""
+        frame = getattr(self, table)
+        index = self._name_indexes.get(table)
+        if index is None or not index.matches(frame):
+            index = self._name_indexes[table] = NameIndex(frame, column)
+        return index
+    
+    @property
+    def viewer_index(self):
+        """NameIndex over the viewers table"""
+        return self._name_index("viewers", "Viewer")
     
+    @property
+    def creator_index(self):
+        """NameIndex over the creators table"""
+        return self._name_index("creators", "Creator")
+    
+    def lookup_viewer(self, name):
+        """Viewer row as a dict, or None if unknown
+        
+        Names in the loaded table are answered by the name index (O(1)); others
+        go to the backend's indexed lookup, which finds rows saved since.
+        """
+        record = self.viewer_index.record(name)
+        return record if record is not None else self.backend.lookup_viewer(name)
+    
+    def lookup_creator(self, name):
+        """Creator row as a dict, or None if unknown (see lookup_viewer)"""
+        record = self.creator_index.record(name)
+        return record if record is not None else self.backend.lookup_creator(name)
+    
+    def record_transaction(self, transaction):
+        """Append a transaction to the ledger and persist it through the backend"""
+        self.ledger.append(transaction)
+        self.backend.append_transaction(transaction)
+    
+    @timed("data.load_databases")
     def load_databases(self):
-        """Load all databases from CSV files"""
+        """Load all databases from the storage backend (CSV files by default)"""
+        creators, viewers = self.backend.load_tables()
+        
         # Load creators
-        if os.path.exists("tiktok_creators.csv"):
-            self.creators = pd.read_csv("tiktok_creators.csv")
+        if creators is not None:
+            self.creators = creators
         else:
             st.error("❌ tiktok_creators.csv not found!")
             self.creators = pd.DataFrame([
@@ -24,183 +129,156 @@ class DatabaseManager:
             ])
         
         # Load viewers
-        if os.path.exists("tiktok_viewers.csv"):
-            self.viewers = pd.read_csv("tiktok_viewers.csv")
+        if viewers is not None:
+            self.viewers = viewers
         else:
             st.error("❌ tiktok_viewers.csv not found!")
             self.viewers = pd.DataFrame([
                 {"Viewer": "viewer_1", "Account_Type": "new", "Total_Gifts": 0, "Last_Gift_Time": "", "Trust_Level": "new"}
             ])
         
+        self.tables_version += 1
+        
         # Initialize transactions
-        self.transactions = pd.DataFrame(
-            columns=["timestamp", "viewer", "creator", "points", "flagged", "reason"]
-        )
+        self.ledger = TransactionLedger()
     
     def save_all_data(self):
-        """Save all data to CSV files"""
-        self.creators.to_csv("tiktok_creators.csv", index=False)
-        self.viewers.to_csv("tiktok_viewers.csv", index=False)
+        """Save all data through the storage backend"""
+        self.backend.save_tables(self.creators, self.viewers)
         return True
     
+    @timed("data.load_persisted_transactions")
+    def load_persisted_transactions(self):
+        """Add transactions persisted by earlier runs to the ledger"""
+        persisted = self.backend.load_transactions()
+        if not persisted.empty:
+            self.ledger.extend(persisted)
+    
     def reload_databases(self):
-        """Reload data from CSV files"""
+        """Reload data from CSV files (via the shared cache, which re-reads changed files)"""
         if os.path.exists("tiktok_creators.csv") and os.path.exists("tiktok_viewers.csv"):
-            self.creators = pd.read_csv("tiktok_creators.csv")
-            self.viewers = pd.read_csv("tiktok_viewers.csv")
+            self.attach_shared(get_shared_data(), keep_transactions=True)
             return True
         return False
 
-    def load_historical_transactions(self):
-        """Load historical transactions from viewers CSV data with realistic distribution"""
-        all_viewer_transactions = []  # Store transactions by viewer first
-        
-        for _, viewer in self.viewers.iterrows():
-            if viewer['Total_Gifts'] > 0 and pd.notna(viewer['Last_Gift_Time']):
-                total_gifts = viewer['Total_Gifts']
-                viewer_transactions = []  # Store this viewer's transactions
-                
-                # Split large gifts into realistic smaller transactions
-                if total_gifts > 1000:
-                    # For large gifts, create multiple transactions with more variety
-                    num_transactions = min(15, max(5, total_gifts // 300))  # 5-15 transactions
-                    
-                    # Create more realistic, varied transaction amounts
-                    base_amount = total_gifts // num_transactions
-                    remaining = total_gifts
-                    
-                    for i in range(num_transactions):
-                        if i == num_transactions - 1:
-                            # Last transaction gets remaining amount
-                            points = remaining
-                        else:
-                            # Random variation: ±30% of base amount
-                            variation = random.uniform(0.7, 1.3)
-                            points = int(base_amount * variation)
-                            # Ensure we don't exceed remaining amount
-                            points = min(points, remaining - (num_transactions - i - 1) * 100)
-                            points = max(points, 100)  # Minimum 100 points
-                        
-                        remaining -= points
-                        
-                        # Randomly select a creator (excluding the viewer if they're a creator)
-                        available_creators = [c for c in self.creators['Creator'].tolist() if c != viewer['Viewer']]
-                        if available_creators:
-                            creator = random.choice(available_creators)
-                            
-                            # More varied timestamps - spread over several days
-                            base_time = pd.to_datetime(viewer['Last_Gift_Time'])
-                            days_offset = random.randint(-7, 0)  # Spread over a week
-                            hours_offset = random.randint(0, 23)
-                            minutes_offset = random.randint(0, 59)
-                            
-                            time_offset = pd.Timedelta(days=days_offset, hours=hours_offset, minutes=minutes_offset)
-                            transaction_time = base_time + time_offset
-                            
-                            viewer_transactions.append({
-                                'timestamp': transaction_time.strftime("%Y-%m-%d %H:%M"),
-                                'viewer': viewer['Viewer'],
-                                'creator': creator,
-                                'points': points,
-                                'flagged': False,
-                                'reason': 'Historical data from CSV'
-                            })
-                else:
-                    # For small gifts, create single transaction
-                    available_creators = [c for c in self.creators['Creator'].tolist() if c != viewer['Viewer']]
-                    if available_creators:
-                        creator = random.choice(available_creators)
-                        viewer_transactions.append({
-                            'timestamp': viewer['Last_Gift_Time'],
-                            'viewer': viewer['Viewer'],
-                            'creator': creator,
-                            'points': total_gifts,
-                            'flagged': False,
-                            'reason': 'Historical data from CSV'
-                        })
-                
-                # Add this viewer's transactions to the main list
-                if viewer_transactions:
-                    all_viewer_transactions.append(viewer_transactions)
-        
-        if all_viewer_transactions:
-            # Interleave transactions from different viewers for better distribution
-            historical_transactions = []
-            max_transactions = max(len(viewer_txs) for viewer_txs in all_viewer_transactions)
-            
-            for i in range(max_transactions):
-                for viewer_txs in all_viewer_transactions:
-                    if i < len(viewer_txs):
-                        # MODIFY: Update historical transaction dates to be more recent
-                        transaction = viewer_txs[i].copy()
-                        
-                        # Convert old timestamp to recent date (within last 2 months)
-                        old_timestamp = pd.to_datetime(transaction['timestamp'])
-                        days_offset = random.randint(1, 60)  # 1-60 days ago
-                        hours_offset = random.randint(0, 23)
-                        minutes_offset = random.randint(0, 59)
-                        
-                        new_timestamp = pd.Timestamp.now() - pd.Timedelta(days=days_offset, hours=hours_offset, minutes=minutes_offset)
-                        transaction['timestamp'] = new_timestamp.strftime("%Y-%m-%d %H:%M")
-                        
-                        historical_transactions.append(transaction)
-            
-            # Shuffle the final result for extra randomness
-            random.shuffle(historical_transactions)
-            
-            # Simple and clean: Just add historical transactions
-            self.transactions = pd.concat([self.transactions, pd.DataFrame(historical_transactions)], ignore_index=True)
-            
-            # Generate realistic number of flagged transactions for 900+ total transactions
-            num_flagged = random.randint(5, 20)  # 5-20 flagged transactions (more realistic)
-            flagged_transactions = []
-            
-            for i in range(num_flagged):
-                # Randomly select viewer and creator
-                random_viewer = random.choice(self.viewers['Viewer'].tolist())
-                random_creator = random.choice(self.creators['Creator'].tolist())
-                
-                # Random points
-                points = random.choice([1800, 2200, 2500, 2800, 3200, 3800, 4500, 5000])
-                
-                # Simple risk level
-                risk_level = random.choice(['low', 'medium', 'high'])
-                
-                # Simple reason
-                reason = random.choice([
-                    "Above threshold",
-                    "Suspicious pattern",
-                    "Multiple transactions"
-                ])
-                
-                # KEY: Ensure at least 1 flagged transaction appears in top 3
-                if i == 0:  # First flagged transaction gets extremely recent timestamp (top 3)
-                    days_ago = 0  # Today
-                    hours_ago = random.randint(0, 12)  # Within last 12 hours
-                    minutes_ago = random.randint(0, 59)
-                elif i == 1:  # Second flagged transaction gets very recent timestamp (top 20)
-                    days_ago = random.randint(1, 3)  # Very recent (1-3 days ago)
-                else:  # Remaining flagged transactions get older timestamps (scattered)
-                    days_ago = random.randint(10, 60)  # Older (10-60 days ago)
-                
-                hours_ago = random.randint(0, 23)
-                minutes_ago = random.randint(0, 59)
-                
-                timestamp = (pd.Timestamp.now() - pd.Timedelta(days=days_ago, hours=hours_ago, minutes=minutes_ago)).strftime("%Y-%m-%d %H:%M")
-                
-                flagged_transactions.append({
-                    "timestamp": timestamp,
-                    "viewer": random_viewer,
-                    "creator": random_creator,
-                    "points": points,
-                    "flagged": True,
-                    "reason": reason,
-                    "risk_level": risk_level
-                })
-            
-            # Simply add flagged transactions to the end (they'll be sorted by timestamp naturally)
-            flagged_df = pd.DataFrame(flagged_transactions)
-            self.transactions = pd.concat([self.transactions, flagged_df], ignore_index=True)
-            
-            return True
-        return False
\ No newline at end of file
+    # Flagged samples injected into the history
+    FLAGGED_POINTS = (1800, 2200, 2500, 2800, 3200, 3800, 4500, 5000)
+    FLAGGED_RISK_LEVELS = ("low", "medium", "high")
+    FLAGGED_REASONS = ("Above threshold", "Suspicious pattern", "Multiple transactions")
+    
+    @timed("data.load_historical_transactions")
+    def load_historical_transactions(self, seed=None, now=None):
+        """Load historical transactions from viewers CSV data with realistic distribution
+        
+        Generated with a NumPy Generator in batched array operations; pass a
+        seed (and a fixed `now`) for a reproducible history.
+        """
+        rng = np.random.default_rng(seed)
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        # Wall-clock minute of `now`, as SGT-interpreted epoch seconds like the timestamp strings
+        now_epoch = int(now.floor("min").to_datetime64().astype("datetime64[s]").astype(np.int64)) - SGT_OFFSET_SECONDS
+        
+        # Viewers with gifting history
+        gifts = self.viewers["Total_Gifts"].to_numpy()
+        has_history = (gifts > 0) & self.viewers["Last_Gift_Time"].notna().to_numpy()
+        donors = self.viewers["Viewer"].to_numpy(dtype=object)[has_history]
+        totals = gifts[has_history].astype(np.int64)
+        if len(donors) == 0 or self.creators.empty:
+            return False
+        
+        # Split large gifts into 5-15 smaller transactions, small gifts stay whole
+        counts = np.where(totals > 1000, np.clip(totals // 300, 5, 15), 1)
+        viewers = np.repeat(donors, counts)
+        points = self._split_gifts(rng, totals, counts)
+        
+        # Random creator per transaction, never the viewer themselves
+        creator_names = self.creators["Creator"].to_numpy(dtype=object)
+        distinct_creators = pd.unique(creator_names)
+        if len(distinct_creators) == 1:
+            # A viewer who is the only creator has nobody else to gift to
+            keep = viewers != distinct_creators[0]
+            viewers, points = viewers[keep], points[keep]
+        if len(viewers) == 0:
+            return False
+        creators = creator_names[rng.integers(0, len(creator_names), len(viewers))]
+        own = creators == viewers
+        while own.any():
+            # Redraw just the self-gifts (rejection sampling over the other creators)
+            creators[own] = creator_names[rng.integers(0, len(creator_names), int(own.sum()))]
+            own = creators == viewers
+        
+        # Recent timestamps, 1-60 days ago, in shuffled order
+        offsets = self._minute_offsets(rng, rng.integers(1, 61, len(viewers)))
+        order = rng.permutation(len(viewers))
+        epochs = (now_epoch - offsets * 60)[order]
+        self.ledger.extend({
+            "timestamp": format_timestamps(epochs),
+            "epoch": epochs,
+            "viewer": viewers[order],
+            "creator": creators[order],
+            "points": points[order],
+            "flagged": np.zeros(len(order), dtype=bool),
+            "reason": np.full(len(order), "Historical data from CSV", dtype=object),
+        })
+        
+        # Generate realistic number of flagged transactions for 900+ total transactions
+        num_flagged = int(rng.integers(5, 21))  # 5-20 flagged transactions (more realistic)
+        
+        # KEY: the first is from today (top 3), the second 1-3 days ago (top 20),
+        # the rest 10-60 days ago (scattered)
+        days_ago = rng.integers(10, 61, num_flagged)
+        days_ago[0] = 0
+        if num_flagged > 1:
+            days_ago[1] = rng.integers(1, 4)
+        epochs = now_epoch - self._minute_offsets(rng, days_ago) * 60
+        
+        flagged_transactions = {
+            "timestamp": format_timestamps(epochs),
+            "epoch": epochs,
+            "viewer": rng.choice(self.viewers["Viewer"].to_numpy(dtype=object), num_flagged),
+            "creator": rng.choice(creator_names, num_flagged),
+            "points": rng.choice(np.array(self.FLAGGED_POINTS, dtype=np.int64), num_flagged),
+            "flagged": np.ones(num_flagged, dtype=bool),
+            "reason": rng.choice(np.array(self.FLAGGED_REASONS, dtype=object), num_flagged),
+            "risk_level": rng.choice(np.array(self.FLAGGED_RISK_LEVELS, dtype=object), num_flagged),
+        }
+        
+        # Simply add flagged transactions to the end (they'll be sorted by timestamp naturally)
+        self.ledger.extend(flagged_transactions)
+        
+        return True
+    
+    @staticmethod
+    def _minute_offsets(rng, days):
+        """Offsets in minutes: the given days plus a random hour and minute"""
+        return days * 1440 + rng.integers(0, 24, len(days)) * 60 + rng.integers(0, 60, len(days))
+    
+    @staticmethod
+    def _split_gifts(rng, totals, counts):
+        """Split each total into counts[i] amounts of at least 100 points
+        
+        Every amount but the last is the even share varied by ±30%, capped so
+        each later amount can still get 100 points; the last takes the rest.
+        Computed for all viewers at once with a segmented cumulative sum.
+        """
+        size = int(counts.sum())
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        segment = np.repeat(np.arange(len(counts)), counts)
+        position = np.arange(size) - starts[segment]  # Index within each viewer's split
+        
+        # Desired amounts, at least 100 each
+        base = np.repeat(totals // counts, counts)
+        desired = np.maximum((base * rng.uniform(0.7, 1.3, size)).astype(np.int64), 100)
+        
+        # Running total per viewer, capped to leave 100 for every remaining amount
+        running = np.cumsum(desired)
+        running -= np.repeat(running[starts] - desired[starts], counts)
+        cap = np.repeat(totals, counts) - (np.repeat(counts, counts) - 1 - position) * 100
+        running = np.minimum(running, cap)
+        
+        # The last amount of each split takes whatever remains
+        running[ends - 1] = totals
+        amounts = np.diff(running, prepend=0)
+        amounts[starts] = running[starts]
+        return amounts
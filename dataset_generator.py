@@ -0,0 +1,463 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from arrow_backend import CREATORS_SCHEMA, TRANSACTIONS_SCHEMA, VIEWERS_SCHEMA
+from creator_analyzer import engagement_score
+from risk_manager import RiskManager
+from transaction_ledger import SGT_OFFSET_SECONDS, format_timestamps
+from viewer_limits import ACCOUNT_TYPE_AGE_CATEGORY, DEFAULT_AGE_CATEGORY
+
+FORMATS = ("csv", "arrow", "parquet")
+
+# Stream ids, so every (table, chunk) pair gets its own reproducible generator
+CREATORS_STREAM, VIEWERS_STREAM, TRANSACTIONS_STREAM = 1, 2, 3
+
+# Account mix of tiktok_viewers.csv: (type, share, trust levels, age range in days)
+ACCOUNT_TYPES = (
+    ("new", 0.25, ("new",), (1, 30)),
+    ("existing", 0.27, ("normal",), (31, 180)),
+    ("verified", 0.24, ("trusted", "normal"), (181, 365)),
+    ("creator", 0.24, ("trusted",), (365, 1095)),
+)
+
+# Injected fraud patterns: (share of fraud rows, risk level, reason)
+FRAUD_PATTERNS = {
+    "large": (0.4, "high", "Above fraud threshold"),
+    "spam": (0.4, "high", "Spam detected: burst of gifts in 10 minutes"),
+    "structuring": (0.2, "medium", "Repeated amounts just below suspicious limit"),
+}
+# Velocity checks of PointsManager.send_points that a normal gift can trip, in the
+# order they are applied (a later one overrides the reason): name -> reason
+VELOCITY_RULES = {
+    "spam": "Spam detected: 50+ gifts in 10 minutes",
+    "value_10min": "Suspicious value in 10 minutes",
+    "hourly": "Exceeds hourly limit",
+    "daily": "Exceeds daily limit",
+}
+SPAM_GIFTS_PER_10MIN = 50
+SUSPICIOUS_VALUE_PER_10MIN = 50000
+
+# Per-row pattern code -> risk level / reason; code 0 is a normal gift, then the
+# injected patterns, then normal gifts relabelled by a velocity check
+PATTERN_CODES = {pattern: code for code, pattern in enumerate(FRAUD_PATTERNS, start=1)}
+VELOCITY_CODES = {rule: code for code, rule in enumerate(VELOCITY_RULES, start=len(FRAUD_PATTERNS) + 1)}
+RISK_LEVELS = np.array(
+    ["low"] + [level for _, level, _ in FRAUD_PATTERNS.values()] + ["high"] * len(VELOCITY_RULES), dtype=object
+)
+REASONS = np.array(
+    ["Transaction within normal limits"] + [reason for _, _, reason in FRAUD_PATTERNS.values()]
+    + list(VELOCITY_RULES.values()), dtype=object
+)
+SUSPICIOUS_LIMIT = 3000  # Sidebar suspicious limit of a regular account (10000 * 0.3)
+# Extremes of the sidebar AML limits over every account profile (ViewerLimits:
+# 10000 * 0.3 or 0.6, times a combined multiplier between 0.5 and 12)
+MIN_SUSPICIOUS_LIMIT = 1500
+MAX_FRAUD_LIMIT = 72000
+GIFT_PARETO_SHAPE = 1.3
+
+
+def chunk_rng(seed, stream, chunk):
+    """Independent generator for one chunk of one table"""
+    return np.random.default_rng([seed, stream, chunk])
+
+
+def names(prefix, indices):
+    """Vectorized f"{prefix}{i}" for an array of indices"""
+    return np.char.add(prefix, np.asarray(indices).astype(str))
+
+
+def decode(codes, values):
+    """Arrow string array of values[codes], materialized in C via a dictionary array"""
+    dictionary = pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), pa.array(values, pa.string()))
+    return dictionary.cast(pa.string())
+
+
+def name_column(prefix, indices):
+    """Arrow string array of f"{prefix}{i}", formatting each distinct index once"""
+    unique, inverse = np.unique(indices, return_inverse=True)
+    return decode(inverse, names(prefix, unique))
+
+
+def gift_sizes(rng, size, scale=10, limit=MIN_SUSPICIOUS_LIMIT):
+    """Heavy-tailed gift sizes below `limit`: a Pareto tail truncated by inverse-CDF sampling
+
+    Every normal gift stays under the lowest sidebar suspicious limit, so an
+    unflagged row would not be flagged by any account's AML check.
+    """
+    # Lomax CDF is 1 - (1 + x)^-a; draw uniformly below its value at the limit
+    top = 1 - (limit / scale) ** -GIFT_PARETO_SHAPE
+    tail = (1 - top * rng.random(size)) ** (-1 / GIFT_PARETO_SHAPE) - 1
+    return np.minimum((scale * (1 + tail)).astype(np.int64), limit - 1)
+
+
+def popular_indices(rng, population, size, skew=3.0):
+    """Heavy-tailed picks from range(population): low indices are the popular ones"""
+    return np.minimum((population * rng.random(size) ** skew).astype(np.int64), population - 1)
+
+
+def chunk_bounds(total, chunk_size):
+    """(chunk index, start, stop) row ranges covering `total` rows"""
+    for chunk, start in enumerate(range(0, total, chunk_size)):
+        yield chunk, start, min(start + chunk_size, total)
+
+
+# Tables
+
+def creator_metrics(seed, chunk, start, stop):
+    """Views, likes, shares and points for creators [start, stop)"""
+    rng = chunk_rng(seed, CREATORS_STREAM, chunk)
+    count = stop - start
+    views = rng.lognormal(mean=13.0, sigma=1.5, size=count).astype(np.int64) + 1000
+    likes = (views * rng.beta(2, 20, count)).astype(np.int64)
+    shares = (likes * rng.beta(1.5, 30, count)).astype(np.int64)
+    points = (100 * (1 + rng.pareto(1.2, count))).astype(np.int64)
+    return views, likes, shares, points
+
+
+def creators_chunk(seed, chunk, start, stop, total_engagement):
+    views, likes, shares, points = creator_metrics(seed, chunk, start, stop)
+    scores = engagement_score(views, likes, shares)
+    return pa.Table.from_arrays([
+        pa.array(names("creator_", np.arange(start, stop))),
+        pa.array(views), pa.array(likes), pa.array(shares), pa.array(points),
+        pa.array(scores), pa.array(scores / total_engagement * 100),
+    ], schema=CREATORS_SCHEMA)
+
+
+def account_kinds(rng, count):
+    """Index into ACCOUNT_TYPES of each viewer (the first draw of a viewers chunk)"""
+    return rng.choice(len(ACCOUNT_TYPES), count, p=[share for _, share, _, _ in ACCOUNT_TYPES])
+
+
+def velocity_limits(seed, viewers, chunk_size):
+    """(hourly, daily) point limits of every viewer, as ViewerLimits derives them from Account_Type"""
+    risk_manager = RiskManager()
+    multipliers = np.array([
+        risk_manager.combined_multiplier(ACCOUNT_TYPE_AGE_CATEGORY.get(name, DEFAULT_AGE_CATEGORY), name)
+        for name, _, _, _ in ACCOUNT_TYPES
+    ])
+    hourly = (risk_manager.HOURLY_LIMIT * multipliers).astype(np.int64)
+    daily = (risk_manager.DAILY_LIMIT * multipliers).astype(np.int64)
+    kinds = np.concatenate([
+        account_kinds(chunk_rng(seed, VIEWERS_STREAM, chunk), stop - start)
+        for chunk, start, stop in chunk_bounds(viewers, chunk_size)
+    ] or [np.empty(0, dtype=np.int64)])
+    return hourly[kinds], daily[kinds]
+
+
+def viewers_chunk(seed, chunk, start, stop, end_epoch, days):
+    rng = chunk_rng(seed, VIEWERS_STREAM, chunk)
+    count = stop - start
+
+    kind = account_kinds(rng, count)
+    account_type = np.empty(count, dtype=object)
+    trust_level = np.empty(count, dtype=object)
+    age_days = np.empty(count, dtype=np.int64)
+    for code, (name, _, trust_levels, (low, high)) in enumerate(ACCOUNT_TYPES):
+        mask = kind == code
+        picked = int(mask.sum())
+        account_type[mask] = name
+        trust_level[mask] = np.array(trust_levels, dtype=object)[rng.integers(0, len(trust_levels), picked)]
+        age_days[mask] = rng.integers(low, high + 1, picked)
+
+    # Roughly a third never gift; the rest follow a heavy tail
+    gifts = (100 * (1 + rng.pareto(1.1, count))).astype(np.int64)
+    gifts[rng.random(count) < 0.3] = 0
+    last_gift_day = (end_epoch + SGT_OFFSET_SECONDS) // 86400 - rng.integers(0, days, count)
+    last_gift = np.datetime_as_string(last_gift_day.astype("datetime64[D]"), unit="D")
+
+    return pa.Table.from_arrays([
+        pa.array(names("viewer_", np.arange(start, stop))),
+        pa.array(account_type, pa.string()),
+        pa.array(gifts),
+        pa.array(last_gift, pa.string(), mask=gifts == 0),
+        pa.array(trust_level, pa.string()),
+        pa.array(age_days),
+    ], schema=VIEWERS_SCHEMA)
+
+
+class VelocityLabeler:
+    """Flags the normal gifts PointsManager.send_points' velocity checks would flag
+
+    A gift is flagged when its viewer already sent 50 gifts in the preceding
+    10 minutes, when it brings the viewer's 10-minute total to 50,000 points,
+    or when it takes the hourly or SGT-day total over the viewer's limits.
+    Every row counts towards the windows, flagged or not, as in the ledger.
+
+    Chunks must be labelled in time order: the last hour of rows and each
+    viewer's total for the current day carry over to the next chunk.
+    """
+
+    def __init__(self, hourly_limits, daily_limits):
+        self.hourly_limits = hourly_limits
+        self.daily_limits = daily_limits
+        empty = np.empty(0, dtype=np.int64)
+        self._recent = (empty, empty, empty)     # viewer, epoch, points of the last hour of rows
+        self._day_totals = (empty, empty, empty)  # viewer (sorted), sgt day, points before _recent
+
+    def label(self, viewers, epochs, points, pattern):
+        """Relabel pattern-0 rows (time-ordered) that a velocity check flags; returns pattern"""
+        recent_viewers, recent_epochs, recent_points = self._recent
+        offset = len(recent_viewers)
+        all_viewers = np.concatenate([recent_viewers, viewers])
+        all_epochs = np.concatenate([recent_epochs, epochs])
+        all_points = np.concatenate([recent_points, points])
+
+        # Rows by viewer, then time; each row's window totals are sums over the rows before it
+        order = np.lexsort((np.arange(len(all_viewers)), all_epochs, all_viewers))
+        keys = (all_viewers[order] << 32) | all_epochs[order]
+        totals = np.concatenate([[0], np.cumsum(all_points[order])])
+        rows = np.arange(len(keys))
+
+        def before(seconds):
+            first = np.searchsorted(keys, keys - seconds, side="left")
+            return rows - first, totals[rows] - totals[first]
+
+        count_10min, value_10min = before(600)
+        _, value_hour = before(3600)
+        day = (all_epochs[order] + SGT_OFFSET_SECONDS) // 86400
+        day_start = day * 86400 - SGT_OFFSET_SECONDS
+        first = np.searchsorted(keys, (all_viewers[order] << 32) | day_start, side="left")
+        value_day = totals[rows] - totals[first] + self._carried(all_viewers[order], day)
+
+        sorted_viewers, sorted_points = all_viewers[order], all_points[order]
+        hits = {
+            "spam": count_10min >= SPAM_GIFTS_PER_10MIN,
+            "value_10min": value_10min + sorted_points >= SUSPICIOUS_VALUE_PER_10MIN,
+            "hourly": value_hour + sorted_points > self.hourly_limits[sorted_viewers],
+            "daily": value_day + sorted_points > self.daily_limits[sorted_viewers],
+        }
+        relabel = np.zeros(len(keys), dtype=np.int8)
+        for rule, hit in hits.items():
+            relabel[hit] = VELOCITY_CODES[rule]
+
+        # Back in chunk row order; only normal gifts change
+        chunk_relabel = np.empty(len(keys), dtype=np.int8)
+        chunk_relabel[order] = relabel
+        chunk_relabel = chunk_relabel[offset:]
+        pattern = np.where((pattern == 0) & (chunk_relabel != 0), chunk_relabel, pattern).astype(np.int8)
+
+        self._advance(all_viewers, all_epochs, all_points)
+        return pattern
+
+    def _carried(self, viewers, day):
+        """Points each viewer sent earlier on `day`, in rows no longer kept in _recent"""
+        carried_viewers, carried_day, carried_points = self._day_totals
+        if len(carried_viewers) == 0:
+            return np.zeros(len(viewers), dtype=np.int64)
+        position = np.minimum(np.searchsorted(carried_viewers, viewers), len(carried_viewers) - 1)
+        found = (carried_viewers[position] == viewers) & (carried_day[position] == day)
+        return np.where(found, carried_points[position], 0)
+
+    def _advance(self, viewers, epochs, points):
+        """Keep the last hour of rows; fold older ones into the current day's totals"""
+        if len(epochs) == 0:
+            return
+        newest = int(epochs.max())
+        keep = epochs >= newest - 3600
+        self._recent = (viewers[keep], epochs[keep], points[keep])
+
+        today = (newest + SGT_OFFSET_SECONDS) // 86400
+        dropped_today = ~keep & ((epochs + SGT_OFFSET_SECONDS) // 86400 == today)
+        carried_viewers, carried_day, carried_points = self._day_totals
+        carried_today = carried_day == today
+        merged_viewers = np.concatenate([carried_viewers[carried_today], viewers[dropped_today]])
+        merged_points = np.concatenate([carried_points[carried_today], points[dropped_today]])
+        unique, inverse = np.unique(merged_viewers, return_inverse=True)
+        sums = np.bincount(inverse, weights=merged_points, minlength=len(unique)).astype(np.int64)
+        self._day_totals = (unique, np.full(len(unique), today, dtype=np.int64), sums)
+
+
+def transactions_chunk(seed, chunk, count, window, creator_count, viewer_count, fraud_rate, labeler=None):
+    """`count` transactions with epochs inside window = (start_epoch, stop_epoch), time-ordered
+
+    With a VelocityLabeler, normal gifts that a velocity check would flag are
+    labelled as such; chunks must then be generated in time order.
+    """
+    rng = chunk_rng(seed, TRANSACTIONS_STREAM, chunk)
+    window_start, window_stop = window
+    span = max(1, window_stop - window_start)
+
+    fraud = {pattern: 0 for pattern in FRAUD_PATTERNS}
+    for pattern, (share, _, _) in FRAUD_PATTERNS.items():
+        fraud[pattern] = int(rng.binomial(count, fraud_rate * share))
+    normal = count - sum(fraud.values())
+
+    # Bursty arrivals: most gifts cluster around burst centres (live streams),
+    # the rest arrive uniformly in the background
+    centres = window_start + rng.integers(0, span, max(1, normal // 200))
+    in_burst = rng.random(normal) < 0.7
+    epochs = window_start + rng.integers(0, span, normal)
+    epochs[in_burst] = (
+        rng.choice(centres, int(in_burst.sum()))
+        + rng.exponential(300, int(in_burst.sum())).astype(np.int64)
+    )
+
+    parts = [{
+        "epoch": epochs,
+        "viewer": popular_indices(rng, viewer_count, normal, skew=2.0),
+        "creator": popular_indices(rng, creator_count, normal),
+        # Heavy-tailed gift sizes: most are small, a few approach the AML limits
+        "points": gift_sizes(rng, normal),
+        "pattern": np.zeros(normal, dtype=np.int8),
+    }]
+
+    # Single large gifts above any fraud limit
+    size = fraud["large"]
+    parts.append({
+        "epoch": window_start + rng.integers(0, span, size),
+        "viewer": rng.integers(0, viewer_count, size),
+        "creator": popular_indices(rng, creator_count, size),
+        "points": rng.integers(MAX_FRAUD_LIMIT + 1, 500_000, size),
+        "pattern": np.full(size, PATTERN_CODES["large"], dtype=np.int8),
+    })
+
+    # Spam: one viewer sends 50-80 small gifts to one creator within 10 minutes
+    size = fraud["spam"]
+    lengths = rng.integers(50, 81, max(1, size // 50 + 1))
+    group = np.repeat(np.arange(len(lengths)), lengths)[:size]
+    parts.append({
+        "epoch": (window_start + rng.integers(0, span, len(lengths)))[group] + rng.integers(0, 600, size),
+        "viewer": rng.integers(0, viewer_count, len(lengths))[group],
+        "creator": popular_indices(rng, creator_count, len(lengths))[group],
+        "points": rng.integers(10, 100, size),
+        "pattern": np.full(size, PATTERN_CODES["spam"], dtype=np.int8),
+    })
+
+    # Structuring: one viewer repeats amounts just under the suspicious limit within an hour
+    size = fraud["structuring"]
+    lengths = rng.integers(5, 21, max(1, size // 5 + 1))
+    group = np.repeat(np.arange(len(lengths)), lengths)[:size]
+    parts.append({
+        "epoch": (window_start + rng.integers(0, span, len(lengths)))[group] + rng.integers(0, 3600, size),
+        "viewer": rng.integers(0, viewer_count, len(lengths))[group],
+        "creator": rng.integers(0, creator_count, size),
+        "points": rng.integers(int(SUSPICIOUS_LIMIT * 0.9), SUSPICIOUS_LIMIT, size),
+        "pattern": np.full(size, PATTERN_CODES["structuring"], dtype=np.int8),
+    })
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    order = np.argsort(np.minimum(columns["epoch"], window_stop - 1), kind="stable")
+    columns = {name: values[order] for name, values in columns.items()}
+    epochs = np.minimum(columns["epoch"], window_stop - 1)
+    epochs -= epochs % 60  # Timestamps have minute resolution
+
+    pattern = columns["pattern"]
+    if labeler is not None:
+        pattern = labeler.label(columns["viewer"], epochs, columns["points"], pattern)
+
+    # Sorted minute-resolution epochs repeat a lot; format each distinct minute once
+    minutes, inverse = np.unique(epochs, return_inverse=True)
+
+    return pa.Table.from_arrays([
+        decode(inverse, format_timestamps(minutes)),
+        pa.array(epochs),
+        name_column("viewer_", columns["viewer"]),
+        name_column("creator_", columns["creator"]),
+        pa.array(columns["points"]),
+        pa.array(pattern != 0),
+        decode(pattern, RISK_LEVELS),
+        decode(pattern, REASONS),
+    ], schema=TRANSACTIONS_SCHEMA)
+
+
+# Output
+
+class TableWriter:
+    """Streams record batches of one table to every requested format"""
+
+    def __init__(self, out_dir, stem, schema, formats):
+        self.paths = []
+        self._writers = []
+        for file_format in formats:
+            path = os.path.join(out_dir, f"{stem}.{file_format}")
+            if file_format == "csv":
+                writer = pa_csv.CSVWriter(path, schema, write_options=pa_csv.WriteOptions(quoting_style="needed"))
+            elif file_format == "arrow":
+                writer = pa.ipc.new_file(path, schema)
+            elif file_format == "parquet":
+                writer = pq.ParquetWriter(path, schema)
+            else:
+                raise ValueError(f"Unknown output format: {file_format}")
+            self.paths.append(path)
+            self._writers.append(writer)
+
+    def write(self, table):
+        for writer in self._writers:
+            writer.write_table(table)
+
+    def close(self):
+        for writer in self._writers:
+            writer.close()
+
+
+def generate(out_dir, creators=100_000, viewers=1_000_000, transactions=10_000_000,
+             chunk_size=1_000_000, formats=("csv",), seed=0, days=60, end=None, fraud_rate=0.002):
+    """Write tiktok_creators/viewers/transactions.<format> files; returns {table: seconds}"""
+    os.makedirs(out_dir, exist_ok=True)
+    end = pd.Timestamp.now() if end is None else pd.Timestamp(end)
+    end_epoch = int(end.floor("min").to_datetime64().astype("datetime64[s]").astype(np.int64)) - SGT_OFFSET_SECONDS
+    start_epoch = end_epoch - days * 86400
+    timings = {}
+
+    # Creators: Fair Reward % needs the total engagement, so total it in a cheap first pass
+    started = time.perf_counter()
+    total_engagement = 0.0
+    for chunk, start, stop in chunk_bounds(creators, chunk_size):
+        total_engagement += float(np.sum(engagement_score(*creator_metrics(seed, chunk, start, stop)[:3])))
+    writer = TableWriter(out_dir, "tiktok_creators", CREATORS_SCHEMA, formats)
+    for chunk, start, stop in chunk_bounds(creators, chunk_size):
+        writer.write(creators_chunk(seed, chunk, start, stop, total_engagement))
+    writer.close()
+    timings["creators"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    writer = TableWriter(out_dir, "tiktok_viewers", VIEWERS_SCHEMA, formats)
+    for chunk, start, stop in chunk_bounds(viewers, chunk_size):
+        writer.write(viewers_chunk(seed, chunk, start, stop, end_epoch, days))
+    writer.close()
+    timings["viewers"] = time.perf_counter() - started
+
+    # Transactions: each chunk covers its own slice of the time range, so the file is time-ordered
+    started = time.perf_counter()
+    writer = TableWriter(out_dir, "tiktok_transactions", TRANSACTIONS_SCHEMA, formats)
+    labeler = VelocityLabeler(*velocity_limits(seed, viewers, chunk_size))
+    chunks = max(1, -(-transactions // chunk_size))
+    for chunk, start, stop in chunk_bounds(transactions, chunk_size):
+        window = (start_epoch + (end_epoch - start_epoch) * chunk // chunks,
+                  start_epoch + (end_epoch - start_epoch) * (chunk + 1) // chunks)
+        writer.write(transactions_chunk(seed, chunk, stop - start, window, creators, viewers, fraud_rate, labeler))
+    writer.close()
+    timings["transactions"] = time.perf_counter() - started
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic FairShare datasets at scale")
+    parser.add_argument("--out", default="synthetic_data", help="Output directory")
+    parser.add_argument("--creators", type=int, default=100_000)
+    parser.add_argument("--viewers", type=int, default=1_000_000)
+    parser.add_argument("--transactions", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows generated and written per chunk")
+    parser.add_argument("--formats", default="csv,arrow", help=f"Comma-separated subset of {','.join(FORMATS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=60, help="Length of the transaction history")
+    parser.add_argument("--end", default=None, help="Timestamp of the newest transaction (default: now)")
+    parser.add_argument("--fraud-rate", type=float, default=0.002, help="Share of injected fraudulent transactions")
+    args = parser.parse_args()
+
+    timings = generate(
+        args.out, args.creators, args.viewers, args.transactions, args.chunk_size,
+        tuple(args.formats.split(",")), args.seed, args.days, args.end, args.fraud_rate
+    )
+    for table, seconds in timings.items():
+        print(f"{table:<13} {seconds:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
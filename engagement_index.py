@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+
+class EngagementIndex:
+    """Sorted array over creators' Engagement Score
+
+    Ranks and percentiles are answered with a binary search, performance
+    tiers with cached quantile cut points, and similar creators with a range
+    slice. When the creators table changes, refresh() re-slots only the rows
+    whose score changed or were added instead of re-sorting everything.
+
+    Freshness is tracked by the table object, its length and the caller's
+    table version (e.g. DatabaseManager.tables_version): code that edits
+    scores in place must bump that version for matches() to notice.
+    """
+
+    COLUMN = "Engagement Score"
+    TIER_QUANTILES = (0.9, 0.7, 0.5)
+
+    # Fall back to a full rebuild when more than this share of rows changed
+    REBUILD_FRACTION = 0.25
+
+    def __init__(self, creators_df, version=None):
+        self._build(creators_df, version)
+
+    @classmethod
+    def from_scores(cls, scores):
+        """Build an index over a bare sequence of engagement scores"""
+        return cls(pd.DataFrame({cls.COLUMN: np.asarray(list(scores), dtype=np.float64)}))
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _build(self, creators_df, version=None):
+        values = creators_df[self.COLUMN].to_numpy(dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        self._scores = values[order]  # Ascending
+        self._positions = order       # Row position in creators_df of each sorted score
+        self._track(creators_df, values, version)
+
+    def _track(self, creators_df, values, version):
+        self.creators_df = creators_df
+        self.version = version
+        self._values = values.copy()  # Scores in row order, to diff against on refresh
+        self._cut_points = None
+
+    def matches(self, creators_df, version=None):
+        """True if the index already reflects this frame at this version (O(1) check)"""
+        return creators_df is self.creators_df and len(creators_df) == len(self._values) and version == self.version
+
+    def refresh(self, creators_df, version=None):
+        """Bring the index up to date with a changed creators table"""
+        values = creators_df[self.COLUMN].to_numpy(dtype=np.float64)
+        old = self._values
+        if len(values) < len(old):
+            self._build(creators_df, version)
+            return
+
+        # Rows whose score changed, plus rows appended since the last build
+        prefix = values[:len(old)]
+        same = (prefix == old) | (np.isnan(prefix) & np.isnan(old))
+        dirty = np.concatenate([np.flatnonzero(~same), np.arange(len(old), len(values))])
+        if len(dirty) > len(values) * self.REBUILD_FRACTION:
+            self._build(creators_df, version)
+            return
+
+        if len(dirty):
+            keep = ~np.isin(self._positions, dirty)
+            scores, positions = self._scores[keep], self._positions[keep]
+
+            added_scores = values[dirty]
+            order = np.argsort(added_scores, kind="stable")
+            added_scores, added_positions = added_scores[order], dirty[order]
+            slots = np.searchsorted(scores, added_scores, side="right")
+            self._scores = np.insert(scores, slots, added_scores)
+            self._positions = np.insert(positions, slots, added_positions)
+
+        self._track(creators_df, values, version)
+
+    def rank(self, score):
+        """Rank a new score would take among the indexed creators (1 = best)"""
+        greater = len(self._scores) - int(np.searchsorted(self._scores, score, side="right"))
+        rank = greater + 1
+        total = len(self._scores) + 1
+        return {
+            "rank": rank,
+            "total_creators": total,
+            "percentile": ((total - rank) / total) * 100
+        }
+
+    def cut_points(self):
+        """Cached (q90, q70, q50) of the indexed scores"""
+        if self._cut_points is None:
+            finite = self._scores[~np.isnan(self._scores)]
+            self._cut_points = tuple(
+                float(np.quantile(finite, q)) if len(finite) else np.nan for q in self.TIER_QUANTILES
+            )
+        return self._cut_points
+
+    def similar(self, score, similarity_range=0.2, limit=5):
+        """First `limit` creators (in table order) within ±similarity_range of score"""
+        low = np.searchsorted(self._scores, score * (1 - similarity_range), side="left")
+        high = np.searchsorted(self._scores, score * (1 + similarity_range), side="right")
+        positions = np.sort(self._positions[low:high])[:limit]
+        return self.creators_df.iloc[positions]
@@ -0,0 +1,156 @@
+import time
+from collections import ChainMap
+import numpy as np
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+
+class FundFlowRollups:
+    """Minute, hour and day fund-flow buckets maintained as transactions arrive
+
+    Every bucket holds [count, points, max points, flagged points]. Attach it
+    to a TransactionLedger; each write updates one bucket per resolution per
+    row. A window query covers its whole days with day buckets, the hours left
+    at either edge with hour buckets and the remaining minutes with minute
+    buckets, so it reads at most a few hundred buckets however many
+    transactions are stored.
+
+    Minute and hour buckets are only kept for RETENTION before the newest
+    transaction (from the start of that day); windows reaching further back
+    are widened to whole days and served from day buckets. Memory is then
+    bounded by the retention plus one bucket per day of history.
+
+    Built once on the shared ledger; fork() gives each session's ledger fork
+    an O(1) view of the buckets that copies a bucket only when it changes.
+    """
+
+    NAME = "fund_flow"
+
+    RESOLUTIONS = (MINUTE, HOUR, DAY)
+    RETENTION = 7 * DAY  # Longest selectable window (SystemMonitor.FUND_FLOW_WINDOWS)
+
+    def __init__(self):
+        # width -> bucket start -> stats; writes land in the first map
+        self._buckets = {width: ChainMap() for width in self.RESOLUTIONS}
+        self._newest = None   # Latest epoch recorded
+        self._horizon = None  # Start of the oldest minute and hour buckets kept
+
+    def fork(self):
+        """Rollups sharing these buckets copy-on-write
+
+        This object must not be updated once forked.
+        """
+        forked = type(self)()
+        forked._buckets = {width: ChainMap({}, *buckets.maps) for width, buckets in self._buckets.items()}
+        forked._newest = self._newest
+        forked._horizon = self._horizon
+        return forked
+
+    def on_append(self, ledger, start, stop):
+        """Ingest ledger rows [start, stop)"""
+        epochs = ledger.column("epoch")[start:stop]
+        points = ledger.column("points")[start:stop]
+        flagged = ledger.column("flagged")[start:stop]
+
+        if stop - start == 1:
+            self.add(int(epochs[0]), int(points[0]), bool(flagged[0]))
+            return
+
+        self._advance(int(epochs.max()))
+        flagged_points = np.where(flagged, points, 0)
+        # Rows before the horizon only go to day buckets
+        recent = np.flatnonzero(epochs >= self._horizon)
+        for width, buckets in self._buckets.items():
+            rows = recent if width < DAY else slice(None)
+            if width < DAY and len(recent) == 0:
+                continue
+            keys = epochs[rows] // width * width
+            order = np.argsort(keys, kind="stable")
+            keys, starts = np.unique(keys[order], return_index=True)
+            counts = np.diff(np.append(starts, len(order)))
+            sums = np.add.reduceat(points[rows][order], starts)
+            maxima = np.maximum.reduceat(points[rows][order], starts)
+            flagged_sums = np.add.reduceat(flagged_points[rows][order], starts)
+            for key, count, total, largest, flagged_total in zip(
+                    keys.tolist(), counts.tolist(), sums.tolist(), maxima.tolist(), flagged_sums.tolist()):
+                self._merge(buckets, key, count, total, largest, flagged_total)
+
+    def add(self, epoch, points, flagged=False):
+        """Record one transaction of `points` at `epoch` (seconds)"""
+        self._advance(epoch)
+        for width, buckets in self._buckets.items():
+            if width < DAY and epoch < self._horizon:
+                continue
+            self._merge(buckets, epoch // width * width, 1, points, points, points if flagged else 0)
+
+    def _advance(self, newest):
+        """Record the newest epoch and evict minute and hour buckets that fell behind the horizon"""
+        self._newest = newest if self._newest is None else max(self._newest, newest)
+        horizon = (self._newest - self.RETENTION) // DAY * DAY
+        if self._horizon is not None and horizon <= self._horizon:
+            return
+        self._horizon = horizon
+        # Shared buckets behind the horizon are never read again, so only the own ones are dropped
+        for width in self.RESOLUTIONS[:-1]:
+            own = self._buckets[width].maps[0]
+            for key in [key for key in own if key < horizon]:
+                del own[key]
+
+    @staticmethod
+    def _merge(buckets, key, count, total, largest, flagged_total):
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [count, total, largest, flagged_total]
+        else:
+            if key not in buckets.maps[0]:
+                bucket = buckets[key] = list(bucket)  # Copy a shared bucket before changing it
+            bucket[0] += count
+            bucket[1] += total
+            bucket[2] = max(bucket[2], largest)
+            bucket[3] += flagged_total
+
+    def window(self, seconds, now=None):
+        """Stats for the `seconds` up to `now`: count, total, max and flagged_total points
+
+        The window's start is floored to the minute to match the minute
+        resolution of the buckets (and of stored timestamps), or to the day
+        when it lies before the horizon of the minute and hour buckets.
+        Transactions stamped after `now` are included, as in a scan for
+        epoch >= start.
+        """
+        now = int(time.time()) if now is None else int(now)
+        start = (now - int(seconds)) // MINUTE * MINUTE
+        if self._horizon is not None and start < self._horizon:
+            start = start // DAY * DAY
+        stats = [0, 0, 0, 0]
+        if self._newest is not None and self._newest >= start:
+            end = self._newest // MINUTE * MINUTE + MINUTE
+            self._collect(stats, start, end, len(self.RESOLUTIONS) - 1)
+        return {"count": stats[0], "total": stats[1], "max": stats[2], "flagged_total": stats[3]}
+
+    def _collect(self, stats, start, end, level):
+        """Add the buckets covering [start, end) to stats, coarsest resolution first
+
+        start and end are multiples of the finest resolution.
+        """
+        width = self.RESOLUTIONS[level]
+        if level == 0:
+            first, last = start, end
+        else:
+            first = -(-start // width) * width  # First whole bucket
+            last = end // width * width
+            if first >= last:
+                self._collect(stats, start, end, level - 1)
+                return
+            self._collect(stats, start, first, level - 1)
+            self._collect(stats, last, end, level - 1)
+        buckets = self._buckets[width]
+        for key in range(first, last, width):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                stats[0] += bucket[0]
+                stats[1] += bucket[1]
+                stats[2] = max(stats[2], bucket[2])
+                stats[3] += bucket[3]
@@ -0,0 +1,148 @@
+from collections import ChainMap
+import numpy as np
+import pandas as pd
+
+
+class _Positions:
+    """Growable int64 array of ledger row positions (amortized O(1) appends)"""
+
+    def __init__(self, values=None):
+        values = np.empty(0, dtype=np.int64) if values is None else np.asarray(values, dtype=np.int64)
+        self._buffer = values
+        self._size = len(values)
+
+    def __len__(self):
+        return self._size
+
+    def share(self):
+        """Positions reading this buffer; its first extend() moves it onto a buffer of its own"""
+        return _Positions(self._buffer[:self._size])
+
+    def extend(self, values):
+        required = self._size + len(values)
+        if required > len(self._buffer):
+            grown = np.empty(max(8, required, 2 * len(self._buffer)), dtype=np.int64)
+            grown[:self._size] = self._buffer[:self._size]
+            self._buffer = grown
+        self._buffer[self._size:required] = values
+        self._size = required
+
+    def array(self):
+        """Live slice of the stored positions (no copy)"""
+        return self._buffer[:self._size]
+
+
+class HistoryIndex:
+    """Time-ordered index over a TransactionLedger for paginated history
+
+    Keeps every row position sorted by (epoch, position), plus one such list
+    per viewer, per creator and per flagged status. Transactions arriving in
+    time order (every live send) are appended to the lists in amortized O(1);
+    a batch that lands earlier in time than what is stored (bulk loads,
+    backfills) triggers one rebuild. A page of the newest-first history is then
+    a slice of one list: O(page size) however many rows are stored.
+
+    Pages filtered on more than one field intersect the matching lists once
+    per ledger write and reuse the result until the next one.
+
+    Built once on the shared ledger; fork() gives each session's ledger fork
+    an O(1) view of it that copies a list only when the session appends to it.
+    """
+
+    NAME = "history"
+
+    def __init__(self):
+        self._order = _Positions()   # All rows, oldest first
+        self._last_epoch = None      # Epoch of the newest row in _order
+        self._lists = ChainMap()     # ("viewer" | "creator" | "flagged", value) -> _Positions
+        self._combined = {}          # Filters of multi-field queries -> positions, until the next write
+
+    def fork(self):
+        """Index sharing these position lists copy-on-write
+
+        This index must not be updated once forked.
+        """
+        forked = type(self)()
+        forked._order = self._order.share()
+        forked._last_epoch = self._last_epoch
+        forked._lists = ChainMap({}, *self._lists.maps)
+        return forked
+
+    def on_append(self, ledger, start, stop):
+        """Ingest ledger rows [start, stop)"""
+        self._combined = {}
+        epochs = ledger.column("epoch")[start:stop]
+        if self._last_epoch is not None and epochs.min() < self._last_epoch:
+            self._rebuild(ledger, stop)
+            return
+        # Oldest first; ties keep row order
+        batch = start + np.argsort(epochs, kind="stable")
+        self._order.extend(batch)
+        self._last_epoch = int(epochs.max())
+        self._add_to_lists(ledger, batch)
+
+    def _rebuild(self, ledger, stop):
+        epochs = ledger.column("epoch")[:stop]
+        order = np.argsort(epochs, kind="stable")
+        self._order = _Positions(order)
+        self._last_epoch = int(epochs[order[-1]])
+        self._lists = ChainMap()
+        self._add_to_lists(ledger, order)
+
+    def _add_to_lists(self, ledger, positions):
+        """Append time-ordered `positions` to the per-viewer, per-creator and flagged lists"""
+        if len(positions) == 1:
+            position = int(positions[0])
+            for field in ("viewer", "creator", "flagged"):
+                self._list(field, ledger.column(field)[position]).extend(positions)
+            return
+        for field in ("viewer", "creator", "flagged"):
+            codes, values = pd.factorize(ledger.column(field)[positions], use_na_sentinel=False)
+            # Group by value; the stable sort keeps each group in time order
+            grouped = positions[np.argsort(codes, kind="stable")]
+            bounds = np.cumsum(np.bincount(codes, minlength=len(values)))[:-1]
+            for value, group in zip(values, np.split(grouped, bounds)):
+                self._list(field, value).extend(group)
+
+    def _list(self, field, value):
+        key = (field, bool(value) if field == "flagged" else value)
+        positions = self._lists.maps[0].get(key)
+        if positions is None:
+            shared = self._lists.get(key)
+            positions = self._lists[key] = shared.share() if shared is not None else _Positions()
+        return positions
+
+    def matching(self, viewer=None, creator=None, flagged=None):
+        """Positions of the rows matching every given filter, oldest first"""
+        filters = [(field, value) for field, value in (("viewer", viewer), ("creator", creator), ("flagged", flagged))
+                   if value is not None]
+        if not filters:
+            return self._order.array()
+        filters = [(field, bool(value) if field == "flagged" else value) for field, value in filters]
+        lists = [self._lists.get(key) for key in filters]
+        if any(positions is None for positions in lists):
+            return np.empty(0, dtype=np.int64)
+        if len(filters) == 1:
+            return lists[0].array()
+
+        key = tuple(filters)
+        if key not in self._combined:
+            # Keep the rows of the shortest list that are in all the others (stays time-ordered)
+            lists = sorted(lists, key=len)
+            matches = lists[0].array()
+            for positions in lists[1:]:
+                matches = matches[np.isin(matches, positions.array())]
+            self._combined[key] = matches
+        return self._combined[key]
+
+    def count(self, viewer=None, creator=None, flagged=None):
+        """Number of rows matching the filters"""
+        return len(self.matching(viewer, creator, flagged))
+
+    def page(self, number, size=20, viewer=None, creator=None, flagged=None):
+        """Row positions on page `number` (from 0) of the newest-first history"""
+        positions = self.matching(viewer, creator, flagged)
+        stop = len(positions) - number * size
+        if number < 0 or stop <= 0:
+            return np.empty(0, dtype=np.int64)
+        return positions[max(0, stop - size):stop][::-1]
@@ -0,0 +1,124 @@
+"""Latency histograms for the app's hot paths
+
+`timed(name)` decorates a function and `measure(name)` wraps a block; both
+record the wall-clock duration into the process-wide LatencyHistogram of that
+name, shared by every session. Histograms count samples in fixed log-spaced
+buckets, so recording is a binary search and memory stays constant however
+many samples arrive; p50, p95 and p99 are read back from the bucket counts.
+
+Names are dotted by area (e.g. "points.send_points", "dashboard.tab.<label>",
+"data.load_databases"); SystemMonitor scores response times from every
+histogram outside "data.".
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Bucket upper bounds in seconds: ten per decade from 10us to 100s; slower
+# samples land in one overflow bucket
+BUCKET_BOUNDS = tuple(10 ** (exponent / 10) for exponent in range(-50, 21))
+
+
+class LatencyHistogram:
+    """Counts of durations in BUCKET_BOUNDS buckets, plus count, sum and max"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Drop every recorded sample"""
+        with self._lock:
+            self._counts = [0] * (len(BUCKET_BOUNDS) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def record(self, seconds):
+        """Add one duration"""
+        bucket = bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self._counts[bucket] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the `fraction` quantile (seconds), capped at the max"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                if bucket == len(BUCKET_BOUNDS):
+                    return self.max
+                return min(BUCKET_BOUNDS[bucket], self.max)
+        return self.max
+
+    def summary(self):
+        """count, mean, p50, p95, p99 and max, in milliseconds"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+_histograms = {}  # name -> LatencyHistogram
+_registry_lock = threading.Lock()
+
+
+def histogram(name):
+    """The histogram called `name`, created on first use"""
+    found = _histograms.get(name)
+    if found is None:
+        with _registry_lock:
+            found = _histograms.setdefault(name, LatencyHistogram())
+    return found
+
+
+@contextmanager
+def measure(name):
+    """Record the duration of the enclosed block (also when it raises)"""
+    target = histogram(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        target.record(time.perf_counter() - started)
+
+
+def timed(name):
+    """Decorator recording every call's duration into histogram `name`"""
+    def decorate(function):
+        target = histogram(name)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                target.record(time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def summaries(prefix=""):
+    """{name: summary} of the histograms with samples whose names start with `prefix`, sorted by name"""
+    return {name: target.summary() for name, target in sorted(list(_histograms.items()))
+            if target.count and name.startswith(prefix)}
+
+
+def reset():
+    """Drop every recorded sample (decorated functions keep their histograms)"""
+    for target in list(_histograms.values()):
+        target.clear()
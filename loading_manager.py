@@ -1,7 +1,23 @@
 import streamlit as st
 import time
+import pandas as pd
+from shared_data import get_shared_data, is_warm, mark_warm
 
 class LoadingManager:
+    """Shows the loading screen while the process-wide startup work runs
+
+    The stages build data on the shared cache, so they only do real work for
+    the first session of each data version; later sessions skip the screen.
+    """
+
+    # (progress label, method) in run order
+    STAGES = (
+        ("Loading creators, viewers and transactions", "_load_data"),
+        ("Building indexes", "_build_indexes"),
+        ("Precomputing scores", "_precompute_scores"),
+        ("Warming up charts", "_warm_up_figures"),
+    )
+
     def __init__(self):
         pass
     
@@ -10,14 +26,85 @@ class LoadingManager:
             st.session_state.app_loaded = False
         
         if not st.session_state.app_loaded:
-            self._render_loading_screen()
-            time.sleep(2)
+            if is_warm():
+                st.session_state.app_loaded = True
+                return
+            
+            placeholder = st.empty()
+            st.session_state.startup_timings = self.warm_up(
+                lambda done, label: self._render_loading_screen(placeholder, done, label)
+            )
+            placeholder.empty()
             st.session_state.app_loaded = True
-            st.rerun()
     
-    def _render_loading_screen(self):
-        st.markdown(self._get_loading_css(), unsafe_allow_html=True)
-        st.markdown(self._get_loading_html(), unsafe_allow_html=True)
+    def warm_up(self, on_progress=None):
+        """Run the startup stages; returns {stage label: seconds}
+        
+        on_progress(done, label) is called before each stage and once more
+        with label None when all are done.
+        """
+        timings = {}
+        shared_data = None
+        for done, (label, method) in enumerate(self.STAGES):
+            if on_progress is not None:
+                on_progress(done, label)
+            started = time.perf_counter()
+            shared_data = getattr(self, method)(shared_data)
+            timings[label] = time.perf_counter() - started
+        mark_warm(shared_data)
+        if on_progress is not None:
+            on_progress(len(self.STAGES), None)
+        return timings
+    
+    def _load_data(self, shared_data):
+        """Tables, historical transactions and ledger indexes (st.cache_resource)"""
+        return get_shared_data()
+    
+    def _build_indexes(self, shared_data):
+        """Name indexes and per-viewer AML limits over the shared tables"""
+        from name_index import NameIndex
+        from risk_manager import RiskManager
+        from viewer_limits import ViewerLimits
+        
+        viewer_names = shared_data.derive("viewers_names", lambda shared: NameIndex(shared.viewers, "Viewer"))
+        shared_data.derive("creators_names", lambda shared: NameIndex(shared.creators, "Creator"))
+        shared_data.derive("viewer_limits", lambda shared: ViewerLimits(shared.viewers, RiskManager(), viewer_names))
+        return shared_data
+    
+    def _precompute_scores(self, shared_data):
+        """Quality scores of the dashboard's top creators over the unmodified history"""
+        from content_quality_analyzer import ContentQualityAnalyzer
+        from data_manager import DataManager
+        
+        def build(shared):
+            creators = DataManager(None)._calculate_engagement_scores(shared.creators.copy(deep=False))
+            top_creators = creators.head(10)
+            return top_creators, ContentQualityAnalyzer().score_all(top_creators, shared.ledger.view())
+        
+        shared_data.derive("top_quality_scores", build)
+        return shared_data
+    
+    def _warm_up_figures(self, shared_data):
+        """Build and serialize one figure of each kind the dashboard draws first
+        
+        The first Plotly Express figure in a process pays for loading templates
+        and validators; this moves that cost off the first dashboard render.
+        """
+        def build(shared):
+            import plotly.express as px
+            
+            sample = pd.DataFrame({"Creator": ["a", "b"], "Points": [1, 2]})
+            px.pie(sample, values="Points", names="Creator", hole=0.4).to_json()
+            px.bar(sample, x="Creator", y="Points", text="Points").to_json()
+            return True
+        
+        shared_data.derive("figures", build)
+        return shared_data
+    
+    def _render_loading_screen(self, placeholder, done, label):
+        with placeholder.container():
+            st.markdown(self._get_loading_css(), unsafe_allow_html=True)
+            st.markdown(self._get_loading_html(done, label), unsafe_allow_html=True)
     
     def _get_loading_css(self):
         return """
@@ -66,6 +153,24 @@ class LoadingManager:
             font-weight: 500;
             letter-spacing: 0.5px;
         }
+        .loading-progress {
+            width: 280px;
+            height: 6px;
+            margin-top: 30px;
+            border-radius: 3px;
+            background: rgba(255, 255, 255, 0.15);
+            overflow: hidden;
+        }
+        .loading-progress-bar {
+            height: 100%;
+            background: linear-gradient(135deg, #FF0050, #00F2EA);
+            transition: width 0.3s ease;
+        }
+        .loading-stage {
+            margin-top: 12px;
+            font-size: 14px;
+            opacity: 0.7;
+        }
         @keyframes logoBounce {
             0%, 100% { transform: translateY(0px); }
             50% { transform: translateY(-15px); }
@@ -73,8 +178,10 @@ class LoadingManager:
         </style>
         """
     
-    def _get_loading_html(self):
-        return """
+    def _get_loading_html(self, done=0, label=None):
+        percent = round(100 * done / len(self.STAGES))
+        stage = f"{label}..." if label else "Ready"
+        return f"""
         <div class="loading-container">
             <div class="fairshare-logo">
                 <div class="logo-circle">
@@ -83,5 +190,7 @@ class LoadingManager:
             </div>
             <div class="loading-text">FairShare</div>
             <div class="loading-subtext">Check your impact. Claim your fair share.</div>
+            <div class="loading-progress"><div class="loading-progress-bar" style="width: {percent}%;"></div></div>
+            <div class="loading-stage">{stage}</div>
         </div>
         """
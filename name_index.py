@@ -0,0 +1,44 @@
+import copy
+
+
+class NameIndex:
+    """Hash index from a name column to row positions of one DataFrame
+
+    Built once per table object; matches() tells whether the table it was
+    built from is still the current one. Duplicate names resolve to their
+    first row, like `df[df[col] == name].iloc[0]`.
+    """
+
+    def __init__(self, frame, column):
+        self.frame = frame
+        self.column = column
+        names = frame[column].tolist()
+        # Reversed so the first occurrence of a duplicate name wins
+        self._positions = dict(zip(reversed(names), range(len(names) - 1, -1, -1)))
+
+    def rebind(self, frame):
+        """This index over another frame with the same rows (e.g. a shallow copy), in O(1)"""
+        index = copy.copy(self)
+        index.frame = frame
+        return index
+
+    def matches(self, frame):
+        """True if this index was built from this table object"""
+        return frame is self.frame
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def position(self, name):
+        """Row position of name, or None if it is not in the table"""
+        return self._positions.get(name)
+
+    def record(self, name):
+        """Row for name as a plain dict of column -> value, or None"""
+        position = self._positions.get(name)
+        if position is None:
+            return None
+        return self.frame.iloc[position].to_dict()
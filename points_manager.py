@@ -1,6 +1,8 @@
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from zoneinfo import ZoneInfo
+from latency_metrics import timed
+from transaction_ledger import TransactionLedger
+from velocity_index import VelocityIndex
 
 class PointsManager:
     def __init__(self, risk_manager):
@@ -11,8 +13,18 @@ class PointsManager:
         self.SUSPICIOUS_VALUE_PER_HOUR = 200000    # $2000+ per hour
         self.SUSPICIOUS_VALUE_PER_DAY = 1000000    # $10000+ per day
     
+    @timed("points.send_points")
     def send_points(self, viewer_name, creator_name, points, viewers, creators, transactions, user_risk_profiles):
-        """Send points from viewer to creator with fraud detection"""
+        """Send points from viewer to creator with fraud detection
+
+        `transactions` may be a TransactionLedger (appended in place) or a
+        DataFrame, which is wrapped in a new ledger first.
+        """
+        if isinstance(transactions, TransactionLedger):
+            ledger = transactions
+        else:
+            ledger = TransactionLedger.from_frame(transactions)
+        
         flagged = False
         reason = ""
         risk_level = "low"
@@ -32,44 +44,31 @@ class PointsManager:
             reason = f"Above suspicious threshold (${user_thresholds['suspicious'] * 0.01:.2f})"
             risk_level = "medium"
         
-        # Check for spam (too many gifts in 10 minutes)
-        recent_10min = transactions[
-            (transactions["viewer"] == viewer_name) &
-            (transactions["timestamp"] >= 
-             (datetime.now(ZoneInfo("Asia/Singapore")) - timedelta(minutes=10)).strftime("%Y-%m-%d %H:%M"))
-        ]
+        # Sliding-window totals for this viewer (amortized O(1), no history scans)
+        window_totals = ledger.ensure_index(VelocityIndex.NAME, VelocityIndex).totals(viewer_name)
+        count_10min, value_10min = window_totals["10min"]
         
-        if len(recent_10min) >= 50:  # 50+ gifts in 10 minutes is spam
+        # Check for spam (too many gifts in 10 minutes)
+        if count_10min >= 50:  # 50+ gifts in 10 minutes is spam
             flagged = True
-            reason = f"Spam detected: {len(recent_10min)} gifts in 10 minutes"
+            reason = f"Spam detected: {count_10min} gifts in 10 minutes"
             risk_level = "high"
         
         # Check total value in 10-minute window
-        total_value_10min = recent_10min["points"].sum() + points
+        total_value_10min = value_10min + points
         if total_value_10min >= self.SUSPICIOUS_VALUE_PER_10MIN:
             flagged = True
             reason = f"Suspicious value in 10 minutes (${total_value_10min * 0.01:.2f})"
             risk_level = "high"
         
         # Check hourly limit
-        recent_gifts = transactions[
-            (transactions["viewer"] == viewer_name) &
-            (transactions["timestamp"] >= 
-             (datetime.now(ZoneInfo("Asia/Singapore")) - timedelta(hours=1)).strftime("%Y-%m-%d %H:%M"))
-        ]
-        
-        if recent_gifts["points"].sum() + points > user_thresholds["hourly"]:
+        if window_totals["hour"][1] + points > user_thresholds["hourly"]:
             flagged = True
             reason = "Exceeds hourly limit"
             risk_level = "high"
         
         # Check daily limit
-        today_gifts = transactions[
-            (transactions["timestamp"].str.startswith(
-             datetime.now(ZoneInfo("Asia/Singapore")).strftime("%Y-%m-%d")))
-        ]
-        
-        if today_gifts["points"].sum() + points > user_thresholds["daily"]:
+        if window_totals["day"][1] + points > user_thresholds["daily"]:
             flagged = True
             reason = "Exceeds daily limit"
             risk_level = "high"
@@ -83,17 +82,17 @@ class PointsManager:
                 profile["last_gift_time"] = datetime.now(ZoneInfo("Asia/Singapore"))
         
         # Record transaction
-        new_tx = pd.DataFrame([{
-            "timestamp": datetime.now(ZoneInfo("Asia/Singapore")).strftime("%Y-%m-%d %H:%M"),
+        now = datetime.now(ZoneInfo("Asia/Singapore"))
+        ledger.append({
+            "timestamp": now.strftime("%Y-%m-%d %H:%M"),
+            "epoch": int(now.timestamp()),
             "viewer": viewer_name,
             "creator": creator_name,
             "points": points,
             "flagged": flagged,
             "reason": reason,
             "risk_level": risk_level
-        }])
-        
-        transactions = pd.concat([transactions, new_tx], ignore_index=True)
+        })
         
         return {
             "success": not flagged,
@@ -101,7 +100,7 @@ class PointsManager:
             "reason": reason,
             "risk_level": risk_level,
             "updated_creators": creators,
-            "updated_transactions": transactions
+            "updated_transactions": ledger.view()
         }
     
     def get_transaction_summary(self, transactions):
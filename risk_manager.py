@@ -1,9 +1,13 @@
 import random
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from viewer_limits import ViewerLimits
 
 class RiskManager:
-    def __init__(self):
+    def __init__(self, db_manager=None):
+        # Optional database manager whose name indexes serve viewer lookups
+        self.db_manager = db_manager
+        
         # Thresholds
         self.FRAUD_THRESHOLD = 50000  # $500 USD
         self.SUSPICIOUS_THRESHOLD = 20000  # $200 USD
@@ -26,6 +30,19 @@ class RiskManager:
             "verified": 1.0,    # Verified: 100% of normal limits
             "creator": 2.0      # Creator accounts: 200% of normal limits
         }
+        
+        # Map CSV account types to verification multiplier keys
+        self.VERIFICATION_MAPPING = {
+            "New": "unverified",
+            "new": "unverified",
+            "existing": "unverified",  # Add this line
+            "Verified": "verified", 
+            "verified": "verified",
+            "creator": "creator"
+        }
+        
+        # Bulk per-viewer limits, rebuilt only when the viewers table changes
+        self._viewer_limits = None
     
     def get_account_age_category(self, account_creation_date):
         """Calculate account age category"""
@@ -42,8 +59,8 @@ class RiskManager:
         """Calculate user risk profile"""
         if viewer_name not in user_risk_profiles:
             # Get viewer data from database
-            if viewer_name in viewers["Viewer"].values:
-                viewer_data = viewers[viewers["Viewer"] == viewer_name].iloc[0]
+            viewer_data = self.get_viewer_limits(viewers).names.record(viewer_name)
+            if viewer_data is not None:
                 account_type = viewer_data["Account_Type"]
                 total_gifts = viewer_data["Total_Gifts"]
                 trust_level = viewer_data["Trust_Level"]
@@ -76,36 +93,52 @@ class RiskManager:
         
         return user_risk_profiles[viewer_name]
     
+    def get_viewer_limits(self, viewers):
+        """AML limits for every viewer, cached until the viewers table changes"""
+        if self._viewer_limits is None or not self._viewer_limits.matches(viewers):
+            names = shared = None
+            if self.db_manager is not None and self.db_manager.viewers is viewers:
+                names = self.db_manager.viewer_index
+                shared = self.db_manager.shared_derived("viewer_limits")
+            if shared is not None:
+                # Limits the warm-up computed over the shared viewers this frame copies
+                self._viewer_limits = shared.rebind(viewers, names)
+            else:
+                self._viewer_limits = ViewerLimits(viewers, self, names)
+        return self._viewer_limits
+    
+    def combined_multiplier(self, account_age, verification_status):
+        """Average of the account age and verification multipliers"""
+        age_multiplier = self.ACCOUNT_AGE_MULTIPLIERS[account_age]
+        
+        # Use mapped value or default to "unverified"
+        mapped_verification = self.VERIFICATION_MAPPING.get(verification_status, "unverified")
+        verification_multiplier = self.VERIFICATION_MULTIPLIERS[mapped_verification]
+        
+        return (age_multiplier + verification_multiplier) / 2
+    
     def get_dynamic_thresholds(self, viewer_name, user_risk_profiles, viewers):
         """Get dynamic thresholds based on user trust level"""
         profile = self.calculate_user_risk_profile(viewer_name, user_risk_profiles, viewers)
+        account_age = self.get_account_age_category(profile["account_creation"])
         
-        # Get base multipliers
-        age_multiplier = self.ACCOUNT_AGE_MULTIPLIERS[self.get_account_age_category(profile["account_creation"])]
-        
-        # Map CSV account types to verification multiplier keys
-        verification_mapping = {
-            "New": "unverified",
-            "new": "unverified",
-            "existing": "unverified",  # Add this line
-            "Verified": "verified", 
-            "verified": "verified",
-            "creator": "creator"
-        }
-        
-        # Use mapped value or default to "unverified"
-        mapped_verification = verification_mapping.get(profile["verification_status"], "unverified")
-        verification_multiplier = self.VERIFICATION_MULTIPLIERS[mapped_verification]
+        # Known viewers whose profile agrees with the precomputed row read it directly
+        limits = self.get_viewer_limits(viewers)
+        row = limits.row(viewer_name)
+        if (row is not None
+                and limits.age_category[row] == account_age
+                and limits.verification[row] == profile["verification_status"]):
+            return limits.dynamic_thresholds(row)
         
         # Combined multiplier
-        combined_multiplier = (age_multiplier + verification_multiplier) / 2
+        combined_multiplier = self.combined_multiplier(account_age, profile["verification_status"])
         
         return {
             "suspicious": int(self.SUSPICIOUS_THRESHOLD * combined_multiplier),
             "fraud": int(self.FRAUD_THRESHOLD * combined_multiplier),
             "hourly": int(self.HOURLY_LIMIT * combined_multiplier),
             "daily": int(self.DAILY_LIMIT * combined_multiplier),
-            "account_age": self.get_account_age_category(profile["account_creation"]),
+            "account_age": account_age,
             "verification": profile["verification_status"],
             "combined_multiplier": combined_multiplier
         }
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import threading
+import streamlit as st
+from storage_backend import get_backend
+
+_hash_lock = threading.Lock()
+_hash_memo = {}  # path -> ((mtime_ns, size), sha256 hex digest)
+_warm_versions = set()  # Data versions whose startup warm-up has completed in this process
+
+
+class SharedData:
+    """Read-mostly data loaded once per process and shared by every session
+
+    Sessions must not mutate these objects directly; DatabaseManager gives each
+    session shallow copies of the tables and a copy-on-write fork of the ledger.
+    """
+
+    def __init__(self, creators, viewers, ledger, version):
+        self.creators = creators
+        self.viewers = viewers
+        self.ledger = ledger
+        self.version = version
+        self.derived = {}  # name -> data built once from these tables (indexes, scores)
+        self._derive_lock = threading.Lock()
+
+    def derive(self, name, build):
+        """Return derived data `name`, calling build(self) only the first time
+
+        Sessions asking concurrently wait for the first build instead of
+        repeating it.
+        """
+        with self._derive_lock:
+            if name not in self.derived:
+                self.derived[name] = build(self)
+            return self.derived[name]
+
+
+def file_version(path):
+    """Return the sha256 of a file, re-hashing only when its mtime or size changes"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _hash_lock:
+        memo = _hash_memo.get(path)
+        if memo is not None and memo[0] == key:
+            return memo[1]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    digest = digest.hexdigest()
+
+    with _hash_lock:
+        _hash_memo[path] = (key, digest)
+    return digest
+
+
+def data_version():
+    """Version key of the source files: the backend type plus each data file's hash
+
+    The source files are the storage backend's data files (the CSVs, or their
+    Arrow/Parquet conversions). A touched-but-unchanged file keeps the same
+    hash, so it does not trigger a reload.
+    """
+    backend = get_backend()
+    return (type(backend).__name__,) + tuple(file_version(path) for path in backend.data_files())
+
+
+def get_shared_data():
+    """Return the shared data for the current version of the source files"""
+    return _load_shared_data(data_version())
+
+
+def is_warm():
+    """True once the startup warm-up has run for the current data version"""
+    return data_version() in _warm_versions
+
+
+def mark_warm(shared_data):
+    """Record that the warm-up has run for shared_data's version"""
+    _warm_versions.add(shared_data.version)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_shared_data(version):
+    """Load tables and historical transactions once per data version"""
+    from database_manager import DatabaseManager
+    from anomaly_detector import AnomalyDetector
+    from creator_totals import CreatorPointTotals
+    from fund_flow_rollups import FundFlowRollups
+    from history_index import HistoryIndex
+    from velocity_index import VelocityIndex
+
+    db_manager = DatabaseManager(shared=False)
+
+    # Build the incremental indexes once so session forks start warm
+    db_manager.ledger.attach_index(CreatorPointTotals.NAME, CreatorPointTotals())
+    db_manager.ledger.attach_index(VelocityIndex.NAME, VelocityIndex())
+    # Shared with every session's fork, which only copies what its own sends touch
+    db_manager.ledger.attach_index(HistoryIndex.NAME, HistoryIndex())
+    db_manager.ledger.attach_index(FundFlowRollups.NAME, FundFlowRollups())
+    # Baselines learned from the history, so every session send is scored as it is written
+    db_manager.ledger.attach_index(AnomalyDetector.NAME, AnomalyDetector())
+
+    return SharedData(db_manager.creators, db_manager.viewers, db_manager.ledger, version)
@@ -1,7 +1,7 @@
 import streamlit as st
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import pandas as pd
+from latency_metrics import timed
 
 class SidebarManager:
     """Manages all sidebar functionality for the FairShare app"""
@@ -12,16 +12,25 @@ class SidebarManager:
         self.db_manager = db_manager
     
     def render_sidebar(self, creators, viewers, transactions, user_risk_profiles):
-        """Render the complete sidebar with all tools"""
-        self._render_creator_analysis_tool(creators)
-        self._render_send_points_tool(viewers, creators, transactions, user_risk_profiles)
+        """Render the complete sidebar with all tools
+        
+        The analysis and send-points tools are fragments: typing into them
+        reruns only that tool, not the dashboard. Only actions that change
+        what the dashboard shows (a completed send, a new analysis) trigger
+        a full rerun. They are called inside the sidebar and write to `st.*`,
+        since fragments may not write to `st.sidebar` directly.
+        """
+        with st.sidebar:
+            self._render_creator_analysis_tool(creators)
+            self._render_send_points_tool(viewers, creators, transactions, user_risk_profiles)
         self.render_debug_info(creators, viewers, transactions, user_risk_profiles)
     
+    @st.fragment
     def _render_creator_analysis_tool(self, creators):
         """Render the Creator Analysis Tool section"""
-        st.sidebar.header(" Compare with other creators! ")
+        st.header(" Compare with other creators! ")
         
-        with st.sidebar.expander("🔍 Creator Analysis Tool", expanded=False):
+        with st.expander("🔍 Creator Analysis Tool", expanded=False):
             st.write("**Analyze any creator's potential performance!**")
             
             # Input fields for analysis
@@ -38,24 +47,32 @@ class SidebarManager:
                     analysis_result = self.creator_analyzer.analyze_creator(
                         analyze_name, analyze_views, analyze_likes, analyze_shares, analyze_points,
                         comments=0, saves=0, video_duration=None, content_category=None, is_trending=False,
-                        creators_df=creators  # ADD THIS PARAMETER!
+                        creators_df=creators,  # ADD THIS PARAMETER!
+                        creators_version=self.db_manager.tables_version
                     )
                     
                     # Store analysis data
                     st.session_state.show_analysis = True
                     st.session_state.analysis_data = analysis_result
-                    st.rerun()
+                    st.rerun()  # Full rerun: the analysis is shown in the main area
                 else:
                     st.error("Please enter a creator name to analyze")
     
+    @st.fragment
     def _render_send_points_tool(self, viewers, creators, transactions, user_risk_profiles):
         """Render the Send Points to Creator section"""
-        st.sidebar.header("Send Points to Creator")
+        st.header("Send Points to Creator")
+        # Fragment reruns get the arguments of the last full run; the ledger view may be newer
+        transactions = st.session_state.get('transactions', transactions)
         
         # Send Points Tool
-        with st.sidebar.expander("💰 Send Points to Creators", expanded=False):
+        with st.expander("💰 Send Points to Creators", expanded=False):
             st.markdown("**Send points to support your favorite creators**")
             
+            # Outcome of the send that triggered this rerun
+            for kind, message in st.session_state.pop('send_points_messages', []):
+                getattr(st, kind)(message)
+            
             # Check if user is logged in
             if not st.session_state.get('user_logged_in', False):
                 st.warning("🔐 Please log in to send points to creators")
@@ -87,6 +104,7 @@ class SidebarManager:
                 # Top-up button
                 if st.button("💰 Top Up Points", key="topup_zero_points"):
                     st.session_state.show_points_shop = True
+                    st.rerun()  # Full rerun: the shop is shown in the main area
                 return
             
             # Normal points input when user has points - NO CAP AT ALL
@@ -119,28 +137,33 @@ class SidebarManager:
                     success, flagged, risk_level, reason = self.process_points_transaction(selected_creator, points_to_send, transactions, viewers)
                     
                     if success:
+                        # Deduct points from user's balance
+                        st.session_state.user_points -= points_to_send
                         if flagged:
-                            # Deduct points from user's balance
-                            st.session_state.user_points -= points_to_send
-                            
                             # Show different messages based on risk level
                             if risk_level == 'high':
-                                st.error(f"🚨 **HIGH RISK (Fraud - BLOCKED):** - {reason}")
-                                st.warning("🔒 This transaction has been blocked due to fraud risk.")
-                                st.info("💡 For high-risk transactions, please contact support or use a verified account.")
+                                messages = [
+                                    ("error", f"🚨 **HIGH RISK (Fraud - BLOCKED):** - {reason}"),
+                                    ("warning", "🔒 This transaction has been blocked due to fraud risk."),
+                                    ("info", "💡 For high-risk transactions, please contact support or use a verified account."),
+                                ]
                             elif risk_level == 'medium':
-                                st.warning(f"⚠️ **Suspicious Transaction - Under Review** - {reason}")
-                                st.info("🔍 This transaction is flagged for review but will proceed.")
-                                st.success("✅ Points sent successfully - transaction under monitoring.")
-                            
-                            st.success(f"✅ Transaction processed with AML protection!")
+                                messages = [
+                                    ("warning", f"⚠️ **Suspicious Transaction - Under Review** - {reason}"),
+                                    ("info", "🔍 This transaction is flagged for review but will proceed."),
+                                    ("success", "✅ Points sent successfully - transaction under monitoring."),
+                                ]
+                            else:
+                                messages = []
+                            messages.append(("success", "✅ Transaction processed with AML protection!"))
                         else:
                             # Normal transaction - no risk detected
-                            st.session_state.user_points -= points_to_send
-                            st.success("✅ Points sent successfully!")
+                            messages = [("success", "✅ Points sent successfully!")]
                         
-                        # REMOVE st.rerun() - it hides your messages!
-                        # st.rerun()
+                        # Keep the messages across the full rerun that refreshes the
+                        # dashboard panels reading transactions (the others stay cached)
+                        st.session_state.send_points_messages = messages
+                        st.rerun()
 
     def render_debug_info(self, creators, viewers, transactions, user_risk_profiles):
         """Render the Debug Information section"""
@@ -150,6 +173,13 @@ class SidebarManager:
             st.markdown("**Current User Profiles:**")
             st.dataframe(viewers.head())
         
+        # Show this session's cold-start timings
+        if st.session_state.get('show_startup_report', False) and st.session_state.get('startup_report'):
+            st.markdown("---")
+            st.markdown("**Startup Timings:**")
+            st.json(st.session_state.startup_report)
+        
+    @timed("points.process_points_transaction")
     def process_points_transaction(self, creator_name, points, transactions, viewers):
         """Process points transaction with dynamic AML detection from CSV"""
         try:
@@ -159,8 +189,10 @@ class SidebarManager:
             flagged, risk_level, reason = self._check_aml_thresholds(points, current_user, viewers)
             
             # Create new transaction with AML results
+            now = datetime.now(ZoneInfo("Asia/Singapore"))
             new_transaction = {
-                'timestamp': datetime.now(ZoneInfo("Asia/Singapore")).strftime("%Y-%m-%d %H:%M"),
+                'timestamp': now.strftime("%Y-%m-%d %H:%M"),
+                'epoch': int(now.timestamp()),
                 'viewer': current_user,
                 'creator': creator_name,
                 'points': points,
@@ -169,14 +201,9 @@ class SidebarManager:
                 'risk_level': risk_level
             }
             
-            # Convert to DataFrame
-            new_transaction_df = pd.DataFrame([new_transaction])
-            
-            # Update transactions in session state ONLY
-            if 'transactions' in st.session_state:
-                st.session_state.transactions = pd.concat([st.session_state.transactions, new_transaction_df], ignore_index=True)
-            else:
-                st.session_state.transactions = new_transaction_df
+            # Append to the session's ledger (amortized O(1)), persist it and publish the refreshed view
+            self.db_manager.record_transaction(new_transaction)
+            st.session_state.transactions = self.db_manager.ledger.view()
             
             return True, flagged, risk_level, reason
             
@@ -185,44 +212,13 @@ class SidebarManager:
             return False, False, 'low', None
     def _check_aml_thresholds(self, points, username=None, viewers_df=None):
         """Dynamic AML threshold check based on CSV user profile data"""
-        # Get user profile from CSV data
-        user_profile = None
+        # Limits for every viewer are computed in one pass and cached per viewers table
+        limits = None
         if username and viewers_df is not None:
-            user_row = viewers_df[viewers_df['Viewer'] == username]
-            if not user_row.empty:
-                user_profile = {
-                    'Account_Type': user_row.iloc[0]['Account_Type'],
-                    'Trust_Level': user_row.iloc[0]['Trust_Level'],
-                    'Account_Age_Days': user_row.iloc[0]['Account_Age_Days']
-                }
+            limits = self.points_manager.risk_manager.get_viewer_limits(viewers_df).aml_limits(username)
         
-        if user_profile:
-            # CORRECTED AML calculation with proper multipliers
-            base_limit = 10000  # Base limit for new users
-            
-            # Account Type Multiplier
-            if user_profile['Account_Type'].lower() == 'creator':
-                account_multiplier = 2.0  # Creators get 2x higher limits
-            elif user_profile['Account_Type'].lower() == 'verified':
-                account_multiplier = 1.5  # Verified users get 1.5x
-            else:  # new or regular
-                account_multiplier = 1.0
-            
-            # Trust Level Multiplier  
-            if user_profile['Trust_Level'].lower() == 'trusted':
-                trust_multiplier = 2.0  # Trusted users get 2x higher limits
-            elif user_profile['Trust_Level'].lower() == 'verified':
-                trust_multiplier = 1.5  # Verified users get 1.5x
-            else:  # new
-                trust_multiplier = 1.0
-            
-            # Account Age Multiplier (capped at 3x for very old accounts)
-            age_multiplier = min(3.0, max(0.5, user_profile['Account_Age_Days'] / 100))
-            
-            # Calculate final limits - FIXED LOGIC
-            total_multiplier = account_multiplier * trust_multiplier * age_multiplier
-            suspicious_limit = int(base_limit * 0.3 * total_multiplier)  # 30% of base
-            fraud_limit = int(base_limit * 0.6 * total_multiplier)      # 60% of base (HIGHER than suspicious)
+        if limits:
+            suspicious_limit, fraud_limit = limits
             
             # Check if transaction exceeds limits
             if points > fraud_limit:
@@ -240,50 +236,19 @@ class SidebarManager:
         st.markdown("---")
         st.markdown("🚨 **Your AML Limits**")
         
-        # Get user profile from CSV data
-        user_profile = None
-        if username and viewers_df is not None:
-            user_row = viewers_df[viewers_df['Viewer'] == username]
-            if not user_row.empty:
-                user_profile = {
-                    'Account_Type': user_row.iloc[0]['Account_Type'],
-                    'Trust_Level': user_row.iloc[0]['Trust_Level'],
-                    'Account_Age_Days': user_row.iloc[0]['Account_Age_Days']
-                }
+        # Get user profile and precomputed limits from CSV data
+        if not username or viewers_df is None:
+            return
+        viewer_limits = self.points_manager.risk_manager.get_viewer_limits(viewers_df)
+        user_row = viewer_limits.names.record(username)
         
-        if user_profile:
+        if user_row is not None:
             st.markdown(f"**Username:** {username}")
-            st.markdown(f"**Account Type:** {user_profile['Account_Type'].title()}")
-            st.markdown(f"**Trust Level:** {user_profile['Trust_Level'].title()}")
-            st.markdown(f"**Account Age:** {user_profile['Account_Age_Days']} days")
-            
-            # CORRECTED AML calculation with proper multipliers
-            base_limit = 10000  # Base limit for new users
-            
-            # Account Type Multiplier
-            if user_profile['Account_Type'].lower() == 'creator':
-                account_multiplier = 2.0  # Creators get 2x higher limits
-            elif user_profile['Account_Type'].lower() == 'verified':
-                account_multiplier = 1.5  # Verified users get 1.5x
-            else:  # new or regular
-                account_multiplier = 1.0
-            
-            # Trust Level Multiplier  
-            if user_profile['Trust_Level'].lower() == 'trusted':
-                trust_multiplier = 2.0  # Trusted users get 2x higher limits
-            elif user_profile['Trust_Level'].lower() == 'verified':
-                trust_multiplier = 1.5  # Verified users get 1.5x
-            else:  # new
-                trust_multiplier = 1.0
-            
-            # Account Age Multiplier (capped at 3x for very old accounts)
-            age_multiplier = min(3.0, max(0.5, user_profile['Account_Age_Days'] / 100))
-            
-            # Calculate final limits - FIXED LOGIC
-            total_multiplier = account_multiplier * trust_multiplier * age_multiplier
-            suspicious_limit = int(base_limit * 0.3 * total_multiplier)  # 30% of base
-            fraud_limit = int(base_limit * 0.6 * total_multiplier)      # 60% of base (HIGHER than suspicious)
+            st.markdown(f"**Account Type:** {user_row['Account_Type'].title()}")
+            st.markdown(f"**Trust Level:** {user_row['Trust_Level'].title()}")
+            st.markdown(f"**Account Age:** {user_row['Account_Age_Days']} days")
             
+            suspicious_limit, fraud_limit = viewer_limits.aml_limits(username)
             st.markdown(f"**Suspicious Limit:** {suspicious_limit:,} points")
             st.markdown(f"**Fraud Limit:** {fraud_limit:,} points")
 
@@ -0,0 +1,210 @@
+import atexit
+import sqlite3
+import threading
+import time
+import pandas as pd
+from csv_backend import CSVBackend
+from storage_backend import StorageBackend
+from transaction_ledger import TransactionLedger, to_epoch_seconds
+
+TRANSACTIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    viewer TEXT NOT NULL,
+    creator TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    flagged INTEGER NOT NULL DEFAULT 0,
+    risk_level TEXT,
+    reason TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_viewer_epoch ON transactions (viewer, epoch);
+CREATE INDEX IF NOT EXISTS idx_transactions_creator ON transactions (creator);
+CREATE INDEX IF NOT EXISTS idx_transactions_epoch ON transactions (epoch);
+"""
+
+# Name column of each table, indexed for the profile lookups
+TABLE_KEYS = {"creators": "Creator", "viewers": "Viewer"}
+
+# Persisted transaction columns, in ledger order
+TRANSACTION_FIELDS = ("timestamp", "epoch", "viewer", "creator", "points", "flagged", "risk_level", "reason")
+
+INSERT_TRANSACTION = (
+    f"INSERT INTO transactions ({', '.join(TRANSACTION_FIELDS)}) "
+    f"VALUES ({', '.join('?' for _ in TRANSACTION_FIELDS)})"
+)
+
+
+def _sql_type(series):
+    """SQLite column affinity for a pandas column"""
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    return "TEXT"
+
+
+class SQLiteBackend(StorageBackend):
+    """Embedded SQLite storage in WAL mode
+
+    Transactions are group-committed: appends are buffered and written in one
+    SQLite transaction once `batch_size` rows are pending or `commit_interval`
+    seconds have passed, so one gift never costs a file rewrite or its own
+    fsync. Lookups use fixed SQL strings, which sqlite3 keeps as prepared
+    statements in its per-connection cache; DatabaseManager falls back to
+    them for names its loaded tables do not hold (rows saved after they
+    were loaded, e.g. by another process). An empty database is seeded from
+    the CSVs on first load.
+    """
+
+    BATCH_SIZE = 64
+    COMMIT_INTERVAL = 0.5  # Seconds a buffered append may wait
+
+    def __init__(self, path, batch_size=BATCH_SIZE, commit_interval=COMMIT_INTERVAL, seed=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.seed = seed if seed is not None else CSVBackend()
+
+        self._lock = threading.RLock()
+        self._pending = []
+        self._last_commit = time.monotonic()
+        self._timer = None
+
+        # One connection shared by Streamlit's script threads, serialized by _lock
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, cached_statements=128
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(TRANSACTIONS_SCHEMA)
+        atexit.register(self.close)
+
+    # Tables
+
+    def data_files(self):
+        return self.seed.data_files()  # The database itself changes with every gift
+
+    def _has_table(self, table):
+        row = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+
+    def _write_table(self, table, frame):
+        """Replace a table with the contents of frame (caller holds the transaction)"""
+        columns = ", ".join(f'"{column}" {_sql_type(frame[column])}' for column in frame.columns)
+        self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self._conn.execute(f"CREATE TABLE {table} ({columns})")
+        self._conn.execute(f'CREATE INDEX idx_{table}_name ON {table} ("{TABLE_KEYS[table]}")')
+
+        # Native Python values with None for missing cells, as sqlite3 expects
+        rows = frame.astype(object).where(frame.notna(), None).to_numpy().tolist()
+        placeholders = ", ".join("?" for _ in frame.columns)
+        self._conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+    def load_tables(self):
+        with self._lock:
+            if not (self._has_table("creators") and self._has_table("viewers")):
+                creators, viewers = self.seed.load_tables()
+                if creators is None or viewers is None:
+                    return creators, viewers
+                self.save_tables(creators, viewers)
+
+            creators = pd.read_sql_query("SELECT * FROM creators ORDER BY rowid", self._conn)
+            viewers = pd.read_sql_query("SELECT * FROM viewers ORDER BY rowid", self._conn)
+        return creators, viewers
+
+    def save_tables(self, creators, viewers):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._write_table("creators", creators)
+                self._write_table("viewers", viewers)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # Transactions
+
+    def load_transactions(self):
+        with self._lock:
+            self._flush_locked()
+            frame = pd.read_sql_query(
+                f"SELECT {', '.join(TRANSACTION_FIELDS)} FROM transactions ORDER BY id", self._conn
+            )
+        frame["flagged"] = frame["flagged"].astype(bool)
+        return frame.reindex(columns=list(TransactionLedger.COLUMNS))
+
+    def append_transaction(self, transaction):
+        epoch = transaction.get("epoch")
+        if epoch is None:
+            epoch = int(to_epoch_seconds([transaction["timestamp"]])[0])
+        row = (
+            transaction["timestamp"],
+            int(epoch),
+            transaction["viewer"],
+            transaction["creator"],
+            int(transaction["points"]),
+            int(bool(transaction.get("flagged", False))),
+            transaction.get("risk_level"),
+            transaction.get("reason") or "",
+        )
+
+        with self._lock:
+            self._pending.append(row)
+            idle = time.monotonic() - self._last_commit >= self.commit_interval
+            if len(self._pending) >= self.batch_size or idle:
+                self._flush_locked()
+            elif self._timer is None:
+                # Commit the rest of this group even if no further appends arrive
+                self._timer = threading.Timer(self.commit_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(INSERT_TRANSACTION, self._pending)
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        self._pending = []
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
+
+    # Prepared lookups
+
+    def _fetch_record(self, sql, params):
+        cursor = self._conn.execute(sql, params)
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip((column[0] for column in cursor.description), row))
+
+    def lookup_viewer(self, name):
+        with self._lock:
+            return self._fetch_record('SELECT * FROM viewers WHERE "Viewer" = ? ORDER BY rowid LIMIT 1', (name,))
+
+    def lookup_creator(self, name):
+        with self._lock:
+            return self._fetch_record('SELECT * FROM creators WHERE "Creator" = ? ORDER BY rowid LIMIT 1', (name,))
@@ -0,0 +1,115 @@
+"""Cold-start timing for app.py
+
+In the app, a StartupProfiler times each initialization step of a session's
+first run and writes the report to st.session_state.startup_report (and,
+when $FAIRSHARE_STARTUP_REPORT names a file, appends it there as a JSON line).
+
+From the command line it measures per-module import times in a fresh
+interpreter, for tracking release to release:
+
+    python startup_profiler.py --json startup.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+REPORT_ENV = "FAIRSHARE_STARTUP_REPORT"  # JSON-lines file each session's report is appended to
+
+# Modules app.py imports at startup, in import order
+APP_MODULES = (
+    "streamlit", "database_manager", "risk_manager", "creator_analyzer", "points_manager",
+    "dashboard_manager", "loading_manager", "ui_manager", "sidebar_manager", "data_manager",
+    "user_auth", "points_shop",
+)
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+class StartupProfiler:
+    """Wall-clock timings of the steps of one session's first run"""
+
+    def __init__(self):
+        self.steps = {}  # label -> seconds, in run order
+        self.started = time.perf_counter()
+        self.finished = False
+
+    @contextmanager
+    def step(self, label):
+        """Time the enclosed block as `label` (repeated labels accumulate)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[label] = self.steps.get(label, 0.0) + time.perf_counter() - started
+
+    def add_steps(self, timings, prefix=""):
+        """Record timings measured elsewhere, e.g. the loading screen's stages"""
+        for label, seconds in timings.items():
+            self.steps[f"{prefix}{label}"] = seconds
+
+    def report(self):
+        """Timings in milliseconds, with the total since the profiler was created"""
+        return {
+            "created": datetime.now(ZoneInfo("Asia/Singapore")).strftime("%Y-%m-%d %H:%M:%S"),
+            "steps_ms": {label: round(seconds * 1000, 2) for label, seconds in self.steps.items()},
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+        }
+
+    def finish(self, path=None):
+        """Build the report once, appending it to `path` (default $FAIRSHARE_STARTUP_REPORT)"""
+        if self.finished:
+            return None
+        self.finished = True
+        report = self.report()
+        path = path or os.environ.get(REPORT_ENV)
+        if path:
+            with open(path, "a") as handle:
+                handle.write(json.dumps(report) + "\n")
+        return report
+
+
+def measure_imports(modules=APP_MODULES, python=sys.executable):
+    """Cumulative import time of each module in a fresh interpreter, in milliseconds
+
+    Modules are imported in order, so each one is charged only for what the
+    ones before it did not already load. Uses `python -X importtime`.
+    """
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", "; ".join(f"import {name}" for name in modules)],
+        capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # Top-level entries are the ones imported directly by the -c statement
+        if match and len(match.group(3)) == 1 and match.group(4) in modules:
+            timings[match.group(4)] = round(int(match.group(2)) / 1000, 2)
+    return {name: timings.get(name, 0.0) for name in modules}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure FairShare's per-module cold-start import times")
+    parser.add_argument("--modules", nargs="+", default=list(APP_MODULES))
+    parser.add_argument("--json", help="Write the timings to this file")
+    args = parser.parse_args()
+
+    timings = measure_imports(args.modules)
+    for name, milliseconds in timings.items():
+        print(f"{name:<20} {milliseconds:>9.1f}ms")
+    print(f"{'total':<20} {sum(timings.values()):>9.1f}ms")
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"imports_ms": timings, "total_ms": round(sum(timings.values()), 2)}, handle, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
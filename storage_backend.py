@@ -0,0 +1,102 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+
+# Backend selected when DatabaseManager is not given one explicitly
+STORAGE_ENV = "FAIRSHARE_STORAGE"    # "auto" (default), "csv", "arrow" or "sqlite"
+DB_PATH_ENV = "FAIRSHARE_DB_PATH"    # SQLite database file
+DEFAULT_DB_PATH = "fairshare.db"
+
+# Columnar tables looked for next to the CSVs, in order of preference
+CREATORS_COLUMNAR_FILES = ("tiktok_creators.arrow", "tiktok_creators.parquet")
+VIEWERS_COLUMNAR_FILES = ("tiktok_viewers.arrow", "tiktok_viewers.parquet")
+
+_backend_lock = threading.Lock()
+_backends = {}  # (kind, path) -> backend shared by every session in the process
+
+
+class StorageBackend(ABC):
+    """Where DatabaseManager keeps creators, viewers and transactions
+
+    Implementations load and save the two tables as DataFrames and persist
+    transactions one at a time as they are made.
+    """
+
+    @abstractmethod
+    def load_tables(self):
+        """Return (creators, viewers) DataFrames; either is None if missing"""
+
+    @abstractmethod
+    def save_tables(self, creators, viewers):
+        """Persist both tables"""
+
+    @abstractmethod
+    def load_transactions(self):
+        """Persisted transactions as a DataFrame in ledger columns (may be empty)"""
+
+    @abstractmethod
+    def append_transaction(self, transaction):
+        """Persist one transaction dict (may be buffered until flush())"""
+
+    def data_files(self):
+        """Files whose content versions the shared table cache"""
+        return ()
+
+    def lookup_viewer(self, name):
+        """Persisted viewer row as a dict, or None
+
+        Backends with indexed storage answer with a point query; file-based
+        ones have nothing newer than the loaded table and return None.
+        """
+        return None
+
+    def lookup_creator(self, name):
+        """Persisted creator row as a dict, or None (see lookup_viewer)"""
+        return None
+
+    def flush(self):
+        """Make buffered writes durable"""
+
+    def close(self):
+        """Flush and release resources"""
+        self.flush()
+
+
+def find_columnar_files():
+    """(creators_path, viewers_path) of existing columnar tables, or None"""
+    creators = next((path for path in CREATORS_COLUMNAR_FILES if os.path.exists(path)), None)
+    viewers = next((path for path in VIEWERS_COLUMNAR_FILES if os.path.exists(path)), None)
+    if creators is None or viewers is None:
+        return None
+    return creators, viewers
+
+
+def detect_backend():
+    """'arrow' when converted columnar tables exist next to the CSVs, else 'csv'"""
+    return "arrow" if find_columnar_files() is not None else "csv"
+
+
+def get_backend(kind=None, path=None):
+    """Return the process-wide backend for `kind`, defaulting to $FAIRSHARE_STORAGE"""
+    kind = (kind or os.environ.get(STORAGE_ENV, "auto")).lower()
+    if kind == "auto":
+        kind = detect_backend()
+    if kind == "sqlite":
+        path = path or os.environ.get(DB_PATH_ENV, DEFAULT_DB_PATH)
+
+    with _backend_lock:
+        backend = _backends.get((kind, path))
+        if backend is None:
+            if kind == "csv":
+                from csv_backend import CSVBackend
+                backend = CSVBackend()
+            elif kind == "arrow":
+                from arrow_backend import ArrowBackend
+                backend = ArrowBackend()
+            elif kind == "sqlite":
+                from sqlite_backend import SQLiteBackend
+                backend = SQLiteBackend(path)
+            else:
+                raise ValueError(f"Unknown storage backend: {kind}")
+            _backends[(kind, path)] = backend
+        return backend
@@ -1,13 +1,20 @@
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import streamlit as st
 import random
+import latency_metrics
+from transaction_ledger import transaction_epochs
 
 class SystemMonitor:
     """Monitors system health, fund safety, and performance metrics"""
     
+    # Fund flow window label -> hours
+    FUND_FLOW_WINDOWS = {"1h": 1, "24h": 24, "7d": 168}
+    
+    MAX_ALERT_HISTORY = 500  # Oldest alerts are dropped beyond this
+    RECENT_ALERTS = 10       # Alerts included in the performance report
+    
     def __init__(self):
         # System health thresholds
         self.TRANSACTION_SUCCESS_THRESHOLD = 95.0  # 95% success rate required
@@ -39,9 +46,8 @@ class SystemMonitor:
         risk_score = max(0, min(100, risk_score + (time_factor * 0.5)))
         health_factors.append(('Risk Management', risk_score, 0.3))
         
-        # 3. System Performance (20% weight) - varies with time
-        performance_score = self._calculate_performance_score(transactions)
-        performance_score = max(0, min(100, performance_score + random.uniform(-3, 3)))
+        # 3. System Performance (20% weight) - measured response times
+        performance_score = self._calculate_performance_score()
         health_factors.append(('Performance', performance_score, 0.2))
         
         # 4. Fund Safety (10% weight) - varies slightly
@@ -96,27 +102,28 @@ class SystemMonitor:
         
         return risk_score
     
-    def _calculate_performance_score(self, transactions):
-        """Calculate system performance score"""
-        if transactions.empty:
+    def _calculate_performance_score(self, latencies=None):
+        """Calculate system performance score from measured response times
+        
+        Uses the worst p95 latency among the instrumented operations (every
+        latency_metrics histogram except data loading): 100 up to a quarter of
+        RESPONSE_TIME_THRESHOLD, 60 at the threshold and 0 at twice it.
+        """
+        if latencies is None:
+            latencies = latency_metrics.summaries()
+        
+        p95s = [summary['p95_ms'] / 1000 for name, summary in latencies.items()
+                if summary['count'] and not name.startswith("data.")]
+        if not p95s:
+            return 100.0  # Nothing measured yet
+        
+        worst = max(p95s)
+        target = self.RESPONSE_TIME_THRESHOLD / 4
+        if worst <= target:
             return 100.0
-        
-        # Simulate performance metrics (in real app, these would come from system logs)
-        # For now, we'll use transaction volume as a proxy for system load
-        
-        total_transactions = len(transactions)
-        
-        # Performance scoring: Optimal range is 100-1000 transactions
-        if total_transactions < 100:
-            performance_score = 80  # Low volume, system underutilized
-        elif total_transactions <= 1000:
-            performance_score = 100  # Optimal range
-        elif total_transactions <= 5000:
-            performance_score = 90  # High volume, good performance
-        else:
-            performance_score = 70  # Very high volume, potential stress
-        
-        return performance_score
+        if worst <= self.RESPONSE_TIME_THRESHOLD:
+            return 100 - 40 * (worst - target) / (self.RESPONSE_TIME_THRESHOLD - target)
+        return max(0.0, 60 - 60 * (worst - self.RESPONSE_TIME_THRESHOLD) / self.RESPONSE_TIME_THRESHOLD)
     
     def _calculate_fund_safety_score(self, transactions):
         """Calculate fund safety score based on flagged transactions - MINIMUM 95%"""
@@ -180,33 +187,34 @@ class SystemMonitor:
         
         return recommendations
     
-    def track_fund_flow(self, transactions, time_window_hours=24):
-        """Track fund flow and detect anomalies"""
+    def track_fund_flow(self, transactions, time_window_hours=24, rollups=None):
+        """Track fund flow and detect anomalies
+        
+        With `rollups` (the ledger's FundFlowRollups) the window is summed from
+        minute, hour and day buckets instead of scanning `transactions`.
+        """
         if transactions.empty:
             return {"status": "No transactions", "anomalies": []}
         
-        # Calculate recent transactions - FIXED timezone issue
+        # Calculate recent transactions from the epoch column parsed at ingest
         now = datetime.now(ZoneInfo("Asia/Singapore"))
-        time_threshold = now - timedelta(hours=time_window_hours)
-        
-        # Convert to timezone-naive datetime for comparison
-        time_threshold_naive = time_threshold.replace(tzinfo=None)
-        
-        # Convert timestamp column to datetime and make timezone-naive
-        transactions_copy = transactions.copy()
-        transactions_copy['timestamp'] = pd.to_datetime(transactions_copy['timestamp'])
-        
-        # Make timestamps timezone-naive for comparison
-        transactions_copy['timestamp'] = transactions_copy['timestamp'].dt.tz_localize(None)
-        
-        recent_transactions = transactions_copy[
-            transactions_copy['timestamp'] >= time_threshold_naive
-        ]
-        
-        # Fund flow analysis
-        total_flow = recent_transactions['points'].sum()
-        avg_transaction_size = recent_transactions['points'].mean()
-        transaction_count = len(recent_transactions)
+        if rollups is not None:
+            flow = rollups.window(time_window_hours * 3600, now=now.timestamp())
+            total_flow = flow['total']
+            transaction_count = flow['count']
+            avg_transaction_size = total_flow / transaction_count if transaction_count else float('nan')
+            max_transaction = flow['max']
+            flagged_flow = flow['flagged_total']
+        else:
+            time_threshold = int((now - timedelta(hours=time_window_hours)).timestamp())
+            recent_transactions = transactions[transaction_epochs(transactions) >= time_threshold]
+            
+            # Fund flow analysis
+            total_flow = recent_transactions['points'].sum()
+            avg_transaction_size = recent_transactions['points'].mean()
+            transaction_count = len(recent_transactions)
+            max_transaction = recent_transactions['points'].max() if transaction_count else 0
+            flagged_flow = recent_transactions.loc[recent_transactions['flagged'], 'points'].sum()
         
         # NEW: Realistic demo mode with gradual increases
         if transaction_count <= 1:  # If very few recent transactions
@@ -264,9 +272,20 @@ class SystemMonitor:
             "total_flow": total_flow,
             "avg_transaction_size": avg_transaction_size,
             "transaction_count": transaction_count,
+            "max_transaction": max_transaction,
+            "flagged_flow": flagged_flow,
+            "time_window_hours": time_window_hours,
             "anomalies": anomalies
         }
     
+    def collect_alerts(self, detector):
+        """Move the alerts raised by an AnomalyDetector since the last call into alert_history"""
+        alerts = detector.pop_alerts()
+        if alerts:
+            self.alert_history.extend(alerts)
+            del self.alert_history[:-self.MAX_ALERT_HISTORY]
+        return alerts
+    
     def refresh_demo_state(self):
         """Refresh demo state to trigger new growth cycle"""
         if hasattr(self, 'demo_state'):
@@ -276,15 +295,19 @@ class SystemMonitor:
             self.demo_state['last_refresh'] = datetime.now()
             self.demo_state['refresh_count'] += 1
             
-    def generate_performance_report(self, transactions, creators):
+    def generate_performance_report(self, transactions, creators, time_window_hours=24, rollups=None, detector=None):
         """Generate comprehensive performance report"""
         health_data = self.calculate_system_health_score(transactions, creators)
-        fund_flow_data = self.track_fund_flow(transactions)
+        fund_flow_data = self.track_fund_flow(transactions, time_window_hours, rollups)
+        if detector is not None:
+            self.collect_alerts(detector)
         
         return {
             "timestamp": datetime.now(ZoneInfo("Asia/Singapore")).strftime("%Y-%m-%d %H:%M:%S"),
             "system_health": health_data,
             "fund_flow": fund_flow_data,
+            "alerts": self.alert_history[-self.RECENT_ALERTS:],
+            "latency": latency_metrics.summaries(),
             "summary": self._generate_summary(health_data, fund_flow_data)
         }
     
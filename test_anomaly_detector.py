@@ -0,0 +1,58 @@
+from anomaly_detector import AnomalyDetector
+from transaction_ledger import TransactionLedger
+import numpy as np
+
+def test_anomaly_detector():
+    """Test batch-built baselines against one-by-one updates, and alerts on a spike"""
+    rng = np.random.default_rng(5)
+    count = 3000
+    transactions = {
+        "epoch": rng.integers(0, 100000, count),
+        "viewer": rng.choice(np.array([f"viewer_{i}" for i in range(40)], dtype=object), count),
+        "creator": rng.choice(np.array([f"creator_{i}" for i in range(5)], dtype=object), count),
+        "points": rng.integers(50, 150, count),
+        "flagged": np.zeros(count, dtype=bool),
+    }
+    ledger = TransactionLedger()
+    ledger.extend({column: values[:2000] for column, values in transactions.items()})
+    detector = ledger.attach_index(AnomalyDetector.NAME, AnomalyDetector())
+    ledger.extend({column: values[2000:] for column, values in transactions.items()})
+
+    # The same rows observed one at a time, in time order
+    expected = AnomalyDetector()
+    for batch in (slice(0, 2000), slice(2000, count)):
+        order = np.argsort(transactions["epoch"][batch], kind="stable")
+        for field in AnomalyDetector.FIELDS:
+            for name, amount in zip(transactions[field][batch][order], transactions["points"][batch][order].tolist()):
+                expected.observe(field, name, amount)
+    for field, names in (("viewer", ["viewer_0", "viewer_39"]), ("creator", ["creator_3"])):
+        for name in names:
+            assert np.allclose(detector.baseline(field, name), expected.baseline(field, name))
+    assert detector.pop_alerts() == []
+
+    # Live sends are scored against the baselines: a regular amount passes, a spike alerts
+    ledger.append({"epoch": 100001, "viewer": "viewer_0", "creator": "creator_3", "points": 100, "flagged": False})
+    assert detector.pop_alerts() == []
+    ledger.append({"epoch": 100002, "viewer": "viewer_0", "creator": "creator_3", "points": 5000, "flagged": False})
+    alerts = detector.pop_alerts()
+    assert [(alert["entity"], alert["name"], alert["points"]) for alert in alerts] == [
+        ("viewer", "viewer_0", 5000), ("creator", "creator_3", 5000)]
+    assert all(alert["z_score"] >= AnomalyDetector.Z_THRESHOLD for alert in alerts)
+    assert detector.pop_alerts() == []
+
+    # Entities with too little history are not scored
+    for amount in (100, 100, 5000):
+        ledger.append({"epoch": 100003, "viewer": "viewer_new", "creator": "creator_3", "points": amount, "flagged": False})
+    assert [alert["entity"] for alert in detector.pop_alerts()] == ["creator"]
+
+    # Ledger forks share the baselines and keep their own updates private
+    baseline = detector.baseline("viewer", "viewer_1")
+    forked = ledger.fork()
+    forked_detector = forked.get_index(AnomalyDetector.NAME)
+    assert forked_detector is not detector
+    assert forked_detector.baseline("viewer", "viewer_1") == baseline
+    forked.append({"epoch": 100004, "viewer": "viewer_1", "creator": "creator_3", "points": 9000, "flagged": False})
+    assert [alert["name"] for alert in forked_detector.pop_alerts()] == ["viewer_1", "creator_3"]
+    assert forked_detector.baseline("viewer", "viewer_1")[0] > baseline[0]
+    assert detector.baseline("viewer", "viewer_1") == baseline
+    assert detector.pop_alerts() == []
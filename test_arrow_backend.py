@@ -0,0 +1,40 @@
+from arrow_backend import ArrowBackend, CREATORS_SCHEMA, convert_csv, detect_format, read_table
+from csv_backend import CSVBackend
+from storage_backend import STORAGE_ENV, get_backend
+import os
+import shutil
+import pandas as pd
+
+def test_arrow_backend(tmp_path, monkeypatch):
+    """Test CSV conversion, format detection and that columnar loads match the CSV backend"""
+    for name in ("tiktok_creators.csv", "tiktok_viewers.csv"):
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(STORAGE_ENV, raising=False)
+
+    csv_creators, csv_viewers = CSVBackend().load_tables()
+    assert detect_format("tiktok_creators.csv") == "csv"
+    assert get_backend().__class__ is CSVBackend  # Nothing converted yet
+
+    for file_format in ("parquet", "arrow"):
+        creators_path, viewers_path = convert_csv(file_format=file_format)
+        assert (creators_path, viewers_path) == (f"tiktok_creators.{file_format}", f"tiktok_viewers.{file_format}")
+        assert detect_format(creators_path) == detect_format(viewers_path) == file_format
+        assert read_table(creators_path).schema.field("Views").type == CREATORS_SCHEMA.field("Views").type
+
+        creators, viewers = ArrowBackend(creators_path, viewers_path).load_tables()
+        pd.testing.assert_frame_equal(creators, csv_creators)
+        pd.testing.assert_frame_equal(viewers, csv_viewers)
+
+    # Converted tables next to the CSVs switch the default backend, preferring Arrow IPC
+    backend = get_backend()
+    assert isinstance(backend, ArrowBackend)
+    assert backend.data_files() == ("tiktok_creators.arrow", "tiktok_viewers.arrow")
+    creators, _ = backend.load_tables()
+    pd.testing.assert_frame_equal(creators, csv_creators)
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    import pytest
+    with tempfile.TemporaryDirectory() as directory, pytest.MonkeyPatch.context() as monkeypatch:
+        test_arrow_backend(pathlib.Path(directory), monkeypatch)
@@ -0,0 +1,21 @@
+from benchmarks import BENCHMARKS, compare_results, run_benchmarks
+
+def test_benchmarks():
+    """Test that every benchmark runs and that slow medians are reported as regressions"""
+    results = run_benchmarks([200], repeats=1)
+    assert [entry["benchmark"] for entry in results] == list(BENCHMARKS)
+    assert all(entry["median_us"] > 0 for entry in results)
+
+    baseline = {"results": [
+        {"benchmark": "send_points", "size": 200, "median_us": 100.0},
+        {"benchmark": "analyze_creator", "size": 200, "median_us": 100.0},
+    ]}
+    current = [
+        {"benchmark": "send_points", "size": 200, "median_us": 115.0},
+        {"benchmark": "analyze_creator", "size": 200, "median_us": 130.0},
+        {"benchmark": "creator_points", "size": 200, "median_us": 50.0},  # Not in the baseline
+    ]
+    comparisons = compare_results(current, baseline, threshold=0.2)
+    assert [(entry["benchmark"], entry["regressed"]) for entry in comparisons] == [
+        ("send_points", False), ("analyze_creator", True)
+    ]
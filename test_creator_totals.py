@@ -0,0 +1,30 @@
+from creator_totals import CreatorPointTotals
+from transaction_ledger import TransactionLedger
+
+def test_creator_totals():
+    """Test running totals against a regroup, and copy-on-write forks"""
+    ledger = TransactionLedger()
+    ledger.extend({
+        "epoch": [0, 60, 120],
+        "viewer": ["viewer_1", "viewer_2", "viewer_1"],
+        "creator": ["creator_1", "creator_2", "creator_1"],
+        "points": [100, 20, 5],
+    })
+    totals = ledger.attach_index(CreatorPointTotals.NAME, CreatorPointTotals())
+    ledger.append({"epoch": 180, "viewer": "viewer_3", "creator": "creator_3", "points": 1})
+    expected = ledger.view().groupby("creator")["points"].sum().to_dict()
+    assert totals.totals().to_dict() == expected
+    assert totals.get("creator_1") == 105 and totals.get("unknown") == 0
+
+    # A fork reuses the cached Series until its first write, which stays out of the parent
+    forked = ledger.fork()
+    forked_totals = forked.get_index(CreatorPointTotals.NAME)
+    assert forked_totals.totals() is totals.totals()
+    forked.append({"epoch": 240, "viewer": "viewer_1", "creator": "creator_1", "points": 50})
+    assert forked_totals.get("creator_1") == 155
+    assert forked_totals.totals().to_dict() == {**expected, "creator_1": 155}
+    assert totals.get("creator_1") == 105
+    assert totals.totals().to_dict() == expected
+
+if __name__ == "__main__":
+    test_creator_totals()
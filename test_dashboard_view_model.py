@@ -0,0 +1,76 @@
+from dashboard_view_model import DashboardViewModel, newest_first
+from database_manager import DatabaseManager
+from transaction_ledger import TransactionLedger
+import numpy as np
+import pandas as pd
+import time
+
+def test_dashboard_view_model(monkeypatch):
+    """Test panel data and its memoization on the ledger and table versions"""
+    creators = pd.DataFrame({
+        "Creator": [f"creator_{i}" for i in range(20)],
+        "Views": np.arange(20) * 1000,
+        "Likes": np.arange(20) * 100,
+        "Shares": np.arange(20) * 10,
+        "Points": np.arange(20),
+        "Engagement Score": np.arange(20) * 3.0,
+        "Fair Reward %": np.full(20, 5.0),
+    })
+    ledger = TransactionLedger()
+    ledger.extend(pd.DataFrame({
+        "timestamp": [f"2025-08-28 10:{i:02d}" for i in range(30)],
+        "viewer": [f"viewer_{i % 3}" for i in range(30)],
+        "creator": [f"creator_{i % 5}" for i in range(30)],
+        "points": np.full(30, 100),
+        "flagged": [i % 10 == 0 for i in range(30)],
+    }))
+    db_manager = DatabaseManager.from_tables(creators, pd.DataFrame({"Viewer": []}), ledger)
+    view_model = DashboardViewModel(db_manager)
+    transactions = db_manager.transactions
+
+    # Newest first, ties keep the later row first, with or without a limit
+    epochs = np.random.default_rng(0).integers(0, 5, 50)
+    assert (newest_first(epochs, 7) == np.argsort(epochs, kind="stable")[::-1][:7]).all()
+
+    recent = view_model.recent_transactions(transactions)
+    assert len(recent) == DashboardViewModel.RECENT_TRANSACTIONS
+    assert list(recent.index) == list(range(1, 21))
+    assert recent.iloc[0]["Time (SGT)"] == "2025-08-28 10:29"
+    assert view_model.transaction_counts(transactions) == {"total": 30, "clean": 27, "flagged": 3}
+
+    top = view_model.top_engagement(creators)
+    assert list(top["Creator"]) == [f"creator_{i}" for i in range(19, 9, -1)]
+    leaderboard = view_model.leaderboard(creators, transactions)
+    assert leaderboard.iloc[0]["Creator"] == "creator_4" and leaderboard.iloc[0]["Points"] == 604
+
+    # Unchanged tables reuse the cached panels
+    assert view_model.recent_transactions(db_manager.transactions) is recent
+    assert view_model.leaderboard(creators, db_manager.transactions) is leaderboard
+
+    # A write bumps the ledger version: only panels reading transactions are recomputed
+    ledger.append({"timestamp": "2025-08-28 11:00", "viewer": "viewer_9", "creator": "creator_19",
+                   "points": 100, "flagged": False})
+    transactions = db_manager.transactions
+    assert view_model.recent_transactions(transactions).iloc[0]["Viewer"] == "viewer_9"
+    assert view_model.leaderboard(creators, transactions) is not leaderboard
+    assert view_model.top_engagement(creators) is top
+
+    # Replacing the tables bumps their version
+    db_manager.tables_version += 1
+    assert view_model.top_engagement(creators) is not top
+
+    # The performance report also expires when the minute changes
+    monitor = view_model.system_monitor()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    report = view_model.performance_report(monitor, creators, transactions)
+    assert view_model.performance_report(monitor, creators, transactions)["fund_flow"] is report["fund_flow"]
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    assert view_model.performance_report(monitor, creators, transactions)["fund_flow"] is not report["fund_flow"]
+
+    # Alerts from live sends reach the monitor's history on every rerun, without the report
+    view_model.collect_alerts()
+    ledger.append({"timestamp": "2025-08-28 11:01", "viewer": "viewer_0", "creator": "creator_0",
+                   "points": 100000, "flagged": False})
+    assert [alert["name"] for alert in view_model.collect_alerts()] == ["viewer_0", "creator_0"]
+    assert monitor.alert_history[-2:] == view_model.performance_report(monitor, creators, db_manager.transactions)["alerts"]
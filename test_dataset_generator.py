@@ -0,0 +1,67 @@
+from dataset_generator import MIN_SUSPICIOUS_LIMIT, MAX_FRAUD_LIMIT, VELOCITY_RULES, generate
+from arrow_backend import read_table
+from risk_manager import RiskManager
+from transaction_ledger import SGT_OFFSET_SECONDS, TransactionLedger
+from viewer_limits import ViewerLimits
+import os
+import numpy as np
+import pandas as pd
+
+def test_dataset_generator(tmp_path):
+    """Test schemas against the shipped CSVs, seed determinism, time order, fraud and velocity labels"""
+    options = dict(creators=300, viewers=500, transactions=20000, chunk_size=7000,
+                   formats=("csv", "arrow"), days=5, end="2025-08-30 12:00", fraud_rate=0.05)
+    generate(str(tmp_path / "first"), seed=1, **options)
+    generate(str(tmp_path / "again"), seed=1, **options)
+    generate(str(tmp_path / "other"), seed=2, **options)
+
+    # Same columns and dtypes as the shipped tables
+    here = os.path.dirname(os.path.abspath(__file__))
+    for stem in ("tiktok_creators", "tiktok_viewers"):
+        shipped = pd.read_csv(os.path.join(here, f"{stem}.csv"))
+        generated = pd.read_csv(tmp_path / "first" / f"{stem}.csv")
+        assert list(generated.columns) == list(shipped.columns)
+        assert generated.dtypes.equals(shipped.dtypes)
+    transactions = pd.read_csv(tmp_path / "first" / "tiktok_transactions.csv")
+    assert list(transactions.columns) == list(TransactionLedger.COLUMNS)
+    assert len(transactions) == 20000
+
+    # The same seed reproduces every file; another seed does not
+    for stem in ("tiktok_creators", "tiktok_viewers", "tiktok_transactions"):
+        first = read_table(str(tmp_path / "first" / f"{stem}.arrow"))
+        assert first.equals(read_table(str(tmp_path / "again" / f"{stem}.arrow")))
+        assert not first.equals(read_table(str(tmp_path / "other" / f"{stem}.arrow")))
+
+    # Time-ordered across chunks, at minute resolution
+    epochs = transactions["epoch"].to_numpy()
+    assert (np.diff(epochs) >= 0).all()
+    assert (epochs % 60 == 0).all()
+
+    # Unflagged gifts stay under every account's suspicious limit; large fraud is above every fraud limit
+    normal = transactions[~transactions["flagged"]]
+    assert (normal["risk_level"] == "low").all()
+    assert normal["points"].max() < MIN_SUSPICIOUS_LIMIT
+    large = transactions[transactions["reason"] == "Above fraud threshold"]
+    assert len(large) and large["points"].min() > MAX_FRAUD_LIMIT
+
+    # No unflagged gift trips a velocity check against the viewer's limits; every row counts towards the windows
+    limits = ViewerLimits(pd.read_csv(tmp_path / "first" / "tiktok_viewers.csv"), RiskManager())
+    assert transactions["reason"].isin(list(VELOCITY_RULES.values())).any()
+    for viewer, rows in transactions.groupby("viewer", sort=False):
+        row = limits.names.position(viewer)
+        epochs, points, flagged = (rows[column].tolist() for column in ("epoch", "points", "flagged"))
+        for i in range(len(rows)):
+            if flagged[i]:
+                continue
+            day_start = (epochs[i] + SGT_OFFSET_SECONDS) // 86400 * 86400 - SGT_OFFSET_SECONDS
+            last_10min = [p for e, p in zip(epochs[:i], points[:i]) if e >= epochs[i] - 600]
+            last_hour = sum(p for e, p in zip(epochs[:i], points[:i]) if e >= epochs[i] - 3600)
+            today = sum(p for e, p in zip(epochs[:i], points[:i]) if e >= day_start)
+            assert len(last_10min) < 50 and sum(last_10min) + points[i] < 50000
+            assert last_hour + points[i] <= limits.hourly[row]
+            assert today + points[i] <= limits.daily[row]
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        test_dataset_generator(pathlib.Path(directory))
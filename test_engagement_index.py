@@ -0,0 +1,49 @@
+from engagement_index import EngagementIndex
+import numpy as np
+import pandas as pd
+
+def test_engagement_index():
+    """Test incremental refreshes against a full rebuild after appends and in-place edits"""
+    rng = np.random.default_rng(11)
+    creators = pd.DataFrame({
+        "Creator": [f"creator_{i}" for i in range(200)],
+        EngagementIndex.COLUMN: rng.integers(0, 50, 200).astype(np.float64),
+    })
+    index = EngagementIndex(creators, version=1)
+    assert index.matches(creators, 1)
+
+    def assert_rebuilt(frame, version):
+        expected = EngagementIndex(frame, version)
+        assert index.matches(frame, version)
+        assert (index._scores == expected._scores).all()
+        values = frame[EngagementIndex.COLUMN].to_numpy()
+        assert (values[index._positions] == index._scores).all()
+        assert sorted(index._positions.tolist()) == list(range(len(frame)))
+        assert index.cut_points() == expected.cut_points()
+        for score in (0.0, 12.5, 25.0, 49.0, 80.0):
+            assert index.rank(score) == expected.rank(score)
+            pd.testing.assert_frame_equal(index.similar(score), expected.similar(score))
+
+    # Appended rows are slotted in
+    appended = pd.concat([creators, pd.DataFrame({
+        "Creator": ["creator_200", "creator_201", "creator_202"],
+        EngagementIndex.COLUMN: [25.0, 0.0, 99.0],
+    })], ignore_index=True)
+    assert not index.matches(appended, 1)
+    index.refresh(appended, 2)
+    assert_rebuilt(appended, 2)
+
+    # In-place edits keep the frame and its buffer: only the version bump reveals them
+    appended.loc[[3, 50, 201], EngagementIndex.COLUMN] = [48.0, 1.0, 30.0]
+    assert index.matches(appended, 2)
+    assert not index.matches(appended, 3)
+    index.refresh(appended, 3)
+    assert_rebuilt(appended, 3)
+
+    # Changing most rows falls back to a full rebuild
+    appended[EngagementIndex.COLUMN] = appended[EngagementIndex.COLUMN] * 2
+    index.refresh(appended, 4)
+    assert_rebuilt(appended, 4)
+
+if __name__ == "__main__":
+    test_engagement_index()
@@ -0,0 +1,54 @@
+from fund_flow_rollups import FundFlowRollups
+from transaction_ledger import TransactionLedger
+import numpy as np
+
+def test_fund_flow_rollups():
+    """Test bucketed window sums against a scan of the raw rows"""
+    rng = np.random.default_rng(3)
+    count = 5000
+    now = 1_750_000_000
+    ledger = TransactionLedger()
+    ledger.extend({
+        "epoch": now - rng.integers(0, 10 * 86400, count),
+        "viewer": np.full(count, "viewer_1", dtype=object),
+        "creator": np.full(count, "creator_1", dtype=object),
+        "points": rng.integers(1, 1000, count),
+        "flagged": rng.random(count) < 0.1,
+    })
+    rollups = ledger.attach_index(FundFlowRollups.NAME, FundFlowRollups())
+    for i in range(20):
+        ledger.append({"epoch": now - 90 * i, "viewer": "viewer_2", "creator": "creator_1",
+                       "points": 5000 + i, "flagged": i % 4 == 0})
+
+    view = ledger.view()
+    epochs = view["epoch"].to_numpy()
+    points = view["points"].to_numpy()
+    flagged = view["flagged"].to_numpy()
+    for seconds in (3600, 86400, 7 * 86400, 90, 30 * 86400):
+        recent = epochs >= (now - seconds) // 60 * 60
+        assert rollups.window(seconds, now=now) == {
+            "count": int(recent.sum()),
+            "total": int(points[recent].sum()),
+            "max": int(points[recent].max()),
+            "flagged_total": int(points[recent & flagged].sum()),
+        }
+
+    assert rollups.window(3600, now=now + 86400)["count"] == 0
+
+    # Minute and hour buckets older than the retention are evicted; longer windows start on a whole day
+    horizon = (now - FundFlowRollups.RETENTION) // 86400 * 86400
+    for width in (60, 3600):
+        assert min(rollups._buckets[width]) >= horizon
+    start = (now - 9 * 86400) // 86400 * 86400
+    assert rollups.window(9 * 86400, now=now)["count"] == int((epochs >= start).sum())
+
+    # A ledger fork shares the buckets; its sends do not reach the parent's
+    forked = ledger.fork()
+    forked_rollups = forked.get_index(FundFlowRollups.NAME)
+    forked.append({"epoch": now, "viewer": "viewer_3", "creator": "creator_1", "points": 7, "flagged": True})
+    before = rollups.window(3600, now=now)
+    after = forked_rollups.window(3600, now=now)
+    assert (after["count"], after["total"], after["flagged_total"]) == (
+        before["count"] + 1, before["total"] + 7, before["flagged_total"] + 7)
+    assert rollups.window(3600, now=now) == before
+    assert FundFlowRollups().window(3600, now=now) == {"count": 0, "total": 0, "max": 0, "flagged_total": 0}
@@ -0,0 +1,57 @@
+from history_index import HistoryIndex
+from transaction_ledger import TransactionLedger
+import numpy as np
+
+def test_history_index():
+    """Test filtered newest-first pages against a full sort, including late rows"""
+    rng = np.random.default_rng(7)
+    count = 2000
+    ledger = TransactionLedger()
+    ledger.extend({
+        "epoch": rng.integers(0, 500, count),
+        "viewer": rng.choice(np.array(["viewer_1", "viewer_2", "viewer_3"], dtype=object), count),
+        "creator": rng.choice(np.array(["creator_1", "creator_2"], dtype=object), count),
+        "points": np.full(count, 100),
+        "flagged": rng.random(count) < 0.1,
+    })
+    index = ledger.attach_index(HistoryIndex.NAME, HistoryIndex())
+
+    # Live sends arrive in time order; the last one is a late backfill
+    for i in range(30):
+        ledger.append({"epoch": 500 + i, "viewer": "viewer_1", "creator": "creator_2",
+                       "points": 10, "flagged": i % 3 == 0})
+    ledger.append({"epoch": 250, "viewer": "viewer_2", "creator": "creator_1", "points": 10, "flagged": True})
+
+    def assert_pages(ledger, index):
+        view = ledger.view()
+        epochs = view["epoch"].to_numpy()
+        for filters in ({}, {"viewer": "viewer_1"}, {"flagged": False},
+                        {"creator": "creator_1", "flagged": True},
+                        {"viewer": "viewer_2", "creator": "creator_1", "flagged": False}):
+            matches = np.ones(len(view), dtype=bool)
+            for column, value in filters.items():
+                matches &= view[column].to_numpy() == value
+            positions = np.flatnonzero(matches)
+            # Newest first, ties with the later row first
+            expected = positions[np.argsort(epochs[positions], kind="stable")][::-1]
+
+            assert index.count(**filters) == len(expected)
+            pages = [index.page(number, 37, **filters) for number in range(len(expected) // 37 + 2)]
+            assert (np.concatenate(pages) == expected).all()
+            assert len(pages[-1]) == 0
+
+    assert_pages(ledger, index)
+
+    # A ledger fork shares the index; its sends do not reach the parent's lists
+    forked = ledger.fork()
+    forked_index = forked.get_index(HistoryIndex.NAME)
+    assert forked_index is not index
+    for i in range(5):
+        forked.append({"epoch": 600 + i, "viewer": "viewer_2", "creator": "creator_1",
+                       "points": 10, "flagged": i == 0})
+    assert_pages(forked, forked_index)
+    assert_pages(ledger, index)
+    assert forked_index.count(viewer="viewer_2") == index.count(viewer="viewer_2") + 5
+
+    assert index.count(viewer="unknown") == 0
+    assert len(index.page(0, viewer="unknown")) == 0
@@ -0,0 +1,35 @@
+import latency_metrics
+from latency_metrics import LatencyHistogram, measure, timed
+from system_monitor import SystemMonitor
+
+def test_latency_metrics():
+    """Test histogram percentiles, the recording helpers and the performance score"""
+    histogram = LatencyHistogram()
+    for milliseconds in range(1, 101):
+        histogram.record(milliseconds / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 100 and summary["max_ms"] == 100.0
+    # Each percentile is within one bucket (~26%) above the exact value
+    for key, exact in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+        assert exact <= summary[key] <= exact * 1.26
+
+    @timed("test.decorated")
+    def work(value):
+        return value * 2
+
+    assert work(21) == 42
+    with measure("test.block"):
+        pass
+    recorded = latency_metrics.summaries("test.")
+    assert [name for name in recorded] == ["test.block", "test.decorated"]
+    assert all(summary["count"] == 1 for summary in recorded.values())
+
+    monitor = SystemMonitor()
+    assert monitor._calculate_performance_score({}) == 100.0
+    slow = {"count": 10, "p95_ms": 2000.0}
+    assert monitor._calculate_performance_score({"points.send_points": slow}) == 60.0
+    assert monitor._calculate_performance_score({"data.load_databases": slow}) == 100.0
+
+    latency_metrics.reset()
+    work(1)
+    assert latency_metrics.summaries("test.decorated")["test.decorated"]["count"] == 1
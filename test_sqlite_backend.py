@@ -0,0 +1,60 @@
+from sqlite_backend import SQLiteBackend
+from database_manager import DatabaseManager
+from transaction_ledger import TransactionLedger
+import pandas as pd
+
+def test_sqlite_backend(tmp_path):
+    """Test table round-trips, group-committed appends and lookups"""
+    path = str(tmp_path / "fairshare.db")
+    backend = SQLiteBackend(path, batch_size=3, commit_interval=60)
+
+    creators = pd.DataFrame([
+        {"Creator": "creator_1", "Views": 1200, "Likes": 300, "Shares": 10, "Points": 120},
+        {"Creator": "creator_2", "Views": 5000, "Likes": 800, "Shares": 40, "Points": 300},
+    ])
+    viewers = pd.DataFrame([
+        {"Viewer": "viewer_1", "Account_Type": "new", "Total_Gifts": 0, "Last_Gift_Time": None,
+         "Trust_Level": "new", "Account_Age_Days": 15},
+    ])
+    backend.save_tables(creators, viewers)
+    loaded_creators, loaded_viewers = backend.load_tables()
+    pd.testing.assert_frame_equal(loaded_creators, creators, check_dtype=False)
+    assert backend.lookup_viewer("viewer_1")["Account_Age_Days"] == 15
+    assert backend.lookup_creator("missing") is None
+
+    # Names missing from a session's loaded tables fall back to the backend
+    db_manager = DatabaseManager.from_tables(creators.head(1), viewers.head(0), TransactionLedger(), backend)
+    assert db_manager.lookup_viewer("viewer_1")["Trust_Level"] == "new"
+    assert db_manager.lookup_creator("creator_2")["Points"] == 300
+    assert db_manager.lookup_creator("creator_1") == creators.iloc[0].to_dict()
+    assert db_manager.lookup_viewer("missing") is None
+
+    # Appends are buffered until the batch fills
+    for i in range(2):
+        backend.append_transaction({"timestamp": f"2025-08-28 10:0{i}", "viewer": "viewer_1",
+                                    "creator": "creator_1", "points": 100})
+    assert len(backend._pending) == 2
+    backend.append_transaction({"timestamp": "2025-08-28 10:05", "viewer": "viewer_1", "creator": "creator_2",
+                                "points": 50, "flagged": True, "risk_level": "medium", "reason": "Above threshold"})
+    assert backend._pending == []
+
+    # Reads flush pending appends first
+    backend.append_transaction({"timestamp": "2025-08-28 10:06", "viewer": "viewer_1",
+                                "creator": "creator_1", "points": 1})
+    transactions = backend.load_transactions()
+    assert backend._pending == []
+    assert transactions.groupby("creator")["points"].sum().to_dict() == {"creator_1": 201, "creator_2": 50}
+    backend.close()
+
+    # Everything survives a reopen
+    reopened = SQLiteBackend(path)
+    transactions = reopened.load_transactions()
+    assert len(transactions) == 4
+    assert transactions["flagged"].tolist() == [False, False, True, False]
+    assert transactions["epoch"].iloc[0] == 1756346400  # 2025-08-28 10:00 SGT
+    reopened.close()
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        test_sqlite_backend(pathlib.Path(directory))
@@ -0,0 +1,71 @@
+from transaction_ledger import TransactionLedger, format_timestamps
+import numpy as np
+import pandas as pd
+
+def test_transaction_ledger():
+    """Test appends, bulk loads, forks and the DataFrame view of the ledger"""
+    ledger = TransactionLedger(initial_capacity=2)
+    assert ledger.empty
+    assert ledger.view().empty
+
+    # Bulk load, including a frame without a risk_level column
+    ledger.extend(pd.DataFrame([
+        {"timestamp": "2025-08-28 10:00", "viewer": "viewer_1", "creator": "creator_1",
+         "points": 1000, "flagged": False, "reason": "Historical data from CSV"},
+        {"timestamp": "2025-08-28 11:00", "viewer": "viewer_2", "creator": "creator_2",
+         "points": 2000, "flagged": False, "reason": "Historical data from CSV"},
+    ]))
+
+    # Single appends grow the buffers past the initial capacity
+    for i in range(10):
+        ledger.append({
+            "timestamp": f"2025-08-28 12:{i:02d}",
+            "viewer": "viewer_3",
+            "creator": "creator_3",
+            "points": 100 + i,
+            "flagged": i % 2 == 0,
+            "reason": "",
+            "risk_level": "medium" if i % 2 == 0 else "low"
+        })
+
+    view = ledger.view()
+    assert len(ledger) == len(view) == 12
+    assert list(view.columns) == list(TransactionLedger.COLUMNS)
+    assert view["points"].dtype == np.int64
+    assert view["flagged"].sum() == 5
+    assert view["risk_level"].isna().sum() == 2
+    assert view["points"].sum() == 3000 + sum(100 + i for i in range(10))
+
+    # Timestamps are parsed once at ingest into UTC epoch seconds (SGT is UTC+8)
+    assert view["epoch"].dtype == np.int64
+    assert view["epoch"].iloc[0] == 1756346400  # 2025-08-28 10:00 SGT
+    assert (np.diff(view["epoch"].to_numpy()[2:]) == 60).all()
+
+    # The view is cached until the next write and shares memory with the buffers
+    assert ledger.view() is view
+    assert np.shares_memory(view["points"].to_numpy(), ledger.column("points"))
+
+    version = ledger.version
+    ledger.append({"timestamp": "2025-08-28 13:00", "viewer": "viewer_4", "creator": "creator_4", "points": 5})
+    assert ledger.version == version + 1
+    assert len(ledger.view()) == 13
+    assert len(view) == 12  # Earlier views are unaffected by later appends
+
+    # Bulk writers can pass column arrays directly; epochs format back to the same strings
+    epochs = np.array([1756346400, 1756350000])
+    ledger.extend({"timestamp": format_timestamps(epochs), "epoch": epochs,
+                   "viewer": np.array(["viewer_5", "viewer_6"], dtype=object),
+                   "creator": np.array(["creator_5", "creator_5"], dtype=object),
+                   "points": np.array([10, 20])})
+    assert ledger.view()["timestamp"].tolist()[-2:] == ["2025-08-28 10:00", "2025-08-28 11:00"]
+    assert ledger.view()["reason"].iloc[-1] == ""
+
+    # A fork records its parent until its first write; the parent is never modified
+    fork = ledger.fork()
+    assert fork.forked_from is ledger and ledger.forked_from is None
+    fork.append({"timestamp": "2025-08-28 14:00", "viewer": "viewer_7", "creator": "creator_7", "points": 1})
+    assert fork.forked_from is None
+    assert len(fork) == len(ledger) + 1 == 16
+
+if __name__ == "__main__":
+    test_transaction_ledger()
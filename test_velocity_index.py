@@ -0,0 +1,36 @@
+from velocity_index import VelocityIndex
+from transaction_ledger import TransactionLedger
+import time
+
+def test_velocity_index():
+    """Test window totals, sweeping idle viewers and copy-on-write forks"""
+    now = int(time.time()) // 60 * 60
+    ledger = TransactionLedger()
+    ledger.extend({
+        "epoch": [now - 7200, now - 1800, now - 300, now - 60],
+        "viewer": ["viewer_1", "viewer_1", "viewer_1", "viewer_2"],
+        "creator": ["creator_1"] * 4,
+        "points": [1000, 200, 30, 5],
+    })
+    index = ledger.attach_index(VelocityIndex.NAME, VelocityIndex())
+    totals = index.totals("viewer_1", now=now)
+    assert totals["10min"] == (1, 30) and totals["hour"] == (2, 230)
+    assert index.totals("unknown", now=now) == {"10min": (0, 0), "hour": (0, 0), "day": (0, 0)}
+
+    # A fork shares the state; its sends and evictions stay out of the parent
+    forked = ledger.fork()
+    forked_index = forked.get_index(VelocityIndex.NAME)
+    forked.append({"epoch": now, "viewer": "viewer_1", "creator": "creator_1", "points": 7})
+    assert forked_index.totals("viewer_1", now=now)["10min"] == (2, 37)
+    assert forked_index.totals("viewer_1", now=now + 2400)["hour"] == (2, 37)
+    assert index.totals("viewer_1", now=now)["10min"] == (1, 30)
+    assert index.totals("viewer_1", now=now)["hour"] == (2, 230)
+    assert index.totals("viewer_2", now=now)["10min"] == (1, 5)
+
+    # Viewers with nothing left in any window are dropped by the sweep
+    index.sweep(now=now + 2 * 86400)
+    assert "viewer_1" not in index._windows and "viewer_1" not in index._daily
+    assert index.totals("viewer_1", now=now + 2 * 86400)["hour"] == (0, 0)
+
+if __name__ == "__main__":
+    test_velocity_index()
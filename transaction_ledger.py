@@ -0,0 +1,244 @@
+import copy
+import numpy as np
+import pandas as pd
+
+# Timestamps are recorded as Asia/Singapore wall-clock strings. SGT has no DST,
+# so converting them to UTC epoch seconds is a fixed offset.
+SGT_OFFSET_SECONDS = 8 * 3600
+EPOCH_MISSING = np.iinfo(np.int64).min  # Sentinel for unparseable timestamps
+
+
+def to_epoch_seconds(timestamps):
+    """Parse SGT "%Y-%m-%d %H:%M" timestamps into int64 UTC epoch seconds"""
+    raw = pd.Series(timestamps, dtype=object)
+    parsed = pd.to_datetime(raw, errors="coerce", format="%Y-%m-%d %H:%M")
+    retry = parsed.isna() & raw.notna()
+    if retry.any():
+        # Fall back to per-value inference for rows in other formats (e.g. date only)
+        parsed[retry] = pd.to_datetime(raw[retry], errors="coerce", format="mixed")
+    epochs = parsed.to_numpy(dtype="datetime64[s]").astype(np.int64)
+    return np.where(parsed.isna().to_numpy(), EPOCH_MISSING, epochs - SGT_OFFSET_SECONDS)
+
+
+def format_timestamps(epochs):
+    """Format int64 UTC epoch seconds as SGT "%Y-%m-%d %H:%M" strings (object array)"""
+    wall_clock = (np.asarray(epochs, dtype=np.int64) + SGT_OFFSET_SECONDS).astype("datetime64[s]")
+    text = np.datetime_as_string(wall_clock, unit="m")  # "YYYY-MM-DDTHH:MM"
+    return np.char.replace(text, "T", " ").astype(object)
+
+
+def transaction_epochs(transactions):
+    """Return epoch seconds for a transactions frame, reusing the ingest-time column
+
+    Frames that did not come from a ledger (e.g. hand-built test data) are
+    parsed on the fly.
+    """
+    if "epoch" in transactions.columns:
+        return transactions["epoch"].to_numpy()
+    return to_epoch_seconds(transactions["timestamp"].to_numpy())
+
+
+class TransactionLedger:
+    """Append-only columnar store for point transactions
+
+    Each column lives in its own typed NumPy buffer. Buffers grow geometrically,
+    so appending a transaction is amortized O(1) instead of copying the whole
+    history with pd.concat on every send.
+
+    Timestamp strings are parsed once at ingest into the int64 `epoch` column
+    (UTC seconds); readers filter and sort on that instead of the strings.
+    """
+
+    # Column name -> dtype of the backing buffer
+    COLUMNS = {
+        "timestamp": object,
+        "epoch": np.int64,
+        "viewer": object,
+        "creator": object,
+        "points": np.int64,
+        "flagged": np.bool_,
+        "risk_level": object,
+        "reason": object,
+    }
+
+    # Values used when a transaction does not provide a column
+    DEFAULTS = {
+        "timestamp": None,
+        "epoch": EPOCH_MISSING,
+        "viewer": None,
+        "creator": None,
+        "points": 0,
+        "flagged": False,
+        "risk_level": None,
+        "reason": "",
+    }
+
+    def __init__(self, initial_capacity=1024):
+        self._capacity = max(1, int(initial_capacity))
+        self._size = 0
+        self._buffers = {
+            name: np.empty(self._capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()
+        }
+        self._view = None
+        self._indexes = {}
+        self.version = 0  # Bumped on every write so readers can cache derived data
+        self.forked_from = None  # Parent ledger of a fork, until the fork's first write
+
+    @classmethod
+    def from_frame(cls, transactions):
+        """Build a ledger from an existing transactions DataFrame"""
+        ledger = cls(initial_capacity=max(1024, len(transactions)))
+        ledger.extend(transactions)
+        return ledger
+
+    def fork(self):
+        """Return a copy-on-write ledger that shares this ledger's rows
+
+        The fork reads the parent's buffers until its first write, which
+        moves it onto buffers of its own; the parent is never modified.
+        Attached indexes that provide fork() share their state with the
+        fork copy-on-write (the parent must not be written afterwards);
+        other indexes are deep-copied. Either way the fork's writes stay
+        private.
+        """
+        forked = type(self)(initial_capacity=1)
+        forked._buffers = dict(self._buffers)
+        forked._size = self._size
+        forked._capacity = self._size  # Forces a reallocation before the first write
+        forked._indexes = {
+            name: index.fork() if hasattr(index, "fork") else copy.deepcopy(index)
+            for name, index in self._indexes.items()
+        }
+        forked.version = self.version
+        forked.forked_from = self
+        return forked
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    def _reserve(self, extra):
+        """Make room for `extra` more rows, doubling capacity as needed"""
+        required = self._size + extra
+        if required <= self._capacity:
+            return
+
+        new_capacity = max(1, self._capacity)
+        while new_capacity < required:
+            new_capacity *= 2
+
+        for name, buffer in self._buffers.items():
+            grown = np.empty(new_capacity, dtype=buffer.dtype)
+            grown[:self._size] = buffer[:self._size]
+            self._buffers[name] = grown
+        self._capacity = new_capacity
+
+    def append(self, transaction):
+        """Append a single transaction dict and return its row position"""
+        self._reserve(1)
+        position = self._size
+        for name, buffer in self._buffers.items():
+            buffer[position] = transaction.get(name, self.DEFAULTS[name])
+        if "epoch" not in transaction:
+            self._buffers["epoch"][position] = to_epoch_seconds([transaction.get("timestamp")])[0]
+        self._size += 1
+        self._touch(position, self._size)
+        return position
+
+    def extend(self, transactions):
+        """Append many transactions at once
+
+        Accepts a DataFrame, a list of dicts, or a dict of equal-length column
+        arrays (which skips building a DataFrame for bulk writers).
+        """
+        if isinstance(transactions, dict):
+            columns = {name: np.asarray(values) for name, values in transactions.items()}
+            count = len(next(iter(columns.values()), ()))
+        else:
+            if not isinstance(transactions, pd.DataFrame):
+                transactions = pd.DataFrame(list(transactions))
+            columns = transactions
+            count = len(transactions)
+        if count == 0:
+            return
+
+        self._reserve(count)
+        start, stop = self._size, self._size + count
+        for name, buffer in self._buffers.items():
+            if name in columns:
+                # Missing values fall back to the column default
+                values = columns[name]
+                if isinstance(values, pd.Series):
+                    values = values.to_numpy()
+                missing = pd.isna(values)
+                if missing.any():
+                    values = values.astype(object)
+                    values[missing] = self.DEFAULTS[name]
+                buffer[start:stop] = values
+            elif name == "epoch":
+                # Writers that only provide strings get them parsed here, once
+                buffer[start:stop] = to_epoch_seconds(self._buffers["timestamp"][start:stop])
+            else:
+                buffer[start:stop] = self.DEFAULTS[name]
+        self._size = stop
+        self._touch(start, stop)
+
+    def _touch(self, start, stop):
+        self.version += 1
+        self.forked_from = None
+        self._view = None
+        for index in self._indexes.values():
+            index.on_append(self, start, stop)
+
+    def attach_index(self, name, index):
+        """Register an incremental index and feed it the rows already stored
+
+        The index must provide on_append(ledger, start, stop); it is called
+        with the row range of every subsequent write.
+        """
+        self._indexes[name] = index
+        if self._size:
+            index.on_append(self, 0, self._size)
+        return index
+
+    def get_index(self, name):
+        """Return a previously attached index, or None"""
+        return self._indexes.get(name)
+
+    def ensure_index(self, name, factory):
+        """Return the index attached as `name`, attaching factory() on first use"""
+        index = self._indexes.get(name)
+        if index is None:
+            index = self.attach_index(name, factory())
+        return index
+
+    def column(self, name):
+        """Return the live slice of one column buffer (no copy)"""
+        return self._buffers[name][:self._size]
+
+    def take(self, positions):
+        """DataFrame of the rows at `positions`, copying only those rows"""
+        positions = np.asarray(positions, dtype=np.intp)
+        return pd.DataFrame({
+            name: pd.Series(self.column(name)[positions], dtype=dtype)
+            for name, dtype in self.COLUMNS.items()
+        })
+
+    def view(self):
+        """Return a DataFrame view over the ledger without copying the buffers
+
+        The frame is cached until the next write. Treat it as read-only; take a
+        .copy() before mutating it.
+        """
+        if self._view is None:
+            self._view = pd.DataFrame(
+                {
+                    name: pd.Series(self.column(name), dtype=dtype, copy=False)
+                    for name, dtype in self.COLUMNS.items()
+                },
+                copy=False,
+            )
+        return self._view
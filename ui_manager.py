@@ -1,4 +1,5 @@
 import streamlit as st
+from dashboard_html import DASHBOARD_CSS
 
 class UIManager:
     """Manages all UI styling and CSS for the FairShare app"""
@@ -12,7 +13,7 @@ class UIManager:
         st.set_page_config(page_title="FairShare – Creator Rewards", layout="wide")
     
     def _get_global_css(self):
-        """Get all global CSS styles"""
+        """Get all global CSS styles, including the dashboard's shared classes"""
         return """
         <style>
         /* Smooth tab transitions */
@@ -108,4 +109,4 @@ class UIManager:
             background: linear-gradient(135deg, #E6004C, #00D4CC);
         }
         </style>
-        """
+        """ + DASHBOARD_CSS
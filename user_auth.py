@@ -118,17 +118,15 @@ class UserAuth:
         try:
             # Check if viewers data exists in session state
             if 'viewers' in st.session_state:
-                viewers = st.session_state.viewers
+                # Get user profile from CSV through the name index (O(1))
+                user_data = st.session_state.db_manager.lookup_viewer(username)
                 
                 # Check if username exists in CSV
-                if username in viewers['Viewer'].values:
-                    # Get user profile from CSV
-                    user_data = viewers[viewers['Viewer'] == username].iloc[0]
-                    
+                if user_data is not None:
                     # Store user info
                     st.session_state.user_logged_in = True
                     st.session_state.current_user = username
-                    st.session_state.user_profile = user_data.to_dict()
+                    st.session_state.user_profile = user_data
                     
                     # Set points based on CSV data
                     total_gifts = user_data.get('Total_Gifts', 0)
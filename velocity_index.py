@@ -0,0 +1,167 @@
+import time
+from collections import ChainMap, deque
+import numpy as np
+from transaction_ledger import SGT_OFFSET_SECONDS
+
+SECONDS_PER_DAY = 86400
+
+
+def _sgt_day(epoch):
+    return (epoch + SGT_OFFSET_SECONDS) // SECONDS_PER_DAY
+
+
+class VelocityIndex:
+    """Per-viewer sliding-window gift totals for the AML velocity checks
+
+    Every viewer keeps one deque of (epoch, points) per rolling window with a
+    running count and sum, plus a running total for the current SGT calendar
+    day. Each event is pushed and evicted once per window, so a velocity
+    lookup is amortized O(1) regardless of how much history is stored.
+
+    Writes sweep out viewers with nothing left in any window at most once per
+    SWEEP_INTERVAL, so viewers who stop sending do not keep their state.
+    fork() shares the state with a session's ledger fork, which copies a
+    viewer's entry only when it changes it.
+    """
+
+    NAME = "velocity"
+
+    # Rolling windows in seconds
+    WINDOWS = {
+        "10min": 600,
+        "hour": 3600,
+    }
+    SWEEP_INTERVAL = 3600  # Seconds between sweeps of idle viewers
+
+    def __init__(self):
+        # Writes land in the first map of each ChainMap
+        self._windows = ChainMap()  # viewer -> {window: [events deque, count, points]}
+        self._daily = ChainMap()    # viewer -> [sgt day, count, points]
+        self._swept = int(time.time())
+
+    def fork(self):
+        """Index sharing this state copy-on-write
+
+        This index must not be updated once forked.
+        """
+        forked = type(self)()
+        forked._windows = ChainMap({}, *self._windows.maps)
+        forked._daily = ChainMap({}, *self._daily.maps)
+        return forked
+
+    def on_append(self, ledger, start, stop):
+        """Ingest ledger rows [start, stop)"""
+        viewers = ledger.column("viewer")[start:stop]
+        points = ledger.column("points")[start:stop]
+        epochs = ledger.column("epoch")[start:stop]
+
+        # Rows older than both the longest window and today can never count again
+        now = int(time.time())
+        if now - self._swept >= self.SWEEP_INTERVAL:
+            self.sweep(now)
+        horizon = min(now - max(self.WINDOWS.values()), _sgt_day(now) * SECONDS_PER_DAY - SGT_OFFSET_SECONDS)
+        keep = np.flatnonzero(epochs >= horizon)
+        if keep.size == 0:
+            return
+
+        # Feed in time order so the deques stay sorted
+        keep = keep[np.argsort(epochs[keep], kind="stable")]
+        for viewer, epoch, amount in zip(viewers[keep], epochs[keep].tolist(), points[keep].tolist()):
+            self.add(viewer, epoch, amount)
+
+    def _own_windows(self, viewer):
+        """The viewer's window state in this index's own map, copying a shared one first"""
+        windows = self._windows.maps[0].get(viewer)
+        if windows is None:
+            shared = self._windows.get(viewer)
+            if shared is None:
+                windows = {name: [deque(), 0, 0] for name in self.WINDOWS}
+            else:
+                windows = {name: [deque(events), count, points] for name, (events, count, points) in shared.items()}
+            self._windows[viewer] = windows
+        return windows
+
+    def _expire(self, windows, now):
+        """Drop events that fell out of each window
+
+        Window cutoffs are floored to the minute to match the minute
+        resolution of stored timestamps.
+        """
+        for name, seconds in self.WINDOWS.items():
+            entry = windows[name]
+            events = entry[0]
+            cutoff = (now - seconds) // 60 * 60
+            while events and events[0][0] < cutoff:
+                _, points = events.popleft()
+                entry[1] -= 1
+                entry[2] -= points
+
+    def _has_expired(self, windows, now):
+        """True if any window holds an event older than its cutoff"""
+        return any(
+            windows[name][0] and windows[name][0][0][0] < (now - seconds) // 60 * 60
+            for name, seconds in self.WINDOWS.items()
+        )
+
+    def sweep(self, now=None):
+        """Evict expired events and forget viewers with nothing left to count"""
+        now = int(time.time()) if now is None else int(now)
+        self._swept = now
+        windows_own = self._windows.maps[0]
+        for viewer in list(windows_own):
+            windows = windows_own[viewer]
+            self._expire(windows, now)
+            if not any(entry[1] for entry in windows.values()):
+                del windows_own[viewer]
+        today = _sgt_day(now)
+        daily_own = self._daily.maps[0]
+        for viewer in [viewer for viewer, daily in daily_own.items() if daily[0] < today]:
+            del daily_own[viewer]
+
+    def add(self, viewer, epoch, points):
+        """Record one gift from `viewer` at `epoch` (seconds)"""
+        windows = self._own_windows(viewer)
+
+        for entry in windows.values():
+            events = entry[0]
+            if events and epoch < events[-1][0]:
+                # Late backfill: insert in place so eviction from the left stays correct
+                position = len(events)
+                while position and events[position - 1][0] > epoch:
+                    position -= 1
+                events.insert(position, (epoch, points))
+            else:
+                events.append((epoch, points))
+            entry[1] += 1
+            entry[2] += points
+
+        day = _sgt_day(epoch)
+        daily = self._daily.get(viewer)
+        if daily is None or day > daily[0]:
+            self._daily[viewer] = [day, 1, points]
+        elif day == daily[0]:
+            if viewer not in self._daily.maps[0]:
+                daily = self._daily[viewer] = list(daily)  # Copy a shared total before changing it
+            daily[1] += 1
+            daily[2] += points
+
+    def totals(self, viewer, now=None):
+        """Return {"10min": (count, points), "hour": (...), "day": (...)} for a viewer"""
+        now = int(time.time()) if now is None else int(now)
+        result = {}
+
+        windows = self._windows.get(viewer)
+        if windows is not None and self._has_expired(windows, now):
+            windows = self._own_windows(viewer)
+            self._expire(windows, now)
+        for name in self.WINDOWS:
+            entry = windows[name] if windows is not None else (None, 0, 0)
+            result[name] = (entry[1], entry[2])
+
+        daily = self._daily.get(viewer)
+        if daily is not None and daily[0] == _sgt_day(now):
+            result["day"] = (daily[1], daily[2])
+        else:
+            result["day"] = (0, 0)
+
+        return result
@@ -0,0 +1,102 @@
+import copy
+import numpy as np
+from name_index import NameIndex
+
+# Simulated account age category implied by each CSV account type
+# (mirrors the creation-date ranges in RiskManager.calculate_user_risk_profile)
+ACCOUNT_TYPE_AGE_CATEGORY = {
+    "new": "new",
+    "existing": "established",
+    "verified": "old",
+}
+DEFAULT_AGE_CATEGORY = "old"  # creator accounts
+
+
+class ViewerLimits:
+    """AML limits for every viewer, computed in one columnar pass
+
+    Two schemes are precomputed side by side:
+
+    - the CSV profile limits used by the sidebar (`suspicious_limit`,
+      `fraud_limit`) from Account_Type, Trust_Level and Account_Age_Days
+    - RiskManager's dynamic thresholds (`suspicious`, `fraud`, `hourly`,
+      `daily`) for the account age category implied by the account type
+
+    Rows are looked up through a NameIndex (the database manager's, when
+    given), so a per-send check is a dict hit plus an array read. The object
+    is tied to one viewers frame; matches() tells whether it is still current.
+    """
+
+    BASE_LIMIT = 10000  # Base limit for new users
+
+    def __init__(self, viewers, risk_manager, names=None):
+        self.viewers = viewers
+        if names is None or not names.matches(viewers):
+            names = NameIndex(viewers, "Viewer")
+        self.names = names
+
+        account_type = viewers["Account_Type"].astype(str).str.lower().to_numpy()
+        trust_level = viewers["Trust_Level"].astype(str).str.lower().to_numpy()
+        age_days = viewers["Account_Age_Days"].to_numpy(dtype=np.float64)
+
+        # Sidebar AML limits from the CSV profile
+        account_multiplier = np.select(
+            [account_type == "creator", account_type == "verified"], [2.0, 1.5], default=1.0
+        )
+        trust_multiplier = np.select(
+            [trust_level == "trusted", trust_level == "verified"], [2.0, 1.5], default=1.0
+        )
+        age_multiplier = np.minimum(3.0, np.maximum(0.5, age_days / 100))
+        total_multiplier = account_multiplier * trust_multiplier * age_multiplier
+        self.suspicious_limit = (self.BASE_LIMIT * 0.3 * total_multiplier).astype(np.int64)
+        self.fraud_limit = (self.BASE_LIMIT * 0.6 * total_multiplier).astype(np.int64)
+
+        # Dynamic thresholds, keyed on the raw Account_Type as the risk profile stores it
+        self.verification = viewers["Account_Type"].to_numpy(dtype=object)
+        self.age_category = np.array(
+            [ACCOUNT_TYPE_AGE_CATEGORY.get(kind, DEFAULT_AGE_CATEGORY) for kind in self.verification.tolist()],
+            dtype=object
+        )
+        combined = np.array([
+            risk_manager.combined_multiplier(age, verification)
+            for age, verification in zip(self.age_category.tolist(), self.verification.tolist())
+        ], dtype=np.float64)
+        self.combined_multiplier = combined
+        self.suspicious = (risk_manager.SUSPICIOUS_THRESHOLD * combined).astype(np.int64)
+        self.fraud = (risk_manager.FRAUD_THRESHOLD * combined).astype(np.int64)
+        self.hourly = (risk_manager.HOURLY_LIMIT * combined).astype(np.int64)
+        self.daily = (risk_manager.DAILY_LIMIT * combined).astype(np.int64)
+
+    def rebind(self, viewers, names=None):
+        """These limits over another frame with the same rows (e.g. a shallow copy), in O(1)"""
+        limits = copy.copy(self)
+        limits.viewers = viewers
+        limits.names = names if names is not None and names.matches(viewers) else self.names.rebind(viewers)
+        return limits
+
+    def matches(self, viewers):
+        """True if these limits were computed from this viewers frame"""
+        return viewers is self.viewers
+
+    def row(self, viewer_name):
+        """Row position of a viewer, or None if unknown"""
+        return self.names.position(viewer_name)
+
+    def aml_limits(self, viewer_name):
+        """(suspicious_limit, fraud_limit) from the CSV profile, or None if unknown"""
+        row = self.names.position(viewer_name)
+        if row is None:
+            return None
+        return int(self.suspicious_limit[row]), int(self.fraud_limit[row])
+
+    def dynamic_thresholds(self, row):
+        """Dynamic threshold dict for a row, in get_dynamic_thresholds' shape"""
+        return {
+            "suspicious": int(self.suspicious[row]),
+            "fraud": int(self.fraud[row]),
+            "hourly": int(self.hourly[row]),
+            "daily": int(self.daily[row]),
+            "account_age": self.age_category[row],
+            "verification": self.verification[row],
+            "combined_multiplier": float(self.combined_multiplier[row])
+        }